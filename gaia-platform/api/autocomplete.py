@@ -0,0 +1,171 @@
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.core.cache import cache
+
+from halls.models import Hall
+from shop.models import Product
+
+
+VERSION_KEY = "autocomplete:version"
+
+
+def normalize(text: str) -> str:
+    return (text or "").casefold().replace("ё", "е").strip()
+
+
+def _index_keys(name: str, slug: str):
+    """
+    Ключи, по которым находится запись: название целиком, каждое слово
+    названия (чтобы «латте» находил «Раф латте») и слаг.
+    """
+    keys = set()
+    norm_name = normalize(name)
+    if norm_name:
+        keys.add(norm_name)
+        words = norm_name.split()
+        for i in range(1, len(words)):
+            keys.add(" ".join(words[i:]))
+    if slug:
+        keys.add(normalize(slug))
+    return keys
+
+
+class PrefixIndex:
+    """
+    Индекс для подсказок: отсортированный список (ключ, тип, id) + bisect.
+    Поиск по префиксу — O(log n + k), без обращений к БД.
+
+    Изменения делаются copy-on-write под локом: читатели всегда видят
+    целый список, поэтому чтение идёт без блокировок.
+    """
+
+    def __init__(self):
+        self._keys = []  # [(key, kind, id)]
+        self._entries = {}  # (kind, id) -> dict для ответа
+        self._lock = threading.Lock()
+        self._built_at = None
+        self._version = None
+
+    # --- построение ---
+
+    def _load(self):
+        entries = {}
+        for p in Product.objects.filter(is_active=True).only("id", "name", "slug"):
+            entries[("product", p.id)] = {"type": "product", "id": p.id, "name": p.name, "slug": p.slug}
+        for h in Hall.objects.only("id", "name", "slug"):
+            entries[("hall", h.id)] = {"type": "hall", "id": h.id, "name": h.name, "slug": h.slug}
+        return entries
+
+    def rebuild(self):
+        entries = self._load()
+        keys = sorted(
+            (key, kind, obj_id)
+            for (kind, obj_id), entry in entries.items()
+            for key in _index_keys(entry["name"], entry["slug"])
+        )
+        with self._lock:
+            self._entries = entries
+            self._keys = keys
+            self._built_at = time.monotonic()
+            self._version = cache.get(VERSION_KEY)
+
+    def ensure_fresh(self):
+        """
+        Перестраиваем индекс, если его ещё нет, он устарел по времени
+        или в другом процессе что-то сохранили (версия в общем кеше поменялась).
+        """
+        if self._built_at is None:
+            self.rebuild()
+            return
+        if time.monotonic() - self._built_at > settings.AUTOCOMPLETE_REFRESH_SECONDS:
+            self.rebuild()
+            return
+        if cache.get(VERSION_KEY) != self._version:
+            self.rebuild()
+
+    # --- инкрементальные изменения ---
+
+    def remove(self, kind: str, obj_id: int):
+        with self._lock:
+            entries = dict(self._entries)
+            entries.pop((kind, obj_id), None)
+            self._keys = [k for k in self._keys if not (k[1] == kind and k[2] == obj_id)]
+            self._entries = entries
+
+    def upsert(self, kind: str, obj_id: int, name: str, slug: str):
+        with self._lock:
+            keys = [k for k in self._keys if not (k[1] == kind and k[2] == obj_id)]
+            for key in _index_keys(name, slug):
+                insort(keys, (key, kind, obj_id))
+            entries = dict(self._entries)
+            entries[(kind, obj_id)] = {"type": kind, "id": obj_id, "name": name, "slug": slug}
+            self._keys = keys
+            self._entries = entries
+
+    def mark_synced(self):
+        """Свои изменения уже применены — не перестраиваться из-за своей же версии."""
+        self._version = cache.get(VERSION_KEY)
+
+    # --- поиск ---
+
+    def suggest(self, prefix: str, limit: int = 10):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        keys = self._keys
+        entries = self._entries
+        results = []
+        seen = set()
+
+        i = bisect_left(keys, (prefix,))
+        while i < len(keys) and len(results) < limit:
+            key, kind, obj_id = keys[i]
+            if not key.startswith(prefix):
+                break
+            if (kind, obj_id) not in seen:
+                seen.add((kind, obj_id))
+                entry = entries.get((kind, obj_id))
+                if entry is not None:
+                    results.append(entry)
+            i += 1
+        return results
+
+
+index = PrefixIndex()
+
+
+def _bump_version():
+    # чтобы остальные процессы перестроили свой индекс
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, timeout=None)
+    index.mark_synced()
+
+
+def rebuild_everywhere():
+    """Полная перестройка во всех процессах — после загрузки данных в обход сигналов."""
+    index.rebuild()
+    _bump_version()
+
+
+def product_saved(instance):
+    if instance.is_active:
+        index.upsert("product", instance.id, instance.name, instance.slug)
+    else:
+        index.remove("product", instance.id)
+    _bump_version()
+
+
+def hall_saved(instance):
+    index.upsert("hall", instance.id, instance.name, instance.slug)
+    _bump_version()
+
+
+def object_deleted(kind: str, obj_id: int):
+    index.remove(kind, obj_id)
+    _bump_version()
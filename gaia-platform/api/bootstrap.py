@@ -0,0 +1,100 @@
+"""
+Всё, что нужно фронту для первой отрисовки, одним ответом:
+залы, категории, товары, меню и свободные слоты залов на дату.
+
+Каждая часть берётся из своего кеша (уже готовым JSON), а ответ
+склеивается из байтов. ETag считается из версий этих кешей, поэтому
+ответ 304 не требует ни одного запроса в БД. Без общих версий
+(VERSIONED_CACHES) части собираются из БД, а ETag — хеш тела.
+Части, которые кладутся в кеш, собираются по основной БД (primary_only).
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+
+from gaia import cache_versions
+from gaia.cache_versions import get_version
+from gaia.db_router import primary_only
+from halls.models import Hall
+from halls.services import AVAILABILITY_VERSION, HALLS_VERSION, get_available_slot_times
+from menus.services import MENU_VERSION, get_menu_snapshot
+from shop.services import CATALOG_VERSION, DEFAULT_ORDERING, get_catalog_snapshot, get_category_snapshot
+from .projections import ProjectionContext
+from .renderers import FastJSONRenderer
+from .serializers import HALL_LIST_PROJECTION
+
+
+def get_bootstrap_etag(target_date, base_url: str):
+    """ETag по версиям кешей; None — версии выключены, считать по телу (body_etag)."""
+    if not cache_versions.enabled():
+        return None
+    versions = ":".join(
+        str(get_version(name))
+        for name in (HALLS_VERSION, CATALOG_VERSION, MENU_VERSION, AVAILABILITY_VERSION)
+    )
+    raw = f"{versions}|{target_date.isoformat()}|{base_url}"
+    return '"%s"' % hashlib.sha1(raw.encode()).hexdigest()
+
+
+def body_etag(body: bytes) -> str:
+    return '"%s"' % hashlib.sha1(body).hexdigest()
+
+
+def get_halls_snapshot(base_url: str) -> bytes:
+    """Готовый JSON списка залов (как HallListAPIView)."""
+    def build():
+        ctx = ProjectionContext.for_base_url(default_storage, base_url)
+        return FastJSONRenderer().render(HALL_LIST_PROJECTION.serialize(Hall.objects.all(), ctx))
+
+    if not cache_versions.enabled():
+        return build()
+
+    key = f"halls:list:{get_version(HALLS_VERSION)}:{base_url}"
+    snapshot = cache.get(key)
+    if snapshot is None:
+        with primary_only():
+            snapshot = build()
+        cache.set(key, snapshot, settings.CATALOG_CACHE_TIMEOUT)
+    return snapshot
+
+
+def get_availability_snapshot(target_date) -> bytes:
+    """Свободные слоты всех залов на дату — в формате HallAvailabilityAPIView."""
+    def build():
+        data = [
+            {
+                "hall_id": hall.id,
+                "date": target_date.isoformat(),
+                "slots": [
+                    {"time": slot, "status": "free"}
+                    for slot in get_available_slot_times(hall, target_date)
+                ],
+            }
+            for hall in Hall.objects.only("id")
+        ]
+        return FastJSONRenderer().render(data)
+
+    if not cache_versions.enabled():
+        return build()
+
+    key = f"halls:availability-all:{get_version(HALLS_VERSION)}:{get_version(AVAILABILITY_VERSION)}:{target_date.isoformat()}"
+    snapshot = cache.get(key)
+    if snapshot is None:
+        with primary_only():
+            snapshot = build()
+        cache.set(key, snapshot, settings.AVAILABILITY_CACHE_TIMEOUT)
+    return snapshot
+
+
+def build_bootstrap(target_date, base_url: str) -> bytes:
+    parts = [
+        (b"date", FastJSONRenderer().render(target_date.isoformat())),
+        (b"halls", get_halls_snapshot(base_url)),
+        (b"product_categories", get_category_snapshot()),
+        (b"products", get_catalog_snapshot("", DEFAULT_ORDERING, base_url)),
+        (b"menu", get_menu_snapshot(base_url)),
+        (b"availability", get_availability_snapshot(target_date)),
+    ]
+    return b"{" + b",".join(b'"' + name + b'":' + body for name, body in parts) + b"}"
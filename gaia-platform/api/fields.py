@@ -0,0 +1,28 @@
+from rest_framework import serializers
+
+from gaia.images import variant_urls
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """
+    Карта уменьшенных копий картинки для srcset:
+    {"webp": {"320": "https://.../a1b2_w320.webp", ...}, "jpeg": {...}}
+    image_field — имя ImageField, из storage которого строятся URL.
+    """
+
+    def __init__(self, image_field: str, **kwargs):
+        self.image_field = image_field
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        return instance
+
+    def to_representation(self, instance):
+        variants = getattr(instance, self.source)
+        storage = getattr(instance, self.image_field).storage
+        request = self.context.get("request")
+        return variant_urls(
+            variants,
+            storage,
+            request.build_absolute_uri if request is not None else None,
+        )
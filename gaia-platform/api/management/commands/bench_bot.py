@@ -0,0 +1,255 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from decimal import Decimal
+from queue import Queue
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import override_settings, setup_databases, teardown_databases
+from django.utils import timezone
+from telegram import Update
+from telegram.ext import Dispatcher
+
+from booking.models import Booking
+from bot.fake_api import FakeTelegramAPI
+from gaia.perf import summarize
+from halls.models import Hall
+from notifications.models import TelegramAdmin
+
+
+FAKE_TOKEN = "123456:BENCH-FAKE-TOKEN"
+# id «админа» в синтетических апдейтах; существует только во временной БД прогона
+BENCH_USER_ID = 990_000_001
+
+MENU_TEXTS = ["📅 Брони на сегодня", "🆕 Новые брони", "📈 Все предстоящие брони"]
+
+
+class UpdateFactory:
+    """Синтетические апдейты в формате Bot API (как их присылает Telegram)."""
+
+    def __init__(self, user_id):
+        self.user = {"id": user_id, "is_bot": False, "first_name": "Bench"}
+        self.chat = {"id": user_id, "type": "private"}
+        self.next_id = 0
+
+    def _id(self):
+        self.next_id += 1
+        return self.next_id
+
+    def _message(self, text):
+        message = {"message_id": self._id(), "date": int(time.time()), "chat": self.chat, "from": self.user, "text": text}
+        if text.startswith("/"):
+            message["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+        return message
+
+    def text(self, text):
+        return {"update_id": self._id(), "message": self._message(text)}
+
+    def callback(self, data):
+        return {
+            "update_id": self._id(),
+            "callback_query": {
+                "id": str(self._id()),
+                "from": self.user,
+                "chat_instance": "bench",
+                "data": data,
+                "message": self._message("…"),
+            },
+        }
+
+
+def scenario_updates(name, count, factory, booking_ids):
+    """Данные апдейтов для сценария (по имени обработчика)."""
+    if name == "handle_menu":
+        return [factory.text(MENU_TEXTS[i % len(MENU_TEXTS)]) for i in range(count)]
+    if name == "booking_callback":
+        actions = ("info_full", "info_short")
+        return [
+            factory.callback(f"{actions[i % 2]}:{booking_ids[i % len(booking_ids)]}")
+            for i in range(count)
+        ]
+    if name == "menu_list":
+        return [factory.text("/menu_list") for _ in range(count)]
+    if name == "start":
+        return [factory.text("/start") for _ in range(count)]
+    raise CommandError(f"Неизвестный сценарий: {name}")
+
+
+SCENARIOS = ["handle_menu", "booking_callback", "menu_list", "start"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Бенчмарк бота: синтетические апдейты идут через диспетчер tg_bot.py "
+        "в несколько потоков, Bot API подменён локальной заглушкой (bot.fake_api) "
+        "с задержкой и 429. Отчёт: апдейтов/с, задержка, вызовов Telegram на апдейт. "
+        "Данные прогона живут во временной тестовой БД (как у manage.py test), "
+        "кеши — в памяти процесса; рабочие БД и кеш не трогаются. "
+        "Временную БД создаёт на сервере из DATABASES — без DEBUG нужен --allow-writes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scenarios", nargs="*", default=SCENARIOS, choices=SCENARIOS)
+        parser.add_argument("--updates", type=int, default=300, help="Апдейтов на сценарий.")
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--latency-ms", type=float, default=30, help="Задержка ответа заглушки Bot API.")
+        parser.add_argument("--rate-limit", type=float, default=0.0, help="Доля ответов 429, 0..1.")
+        parser.add_argument("--bookings", type=int, default=20, help="Сколько броней на сегодня создать для сценариев.")
+        parser.add_argument("--json", dest="json_path", help="Записать отчёт в JSON-файл.")
+        parser.add_argument(
+            "--allow-writes",
+            action="store_true",
+            help="Разрешить запуск без DEBUG: на сервере БД будет создана и удалена временная база.",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options["allow_writes"]:
+            raise CommandError(
+                "bench_bot создаёт временную тестовую БД на сервере из DATABASES. "
+                "Запускайте с DEBUG=True или явно передайте --allow-writes."
+            )
+
+        # как manage.py test: test_<NAME> с миграциями, реплика — зеркало основной;
+        # соединения из потоков диспетчера тоже идут во временную БД
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            # версии и снимки из временной БД не должны попасть в общий кеш
+            with override_settings(CACHES=self._local_caches()):
+                report = self._bench(options)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+        if options["json_path"]:
+            with open(options["json_path"], "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def _local_caches():
+        return {
+            alias: {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": f"bench-bot-{alias}",
+            }
+            for alias in settings.CACHES
+        }
+
+    def _bench(self, options):
+        # tg_bot настраивает Django при импорте — здесь это уже сделано
+        from tg_bot import build_bot, register_handlers
+
+        fake = FakeTelegramAPI(
+            latency=options["latency_ms"] / 1000,
+            rate_limit=options["rate_limit"],
+        ).start()
+        concurrency = options["concurrency"]
+        bot = build_bot(FAKE_TOKEN, concurrency, base_url=fake.base_url)
+        dispatcher = Dispatcher(bot, Queue(), workers=1, use_context=True)
+        register_handlers(dispatcher)
+
+        errors = []
+        dispatcher.add_error_handler(lambda update, context: errors.append(type(context.error).__name__))
+
+        report = {}
+        booking_ids = self._create_fixtures(options["bookings"])
+        try:
+            self.stdout.write(
+                f"{'сценарий':<18} {'апдейтов/с':>11} {'p50, мс':>9} {'p99, мс':>9} "
+                f"{'вызовов TG/апдейт':>18} {'429':>5} {'ошибок':>7}"
+            )
+            for name in options["scenarios"]:
+                factory = UpdateFactory(BENCH_USER_ID)
+                updates = [
+                    Update.de_json(data, bot)
+                    for data in scenario_updates(name, options["updates"], factory, booking_ids)
+                ]
+                report[name] = self._run(dispatcher, fake, updates, concurrency, errors)
+                self._print(name, report[name])
+        finally:
+            fake.stop()
+        return report
+
+    def _run(self, dispatcher, fake, updates, concurrency, errors):
+        fake.reset()
+        errors.clear()
+
+        def process(update):
+            started = time.perf_counter()
+            dispatcher.process_update(update)
+            return time.perf_counter() - started
+
+        def close_connections(barrier):
+            # барьер: каждый поток пула берёт ровно одну задачу и закрывает свои
+            # соединения — иначе временную БД не удалить (к ней есть сессии)
+            connections.close_all()
+            barrier.wait()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            timings = list(pool.map(process, updates))
+            elapsed = time.perf_counter() - started
+            barrier = threading.Barrier(concurrency)
+            list(pool.map(close_connections, [barrier] * concurrency))
+
+        calls = fake.snapshot()
+        total_calls = sum(calls["calls"].values())
+        summary = summarize(timings, elapsed)
+        summary.update(
+            {
+                "telegram_calls": calls["calls"],
+                "telegram_calls_per_update": total_calls / len(updates),
+                "rate_limited": sum(calls["rate_limited"].values()),
+                "errors": len(errors),
+            }
+        )
+        return summary
+
+    def _print(self, name, row):
+        self.stdout.write(
+            f"{name:<18} {row['rps']:>11.1f} {row['p50'] * 1000:>9.1f} {row['p99'] * 1000:>9.1f} "
+            f"{row['telegram_calls_per_update']:>18.2f} {row['rate_limited']:>5} {row['errors']:>7}"
+        )
+        by_method = ", ".join(f"{method}={count}" for method, count in sorted(row["telegram_calls"].items()))
+        self.stdout.write(f"{'':<18} {by_method}")
+
+    # --- данные ---
+
+    def _create_fixtures(self, count):
+        """
+        Админ и брони на сегодня во временной БД; коммитятся — обработчики
+        идут в других потоках.
+        """
+        TelegramAdmin.objects.create(
+            telegram_user_id=BENCH_USER_ID,
+            full_name="Bench",
+            is_superadmin=True,
+        )
+        hall = Hall.objects.create(
+            name="Бенчмарк бота",
+            slug="bench-bot-hall",
+            base_price_per_hour=Decimal("1500.00"),
+        )
+        tz = timezone.get_current_timezone()
+        today = timezone.localdate()
+        bookings = []
+        for i in range(count):
+            start = datetime(today.year, today.month, today.day, 9 + i % 12, tzinfo=tz)
+            bookings.append(
+                Booking(
+                    hall=hall,
+                    customer_name=f"Гость {i}",
+                    customer_phone="+7 900 000-00-00",
+                    customer_email="guest@example.com",
+                    start_time=start,
+                    end_time=start + timedelta(hours=1),
+                    duration_hours=1,
+                    total_price=hall.base_price_per_hour,
+                    status="new",
+                )
+            )
+        Booking.objects.bulk_create(bookings)
+        return list(Booking.objects.filter(hall=hall).values_list("id", flat=True))
+
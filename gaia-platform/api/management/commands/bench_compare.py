@@ -0,0 +1,63 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from gaia.benchmarks import run_suite
+from gaia.perf import compare
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнить микробенчмарки с baseline (JSON от `bench_services --save`). "
+        "Без --current прогоняет набор заново. Завершается с ошибкой, если "
+        "что-то замедлилось больше порога."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("baseline", help="JSON-файл с baseline.")
+        parser.add_argument("--current", help="JSON-файл с текущими результатами (иначе — прогнать сейчас).")
+        parser.add_argument("--threshold", type=float, default=15, help="Допустимое замедление, %%.")
+        parser.add_argument(
+            "--min-delta-us",
+            type=float,
+            default=0.5,
+            help="Не считать замедлением разницу меньше N мкс (шум на очень быстрых функциях).",
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def _load(self, path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Не удалось прочитать {path}: {e}")
+
+    def handle(self, *args, **options):
+        baseline = self._load(options["baseline"])
+        if options["current"]:
+            current = self._load(options["current"])
+        else:
+            current = run_suite(only=list(baseline["results"]), repeat=options["repeat"])
+
+        rows = compare(
+            baseline["results"],
+            current["results"],
+            threshold=options["threshold"] / 100,
+            min_delta=options["min_delta_us"] / 1e6,
+        )
+
+        self.stdout.write(f"{'бенчмарк':<46} {'было, мкс':>10} {'стало, мкс':>11} {'x':>6}  статус")
+        for name, before, after, ratio, status in rows:
+            before_s = f"{before * 1e6:.2f}" if before is not None else "—"
+            after_s = f"{after * 1e6:.2f}" if after is not None else "—"
+            ratio_s = f"{ratio:.2f}" if ratio is not None else "—"
+            line = f"{name:<46} {before_s:>10} {after_s:>11} {ratio_s:>6}  {status}"
+            if status == "slower":
+                line = self.style.ERROR(line)
+            elif status == "faster":
+                line = self.style.SUCCESS(line)
+            self.stdout.write(line)
+
+        slower = [row[0] for row in rows if row[4] == "slower"]
+        if slower:
+            raise CommandError(f"Замедлились больше чем на {options['threshold']}%: {', '.join(slower)}")
@@ -0,0 +1,89 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+from gaia.perf import percentile
+
+
+# режим -> переменные окружения для дочернего процесса
+MODES = {
+    "no-persistence": {"POSTGRES_POOL": "False", "POSTGRES_CONN_MAX_AGE": "0"},
+    "persistent": {"POSTGRES_POOL": "False", "POSTGRES_CONN_MAX_AGE": "60"},
+    "pool": {"POSTGRES_POOL": "True"},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Задержка GET /api/halls/ (p50/p99) без постоянных соединений, "
+        "с CONN_MAX_AGE и с пулом psycopg3. Каждый режим — в отдельном процессе."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--warmup", type=int, default=20)
+        parser.add_argument("--mode", choices=sorted(MODES), help="Прогнать только один режим.")
+        parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options["child"]:
+            self._run_child(options["requests"], options["warmup"])
+            return
+
+        modes = [options["mode"]] if options["mode"] else list(MODES)
+        self.stdout.write(f"{'режим':<16} {'p50, мс':>10} {'p99, мс':>10} {'запросов':>10}")
+        for mode in modes:
+            env = {**os.environ, **MODES[mode]}
+            proc = subprocess.run(
+                [
+                    sys.executable, sys.argv[0], "bench_db_connections", "--child",
+                    "--requests", str(options["requests"]),
+                    "--warmup", str(options["warmup"]),
+                ],
+                env=env,
+                capture_output=True,
+                text=True,
+            )
+            if proc.returncode != 0:
+                self.stderr.write(f"{mode}: ошибка\n{proc.stderr}")
+                continue
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            self.stdout.write(
+                f"{mode:<16} {result['p50'] * 1000:>10.2f} {result['p99'] * 1000:>10.2f} {result['count']:>10}"
+            )
+
+    def _run_child(self, count, warmup):
+        # тестовый клиент ходит с Host: testserver
+        settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+        client = Client()
+        url = reverse("api:hall-list")
+
+        for _ in range(warmup):
+            client.get(url)
+
+        timings = []
+        for _ in range(count):
+            started = time.perf_counter()
+            response = client.get(url)
+            timings.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {url} -> {response.status_code}")
+
+        self.stdout.write(
+            json.dumps(
+                {
+                    "count": count,
+                    "p50": statistics.median(timings),
+                    "p99": percentile(timings, 99),
+                }
+            )
+        )
@@ -0,0 +1,77 @@
+import time
+from datetime import date, timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from api.projections import ProjectionContext
+from api.renderers import FastJSONRenderer, MessagePackRenderer, msgpack, orjson
+from shop.serializers import PRODUCT_LIST_PROJECTION
+from .bench_serializers import as_values_rows, make_products
+
+
+def make_availability(days):
+    """Ответы HallAvailabilityAPIView на несколько дней подряд."""
+    start = date.today()
+    return [
+        {
+            "hall_id": 1,
+            "date": (start + timedelta(days=i)).isoformat(),
+            "slots": [{"time": f"{h:02}:00", "status": "free"} for h in range(9, 21)],
+        }
+        for i in range(days)
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Бенчмарк рендереров: стандартный JSONRenderer DRF, FastJSONRenderer (orjson) "
+        "и MessagePack — время кодирования и размер ответа."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=5_000)
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def _best(self, func, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def handle(self, *args, **options):
+        repeat = options["repeat"]
+
+        products = make_products(options["products"])
+        product_data = PRODUCT_LIST_PROJECTION.to_dicts(
+            as_values_rows(products, PRODUCT_LIST_PROJECTION),
+            ProjectionContext(default_storage),
+        )
+        payloads = [
+            (f"products x{options['products']}", product_data),
+            (f"availability x{options['days']}", make_availability(options["days"])),
+        ]
+
+        renderers = [("DRF JSONRenderer", JSONRenderer())]
+        if orjson is not None:
+            renderers.append(("FastJSONRenderer", FastJSONRenderer()))
+        else:
+            self.stderr.write("orjson не установлен — FastJSONRenderer пропущен")
+        if msgpack is not None:
+            renderers.append(("MessagePack", MessagePackRenderer()))
+        else:
+            self.stderr.write("msgpack не установлен — MessagePackRenderer пропущен")
+
+        self.stdout.write(f"{'данные':<22} {'рендерер':<18} {'мс':>10} {'байт':>12}")
+        for payload_name, data in payloads:
+            for renderer_name, renderer in renderers:
+                body = renderer.render(data)
+                elapsed = self._best(lambda: renderer.render(data), repeat)
+                self.stdout.write(
+                    f"{payload_name:<22} {renderer_name:<18} {elapsed * 1000:>10.2f} {len(body):>12,}"
+                )
@@ -0,0 +1,118 @@
+import time
+from decimal import Decimal
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from api.projections import ProjectionContext
+from api.serializers import HALL_LIST_PROJECTION, HallSerializer
+from halls.models import Hall
+from menus.models import MenuFile
+from menus.serializers import MENU_FILE_LIST_PROJECTION, MenuFileSerializer
+from shop.models import Product, ProductCategory
+from shop.serializers import PRODUCT_LIST_PROJECTION, ProductSerializer
+
+
+def make_products(n):
+    categories = [
+        ProductCategory(id=i, name=f"Категория {i}", slug=f"cat-{i}", description="Описание категории")
+        for i in range(1, 11)
+    ]
+    products = []
+    for i in range(1, n + 1):
+        category = categories[i % len(categories)] if i % 7 else None
+        products.append(
+            Product(
+                id=i,
+                category=category,
+                name=f"Товар {i}",
+                slug=f"product-{i}",
+                description="Кофе, молоко и немного магии. " * 3,
+                price=Decimal("250.00") + i % 100,
+                is_active=True,
+                image=f"products/ab/{i:032x}.jpg" if i % 3 else "",
+                image_variants={"source": "x", "webp": {"320": f"products/ab/{i:032x}_320.webp"}},
+            )
+        )
+    return products
+
+
+def make_halls(n):
+    return [
+        Hall(
+            id=i,
+            name=f"Зал {i}",
+            slug=f"hall-{i}",
+            description="Светлый зал с проектором",
+            capacity=20 + i % 30,
+            base_price_per_hour=Decimal("1500.00"),
+            photo=f"halls/cd/{i:032x}.jpg",
+            photo_variants={},
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def make_menu_files(n):
+    return [
+        MenuFile(id=i, title=f"Меню {i}", file=f"menus/ef/{i:032x}.pdf", sort_order=i * 10)
+        for i in range(1, n + 1)
+    ]
+
+
+def as_values_rows(objects, projection):
+    """Имитируем результат queryset.values(*projection.columns) без БД."""
+    rows = []
+    for obj in objects:
+        row = {}
+        for column in projection.columns:
+            value = obj
+            for part in column.split("__"):
+                value = getattr(value, part) if value is not None else None
+            if hasattr(value, "name") and hasattr(value, "storage"):
+                value = value.name  # FieldFile -> имя файла, как в values()
+            row[column] = value
+        rows.append(row)
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Бенчмарк сериализации списков: ModelSerializer против values()-проекций "
+        "(api.projections). Данные строятся в памяти, БД не нужна."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def _best(self, func, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        repeat = options["repeat"]
+        ctx = ProjectionContext(default_storage)
+
+        cases = [
+            ("products", make_products(rows), ProductSerializer, PRODUCT_LIST_PROJECTION),
+            ("halls", make_halls(rows), HallSerializer, HALL_LIST_PROJECTION),
+            ("menu", make_menu_files(rows), MenuFileSerializer, MENU_FILE_LIST_PROJECTION),
+        ]
+
+        self.stdout.write(f"{'список':<10} {'serializer, rows/s':>20} {'projection, rows/s':>20} {'ускорение':>10}")
+        for name, objects, serializer_class, projection in cases:
+            values_rows = as_values_rows(objects, projection)
+
+            slow = self._best(lambda: serializer_class(objects, many=True).data, repeat)
+            fast = self._best(lambda: projection.to_dicts(values_rows, ctx), repeat)
+
+            self.stdout.write(
+                f"{name:<10} {rows / slow:>20,.0f} {rows / fast:>20,.0f} {slow / fast:>9.1f}x"
+            )
@@ -0,0 +1,39 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from gaia.benchmarks import run_suite
+
+
+class Command(BaseCommand):
+    help = (
+        "Микробенчмарки сервисов (слоты, цена, форматирование бота, тексты уведомлений). "
+        "Фикстуры создаются в текущей БД и откатываются. --save пишет JSON-baseline "
+        "для `manage.py bench_compare`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--save", help="Записать результаты в JSON-файл (baseline).")
+        parser.add_argument("--only", nargs="*", help="Только бенчмарки, в имени которых есть подстрока.")
+        parser.add_argument("--number", type=int, default=None, help="Вызовов в серии (по умолчанию — подбирается).")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'бенчмарк':<46} {'лучшее, мкс':>12} {'медиана, мкс':>13} {'вызовов':>9}")
+
+        def progress(name, result):
+            self.stdout.write(
+                f"{name:<46} {result['best'] * 1e6:>12.2f} {result['median'] * 1e6:>13.2f} {result['number']:>9}"
+            )
+
+        report = run_suite(
+            only=options["only"],
+            number=options["number"],
+            repeat=options["repeat"],
+            progress=progress,
+        )
+
+        if options["save"]:
+            with open(options["save"], "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Сохранено: {options['save']}"))
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from gaia.images import build_variants_for, needs_variants
+from halls.models import Hall
+from shop.models import Product
+
+
+# (модель, поле с картинкой, поле с вариантами)
+IMAGE_FIELDS = [
+    (Product, "image", "image_variants"),
+    (Hall, "photo", "photo_variants"),
+]
+
+
+class Command(BaseCommand):
+    help = "Построить уменьшенные WebP/JPEG копии для уже загруженных фото товаров и залов."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Перестроить варианты, даже если они уже есть.",
+        )
+
+    def handle(self, *args, **options):
+        force = options["force"]
+        total = 0
+
+        for model, image_field, variants_field in IMAGE_FIELDS:
+            qs = model.objects.exclude(**{image_field: ""}).exclude(**{f"{image_field}__isnull": True})
+            for obj in qs.iterator():
+                if not force and not needs_variants(getattr(obj, image_field), getattr(obj, variants_field)):
+                    continue
+                try:
+                    build_variants_for(model, obj.pk, image_field, variants_field)
+                except Exception as e:
+                    self.stderr.write(f"{model.__name__} #{obj.pk}: {e}")
+                    continue
+                total += 1
+                self.stdout.write(f"{model.__name__} #{obj.pk}: готово")
+
+        self.stdout.write(self.style.SUCCESS(f"Готово, картинок: {total}"))
@@ -0,0 +1,226 @@
+import json
+import random
+import threading
+import time
+from datetime import date as date_class, timedelta
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from gaia.perf import summarize
+
+
+# сценарий -> вес в смеси по умолчанию
+DEFAULT_MIX = {
+    "home": 10,
+    "halls_list": 10,
+    "hall_detail": 20,
+    "api_halls": 10,
+    "api_availability": 25,
+    "api_products": 10,
+    "api_search": 5,
+    "api_bootstrap": 5,
+    "api_autocomplete": 5,
+}
+
+SEARCH_QUERIES = ["латте", "капучино", "чай", "круассан", "раф", "чизкейк", "сэндвич", "морс"]
+
+
+def parse_mix(value: str) -> dict:
+    """"home=10,api_availability=30" -> {"home": 10, ...}"""
+    mix = {}
+    for part in value.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise CommandError(f"Неизвестный сценарий: {name}. Есть: {', '.join(DEFAULT_MIX)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class Scenarios:
+    """Строит URL для сценария; залы берутся из /api/halls/ целевого сервера."""
+
+    def __init__(self, base_url: str, days: int):
+        self.base_url = base_url.rstrip("/")
+        self.days = days
+        response = requests.get(f"{self.base_url}/api/halls/", params={"fields": "id,slug"}, timeout=30)
+        response.raise_for_status()
+        data = response.json()
+        self.halls = data["results"] if isinstance(data, dict) else data
+        if not self.halls:
+            raise CommandError("На сервере нет залов — сначала `manage.py seed_data`.")
+
+    def _date(self, rng) -> str:
+        return (date_class.today() + timedelta(days=rng.randrange(self.days))).isoformat()
+
+    def url(self, name: str, rng) -> str:
+        hall = rng.choice(self.halls)
+        paths = {
+            "home": "/",
+            "halls_list": "/halls/",
+            "hall_detail": f"/halls/{hall['slug']}/?date={self._date(rng)}",
+            "api_halls": "/api/halls/",
+            "api_availability": f"/api/halls/{hall['id']}/availability/?date={self._date(rng)}",
+            "api_products": "/api/products/",
+            "api_search": f"/api/products/search/?q={rng.choice(SEARCH_QUERIES)}",
+            "api_bootstrap": f"/api/bootstrap/?date={self._date(rng)}",
+            "api_autocomplete": f"/api/autocomplete/?q={rng.choice(SEARCH_QUERIES)[:3]}",
+        }
+        return self.base_url + paths[name]
+
+
+class Command(BaseCommand):
+    help = (
+        "Нагрузочный прогон: смесь запросов к публичному API и HTML-страницам "
+        "в несколько потоков; отчёт — rps и перцентили задержки по сценариям. "
+        "Данные для реалистичной нагрузки — `manage.py seed_data`. "
+        "Доступность залов ограничена по IP: на целевом сервере поднимите "
+        "THROTTLE_AVAILABILITY, иначе заметная часть ответов будет 429."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--duration", type=float, default=30, help="Секунд на прогон.")
+        parser.add_argument("--requests", type=int, default=0, help="Остановиться после N запросов (0 — по времени).")
+        parser.add_argument("--warmup", type=float, default=3, help="Секунд прогрева (не входят в отчёт).")
+        parser.add_argument(
+            "--mix",
+            default="",
+            help=f"Веса сценариев, например home=10,api_availability=30. По умолчанию: "
+            f"{','.join(f'{k}={v}' for k, v in DEFAULT_MIX.items())}",
+        )
+        parser.add_argument("--days", type=int, default=14, help="Даты в запросах — от сегодня на N дней.")
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument("--json", dest="json_path", help="Записать отчёт в JSON-файл.")
+        parser.add_argument(
+            "--max-p99-ms",
+            type=float,
+            default=0,
+            help="Завершиться с ошибкой, если p99 какого-либо сценария выше (для CI).",
+        )
+        parser.add_argument(
+            "--max-error-rate",
+            type=float,
+            default=None,
+            help="Завершиться с ошибкой, если доля ошибок (не 2xx/3xx, включая 429 и "
+            "сбои соединения) какого-либо сценария выше, например 0.01. Быстрые ответы "
+            "500 проходят --max-p99-ms — для CI задавайте оба порога.",
+        )
+
+    def handle(self, *args, **options):
+        mix = parse_mix(options["mix"]) if options["mix"] else DEFAULT_MIX
+        names, weights = zip(*mix.items())
+        scenarios = Scenarios(options["base_url"], options["days"])
+        seed = options["seed"]
+
+        if options["warmup"]:
+            self._run(scenarios, names, weights, options["concurrency"], options["warmup"], 0, seed)
+
+        results, elapsed = self._run(
+            scenarios, names, weights, options["concurrency"], options["duration"], options["requests"], seed
+        )
+        report = self._report(results, elapsed)
+        self._print(report)
+
+        if options["json_path"]:
+            with open(options["json_path"], "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+        max_error_rate = options["max_error_rate"]
+        if max_error_rate is not None:
+            failing = [
+                f"{name} ({row['errors'] / row['count']:.1%})"
+                for name, row in report["scenarios"].items()
+                if row["count"] and row["errors"] / row["count"] > max_error_rate
+            ]
+            if failing:
+                raise CommandError(f"Доля ошибок выше {max_error_rate:.1%}: {', '.join(failing)}")
+
+        limit = options["max_p99_ms"]
+        if limit:
+            slow = [
+                name for name, row in report["scenarios"].items()
+                if row["count"] and row["p99"] * 1000 > limit
+            ]
+            if slow:
+                raise CommandError(f"p99 выше {limit} мс: {', '.join(slow)}")
+
+    def _run(self, scenarios, names, weights, concurrency, duration, max_requests, seed):
+        deadline = time.monotonic() + duration
+        budget = [max_requests]
+        budget_lock = threading.Lock()
+        # у каждого потока свой список — без блокировок на записи результатов
+        per_thread = [[] for _ in range(concurrency)]
+
+        def take():
+            if not max_requests:
+                return time.monotonic() < deadline
+            with budget_lock:
+                if budget[0] <= 0:
+                    return False
+                budget[0] -= 1
+                return True
+
+        def worker(results, worker_seed):
+            rng = random.Random(worker_seed)
+            session = requests.Session()
+            while take():
+                name = rng.choices(names, weights)[0]
+                url = scenarios.url(name, rng)
+                started = time.perf_counter()
+                try:
+                    response = session.get(url, timeout=30)
+                    status = response.status_code
+                except requests.RequestException:
+                    status = 0
+                results.append((name, time.perf_counter() - started, status))
+
+        threads = [
+            threading.Thread(
+                target=worker,
+                args=(per_thread[i], None if seed is None else seed + i),
+                daemon=True,
+            )
+            for i in range(concurrency)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        return [row for rows in per_thread for row in rows], elapsed
+
+    def _report(self, results, elapsed):
+        by_name = {}
+        for name, latency, status in results:
+            by_name.setdefault(name, []).append((latency, status))
+
+        scenarios = {}
+        for name, rows in sorted(by_name.items()):
+            summary = summarize([latency for latency, _ in rows], elapsed)
+            summary["errors"] = sum(1 for _, status in rows if not 200 <= status < 400)
+            summary["throttled"] = sum(1 for _, status in rows if status == 429)
+            scenarios[name] = summary
+
+        total = summarize([latency for _, latency, _ in results], elapsed)
+        total["errors"] = sum(row["errors"] for row in scenarios.values())
+        total["throttled"] = sum(row["throttled"] for row in scenarios.values())
+        return {"elapsed": elapsed, "total": total, "scenarios": scenarios}
+
+    def _print(self, report):
+        header = f"{'сценарий':<18} {'запросов':>9} {'ошибок':>7} {'429':>6} {'rps':>8} {'p50, мс':>9} {'p90, мс':>9} {'p99, мс':>9} {'max, мс':>9}"
+        self.stdout.write(header)
+        rows = list(report["scenarios"].items()) + [("ВСЕГО", report["total"])]
+        for name, row in rows:
+            if not row["count"]:
+                continue
+            self.stdout.write(
+                f"{name:<18} {row['count']:>9} {row['errors']:>7} {row['throttled']:>6} {row['rps']:>8.1f} "
+                f"{row['p50'] * 1000:>9.1f} {row['p90'] * 1000:>9.1f} "
+                f"{row['p99'] * 1000:>9.1f} {row['max'] * 1000:>9.1f}"
+            )
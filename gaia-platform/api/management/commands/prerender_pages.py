@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from gaia.prerender import publish
+
+
+class Command(BaseCommand):
+    help = (
+        "Отрендерить главную и страницы залов в статические HTML-файлы "
+        "и атомарно опубликовать их (см. gaia.prerender). Запускать по cron раз в сутки."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.PRERENDER_DAYS,
+            help="На сколько дней вперёд рендерить страницы залов.",
+        )
+        parser.add_argument(
+            "--dir",
+            default=settings.PRERENDER_DIR,
+            help="Каталог публикации (по умолчанию PRERENDER_DIR).",
+        )
+
+    def handle(self, *args, **options):
+        if not options["dir"]:
+            raise CommandError("Не задан каталог: укажите --dir или PRERENDER_DIR.")
+        release = publish(days=options["days"], publish_dir=options["dir"])
+        self.stdout.write(self.style.SUCCESS(f"Опубликовано: {release}"))
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from gaia.profiling import make_token
+
+
+class Command(BaseCommand):
+    help = (
+        "Выдать подписанный токен для профилирования запроса: "
+        "передать в заголовке X-Gaia-Profile (см. gaia.profiling)."
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(make_token())
+        self.stderr.write(f"Токен действует {settings.PROFILE_TOKEN_MAX_AGE} с.")
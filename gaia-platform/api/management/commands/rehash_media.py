@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from gaia.storage import is_content_addressed
+from halls.models import Hall
+from menus.models import MenuFile
+from shop.models import Product
+
+
+# (модель, поле с файлом)
+MEDIA_FIELDS = [
+    (MenuFile, "file"),
+    (Product, "image"),
+    (Hall, "photo"),
+]
+
+
+class Command(BaseCommand):
+    help = "Переложить уже загруженные медиа под имена по хешу содержимого (неизменяемые URL)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только показать, какие файлы будут переименованы.",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        total = 0
+
+        for model, field_name in MEDIA_FIELDS:
+            qs = model.objects.exclude(**{field_name: ""}).exclude(**{f"{field_name}__isnull": True})
+            for obj in qs.iterator():
+                field_file = getattr(obj, field_name)
+                old_name = field_file.name
+                if is_content_addressed(old_name):
+                    continue
+
+                if not field_file.storage.exists(old_name):
+                    self.stderr.write(f"{model.__name__} #{obj.pk}: файл {old_name} не найден")
+                    continue
+
+                total += 1
+                if dry_run:
+                    self.stdout.write(f"{model.__name__} #{obj.pk}: {old_name}")
+                    continue
+
+                with field_file.storage.open(old_name, "rb") as fh:
+                    # generate_filename применит upload_to поля к исходному имени
+                    field_file.save(old_name.rsplit("/", 1)[-1], fh, save=False)
+
+                with transaction.atomic():
+                    # через save(), а не update(): обновится updated_at (ETag списков)
+                    # и сработают сигналы — сброс версий кешей, пререндер
+                    update_fields = [field_name]
+                    if any(f.name == "updated_at" for f in model._meta.fields):
+                        update_fields.append("updated_at")
+                    obj.save(update_fields=update_fields)
+                    transaction.on_commit(
+                        lambda storage=field_file.storage, name=old_name: self._delete_unused(storage, name)
+                    )
+                self.stdout.write(f"{model.__name__} #{obj.pk}: {old_name} -> {field_file.name}")
+
+        self.stdout.write(self.style.SUCCESS(f"Готово, файлов: {total}"))
+
+    def _delete_unused(self, storage, name):
+        """Удалить старый файл, если на него больше никто не ссылается."""
+        for model, field_name in MEDIA_FIELDS:
+            if model.objects.filter(**{field_name: name}).exists():
+                return
+        storage.delete(name)
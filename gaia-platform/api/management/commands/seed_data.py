@@ -0,0 +1,331 @@
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from api.autocomplete import rebuild_everywhere
+from booking.models import Booking
+from booking.services import WORK_DAY_END_HOUR, WORK_DAY_START_HOUR
+from gaia.cache_versions import bump_version
+from halls.models import BlockedSlot, Hall
+from halls.services import AVAILABILITY_VERSION, HALLS_VERSION
+from shop.models import Product, ProductCategory
+from shop.services import invalidate_catalog
+
+
+# всё сгенерированное помечается слагом с этим префиксом — для --clear
+SEED_PREFIX = "seed-"
+
+FIRST_NAMES = ["Анна", "Иван", "Мария", "Олег", "Ксения", "Дмитрий", "Елена", "Павел", "Софья", "Артём"]
+LAST_NAMES = ["Иванова", "Петров", "Смирнова", "Кузнецов", "Попова", "Соколов", "Лебедева", "Новиков"]
+HALL_KINDS = ["Малый зал", "Большой зал", "Лекторий", "Переговорная", "Студия", "Веранда", "Мансарда"]
+PRODUCT_WORDS = ["Капучино", "Латте", "Раф", "Флэт уайт", "Чай", "Круассан", "Чизкейк", "Сэндвич", "Морс"]
+PRODUCT_TRAITS = ["ванильный", "ореховый", "классический", "большой", "на овсяном", "без сахара", "сезонный"]
+COMMENTS = ["", "", "", "Нужен проектор", "День рождения", "Лекция", "Корпоратив", "Мастер-класс"]
+
+# статусы: активные (занимают слот) и отменённые (могут пересекаться)
+ACTIVE_STATUSES = (("confirmed", 8), ("new", 2))
+INACTIVE_STATUSES = ("cancelled", "rejected")
+CANCELLED_SHARE = 0.1
+
+# В среднем броней на зал в день: по умолчанию период подбирается под это
+# число, чтобы у залов оставались свободные слоты. Больше MAX — в рабочий
+# день без пересечений не помещается, остаток пришлось бы делать отменами.
+BOOKINGS_PER_HALL_DAY = 3
+MAX_BOOKINGS_PER_HALL_DAY = 4
+
+BOOKING_COLUMNS = [
+    "hall_id",
+    "customer_name",
+    "customer_phone",
+    "customer_email",
+    "start_time",
+    "end_time",
+    "duration_hours",
+    "total_price",
+    "status",
+    "comment",
+    "created_at",
+]
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Массово залить синтетические данные для нагрузочных прогонов: залы, "
+        "брони за несколько лет, блокировки, каталог товаров. "
+        "Брони пишутся через COPY (Postgres) или bulk_create пачками. "
+        "Пишет в БД из настроек — без DEBUG нужен --allow-writes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--halls", type=int, default=50)
+        parser.add_argument("--bookings", type=int, default=1_000_000)
+        parser.add_argument(
+            "--years",
+            type=float,
+            default=None,
+            help=f"Период броней (в основном в прошлом). По умолчанию — такой, чтобы на зал "
+            f"приходилось ~{BOOKINGS_PER_HALL_DAY} брони в день.",
+        )
+        parser.add_argument("--future-days", type=int, default=90, help="Сколько дней вперёд от сегодня.")
+        parser.add_argument("--blocks", type=int, default=5_000)
+        parser.add_argument("--products", type=int, default=5_000)
+        parser.add_argument("--categories", type=int, default=20)
+        parser.add_argument("--chunk", type=int, default=10_000)
+        parser.add_argument("--seed", type=int, default=42, help="Seed генератора — данные воспроизводимы.")
+        parser.add_argument("--no-copy", action="store_true", help="Не использовать COPY даже на Postgres.")
+        parser.add_argument("--clear", action="store_true", help="Сначала удалить ранее залитые данные.")
+        parser.add_argument(
+            "--allow-writes",
+            action="store_true",
+            help="Разрешить запуск без DEBUG: данные появятся на сайте и в API.",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options["allow_writes"]:
+            raise CommandError(
+                "seed_data заливает в БД из настроек публичные залы, товары и брони. "
+                "Запускайте с DEBUG=True или явно передайте --allow-writes."
+            )
+
+        # период проверяем до записи: слишком плотные брони — ошибка сразу
+        days_count = self._days_count(options)
+        self.rng = random.Random(options["seed"])
+        self.chunk = options["chunk"]
+        self.tz = timezone.get_current_timezone()
+
+        if options["clear"]:
+            self._clear()
+
+        started = time.perf_counter()
+        halls = self._seed_halls(options["halls"])
+        self._seed_catalog(options["categories"], options["products"])
+
+        today = timezone.localdate()
+        first_day = today + timedelta(days=options["future_days"] - days_count)
+        days = [first_day + timedelta(days=i) for i in range(days_count)]
+
+        use_copy = connection.vendor == "postgresql" and not options["no_copy"]
+        self._seed_bookings(halls, days, options["bookings"], use_copy)
+        self._seed_blocks(halls, days, options["blocks"])
+
+        # bulk_create/COPY не вызывают сигналы — кеши сбрасываем сами
+        bump_version(HALLS_VERSION)
+        bump_version(AVAILABILITY_VERSION)
+        invalidate_catalog()
+        rebuild_everywhere()
+
+        self.stdout.write(self.style.SUCCESS(f"Готово за {time.perf_counter() - started:.1f} с"))
+
+    @staticmethod
+    def _days_count(options):
+        """Дней в периоде броней (включая future_days вперёд от сегодня)."""
+        halls, total = max(options["halls"], 1), options["bookings"]
+        if options["years"] is None:
+            days = math.ceil(total / (halls * BOOKINGS_PER_HALL_DAY))
+            return max(days, options["future_days"] + 1)
+
+        days = max(int(options["years"] * 365), options["future_days"] + 1)
+        if total / (halls * days) > MAX_BOOKINGS_PER_HALL_DAY:
+            raise CommandError(
+                f"{total:,} броней на {halls} залов за {days} дней — больше "
+                f"{MAX_BOOKINGS_PER_HALL_DAY} в день на зал. Увеличьте --years или --halls "
+                f"или не задавайте --years."
+            )
+        return days
+
+    # --- удаление ---
+
+    def _clear(self):
+        hall_ids = list(Hall.objects.filter(slug__startswith=SEED_PREFIX).values_list("id", flat=True))
+        with transaction.atomic(), connection.cursor() as cursor:
+            # напрямую SQL: .delete() на миллионе броней тянет всё в память ради сигналов
+            for model in (Booking, BlockedSlot):
+                for ids in chunked(hall_ids, 1000):
+                    cursor.execute(
+                        f"DELETE FROM {connection.ops.quote_name(model._meta.db_table)} "
+                        f"WHERE hall_id IN ({', '.join(['%s'] * len(ids))})",
+                        ids,
+                    )
+            Hall.objects.filter(id__in=hall_ids).delete()
+            Product.objects.filter(slug__startswith=SEED_PREFIX).delete()
+            ProductCategory.objects.filter(slug__startswith=SEED_PREFIX).delete()
+        self.stdout.write(f"Удалено залов: {len(hall_ids)} (с бронями и блокировками)")
+
+    # --- залы и каталог ---
+
+    def _seed_halls(self, count):
+        halls = [
+            Hall(
+                name=f"{self.rng.choice(HALL_KINDS)} №{i}",
+                slug=f"{SEED_PREFIX}hall-{i}",
+                description="Светлый зал с проектором и флипчартом.",
+                capacity=self.rng.choice([8, 12, 20, 30, 50, 80]),
+                base_price_per_hour=Decimal(self.rng.choice([900, 1200, 1500, 2000, 3500])),
+            )
+            for i in range(1, count + 1)
+        ]
+        Hall.objects.bulk_create(halls, batch_size=self.chunk)
+        # id нужны для броней (bulk_create на Postgres их возвращает, на SQLite — нет)
+        halls = list(Hall.objects.filter(slug__startswith=SEED_PREFIX).order_by("id"))
+        self.stdout.write(f"Залов: {len(halls)}")
+        return halls
+
+    def _seed_catalog(self, categories_count, products_count):
+        categories = [
+            ProductCategory(
+                name=f"Категория {i}",
+                slug=f"{SEED_PREFIX}category-{i}",
+                sort_order=i,
+            )
+            for i in range(1, categories_count + 1)
+        ]
+        ProductCategory.objects.bulk_create(categories, batch_size=self.chunk)
+        categories = list(ProductCategory.objects.filter(slug__startswith=SEED_PREFIX))
+
+        def products():
+            for i in range(1, products_count + 1):
+                yield Product(
+                    category=self.rng.choice(categories) if categories and i % 10 else None,
+                    name=f"{self.rng.choice(PRODUCT_WORDS)} {self.rng.choice(PRODUCT_TRAITS)} {i}",
+                    slug=f"{SEED_PREFIX}product-{i}",
+                    description="Готовим каждый день из свежих продуктов.",
+                    price=Decimal(self.rng.randrange(90, 900, 10)),
+                    is_active=self.rng.random() > 0.05,
+                )
+
+        for chunk in chunked(products(), self.chunk):
+            Product.objects.bulk_create(chunk)
+        self.stdout.write(f"Категорий: {len(categories)}, товаров: {products_count}")
+
+    # --- брони ---
+
+    def _booking_row(self, hall, start, duration, status):
+        name = f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+        return (
+            hall.id,
+            name,
+            f"+7 9{self.rng.randrange(10**8, 10**9)}",
+            f"guest{self.rng.randrange(10**6)}@example.com",
+            start,
+            start + timedelta(hours=duration),
+            duration,
+            hall.base_price_per_hour * duration,
+            status,
+            self.rng.choice(COMMENTS),
+            start - timedelta(days=self.rng.randrange(1, 30), minutes=self.rng.randrange(1440)),
+        )
+
+    def _day_bookings(self, hall, day, count):
+        """
+        Брони зала на день: около CANCELLED_SHARE — отменённые/отклонённые,
+        остальные активные — без пересечений (как в жизни: их не даёт создать
+        is_slot_available), со свободными окнами в случайных местах дня.
+        """
+        cancelled = sum(self.rng.random() < CANCELLED_SHARE for _ in range(count))
+        durations = [self.rng.choice((1, 1, 2, 2, 3, 4)) for _ in range(count - cancelled)]
+        day_hours = WORK_DAY_END_HOUR - WORK_DAY_START_HOUR
+        while sum(durations) > day_hours:
+            # не поместилась — редкий случай при MAX_BOOKINGS_PER_HALL_DAY
+            durations.pop()
+            cancelled += 1
+
+        # свободные часы делим на окна между бронями случайными разрезами
+        free = day_hours - sum(durations)
+        cuts = sorted(self.rng.randint(0, free) for _ in durations)
+        statuses, weights = zip(*ACTIVE_STATUSES)
+        hour, prev_cut = WORK_DAY_START_HOUR, 0
+        for cut, duration in zip(cuts, durations):
+            hour += cut - prev_cut
+            prev_cut = cut
+            start = datetime(day.year, day.month, day.day, hour, tzinfo=self.tz)
+            yield self._booking_row(hall, start, duration, self.rng.choices(statuses, weights)[0])
+            hour += duration
+
+        for _ in range(cancelled):
+            duration = self.rng.choice((1, 2, 3))
+            hour = self.rng.randrange(WORK_DAY_START_HOUR, WORK_DAY_END_HOUR - duration + 1)
+            start = datetime(day.year, day.month, day.day, hour, tzinfo=self.tz)
+            yield self._booking_row(hall, start, duration, self.rng.choice(INACTIVE_STATUSES))
+
+    def _iter_bookings(self, halls, days, total):
+        # равномерно по дням и залам, дробная часть копится
+        per_hall_day = total / (len(halls) * len(days))
+        carry = 0.0
+        produced = 0
+        for day in days:
+            for hall in halls:
+                carry += per_hall_day
+                count = min(int(carry), total - produced)
+                carry -= int(carry)
+                for row in self._day_bookings(hall, day, count):
+                    yield row
+                    produced += 1
+                if produced >= total:
+                    return
+
+    def _seed_bookings(self, halls, days, total, use_copy):
+        if not halls or not days or total <= 0:
+            return
+        rows = self._iter_bookings(halls, days, total)
+        started = time.perf_counter()
+        written = 0
+
+        if use_copy:
+            table = connection.ops.quote_name(Booking._meta.db_table)
+            columns = ", ".join(
+                connection.ops.quote_name(Booking._meta.get_field(name.removesuffix("_id")).column)
+                for name in BOOKING_COLUMNS
+            )
+            for chunk in chunked(rows, self.chunk):
+                with transaction.atomic(), connection.cursor() as cursor:
+                    # cursor.cursor — «сырой» курсор psycopg3 с поддержкой COPY
+                    with cursor.cursor.copy(f"COPY {table} ({columns}) FROM STDIN") as copy:
+                        for row in chunk:
+                            copy.write_row(row)
+                written += len(chunk)
+                self._progress("Брони", written, total, started)
+        else:
+            for chunk in chunked(rows, self.chunk):
+                Booking.objects.bulk_create(
+                    [Booking(**dict(zip(BOOKING_COLUMNS, row))) for row in chunk]
+                )
+                written += len(chunk)
+                self._progress("Брони", written, total, started)
+
+        self.stdout.write(f"Броней: {written}")
+
+    def _seed_blocks(self, halls, days, count):
+        def blocks():
+            for _ in range(count):
+                day = self.rng.choice(days)
+                duration = self.rng.choice((1, 2, 4, 12))
+                hour = self.rng.randrange(WORK_DAY_START_HOUR, max(WORK_DAY_END_HOUR - duration, WORK_DAY_START_HOUR) + 1)
+                start = datetime(day.year, day.month, day.day, hour, tzinfo=self.tz)
+                yield BlockedSlot(
+                    hall=self.rng.choice(halls),
+                    start_time=start,
+                    end_time=start + timedelta(hours=duration),
+                    reason=self.rng.choice(["Уборка", "Ремонт", "Закрытое мероприятие", ""]),
+                )
+
+        for chunk in chunked(blocks(), self.chunk):
+            BlockedSlot.objects.bulk_create(chunk)
+        self.stdout.write(f"Блокировок: {count}")
+
+    def _progress(self, label, done, total, started):
+        rate = done / max(time.perf_counter() - started, 1e-9)
+        self.stdout.write(f"  {label}: {done:,}/{total:,} ({rate:,.0f}/с)")
@@ -0,0 +1,150 @@
+import hashlib
+
+from django.core.files.storage import default_storage
+from django.db.models import Count, Max
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .projections import ProjectionContext
+
+
+def get_list_state(queryset, timestamp_fields) -> tuple:
+    """
+    Состояние списка одним агрегирующим запросом: (count, последнее
+    изменение по каждому из timestamp_fields). Годится и как основа ETag,
+    и как часть ключа кеша — меняется при любом изменении данных в БД.
+    """
+    aggregates = {"_count": Count("pk")}
+    for i, field in enumerate(timestamp_fields):
+        aggregates[f"_ts{i}"] = Max(field)
+    row = queryset.order_by().aggregate(**aggregates)
+    return (row["_count"], *(row[f"_ts{i}"] for i in range(len(timestamp_fields))))
+
+
+class ConditionalListMixin:
+    """
+    Conditional GET для редко меняющихся списков.
+
+    Валидатор считается одним агрегирующим запросом (max(updated_at) + count)
+    по тому же отфильтрованному queryset, что и сам список. Если клиент прислал
+    совпадающий If-None-Match / If-Modified-Since — отвечаем 304 ещё до
+    сериализации.
+
+    conditional_timestamp_fields — поля, по которым ищем последнее изменение
+    (можно указывать и связанные, например "category__updated_at").
+    Посчитанное состояние остаётся в self.conditional_state — им можно
+    ключевать кеш готового ответа.
+    """
+
+    conditional_timestamp_fields = ["updated_at"]
+    conditional_state = None
+
+    def get_conditional_validators(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        self.conditional_state = get_list_state(queryset, self.conditional_timestamp_fields)
+        count, *timestamps = self.conditional_state
+        timestamps = [ts for ts in timestamps if ts is not None]
+        last_modified = max(timestamps) if timestamps else None
+
+        raw = "|".join(
+            [
+                self.request.path,
+                self.request.GET.urlencode(),
+                self.request.accepted_media_type or "",
+                str(count),
+                *(ts.isoformat() for ts in timestamps),
+            ]
+        )
+        etag = '"%s"' % hashlib.sha1(raw.encode()).hexdigest()
+        return etag, last_modified
+
+    def _is_not_modified(self, request, etag, last_modified) -> bool:
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            tags = [t.strip() for t in if_none_match.split(",")]
+            return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+        if last_modified is not None:
+            since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+            return since is not None and int(last_modified.timestamp()) <= since
+        return False
+
+    def _set_conditional_headers(self, response, etag, last_modified):
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        # кешировать можно, но каждый раз перепроверять
+        response["Cache-Control"] = "no-cache"
+        # тело зависит от формата (JSON / MessagePack)
+        patch_vary_headers(response, ["Accept"])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        etag, last_modified = self.get_conditional_validators()
+
+        if self._is_not_modified(request, etag, last_modified):
+            return self._set_conditional_headers(HttpResponseNotModified(), etag, last_modified)
+
+        response = self.get_list_response(request, *args, **kwargs)
+        return self._set_conditional_headers(response, etag, last_modified)
+
+    def get_list_response(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+
+class ProjectionListMixin:
+    """
+    Список через values()-проекцию (api.projections) вместо serializer_class.
+    serializer_class остаётся для схемы/документации и detail-эндпоинтов.
+
+    Поддерживает ?fields=id,name,... (только эти ключи и их колонки в SELECT)
+    и ?expand=category (развернуть вложенный объект, иначе — только его id).
+    """
+
+    list_projection = None
+
+    def get_projection_context(self):
+        return ProjectionContext(default_storage, self.request)
+
+    @staticmethod
+    def _parse_list_param(request, name):
+        raw = request.query_params.get(name)
+        if raw is None:
+            return None
+        return [part.strip() for part in raw.split(",") if part.strip()]
+
+    def get_list_projection(self):
+        fields = self._parse_list_param(self.request, "fields")
+        expand = self._parse_list_param(self.request, "expand") or []
+        if fields is None and not expand:
+            return self.list_projection
+
+        errors = {}
+        unknown = [f for f in fields or [] if f not in self.list_projection.keys]
+        if unknown:
+            errors["fields"] = f"Неизвестные поля: {', '.join(unknown)}. Доступны: {', '.join(self.list_projection.keys)}"
+        unknown = [f for f in expand if f not in self.list_projection.expandable]
+        if unknown:
+            errors["expand"] = f"Нельзя развернуть: {', '.join(unknown)}. Доступны: {', '.join(self.list_projection.expandable) or '—'}"
+        if errors:
+            raise ValidationError(errors)
+
+        if fields is not None:
+            # развёрнутое поле обязательно попадает в ответ
+            fields = fields + [e for e in expand if e not in fields]
+        return self.list_projection.subset(fields, expand)
+
+    def list(self, request, *args, **kwargs):
+        projection = self.get_list_projection()
+        queryset = self.filter_queryset(self.get_queryset())
+        extra_columns = [f.lstrip("-") for f in getattr(self, "ordering_fields", None) or []]
+        rows = projection.values(queryset, extra_columns)
+        ctx = self.get_projection_context()
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(projection.to_dicts(page, ctx))
+        return Response(projection.to_dicts(rows, ctx))
@@ -0,0 +1,49 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Курсорная (keyset) пагинация: следующая страница выбирается по
+    WHERE <поле сортировки> > <значение из курсора>, без OFFSET и без COUNT(*),
+    поэтому время ответа не растёт вместе с таблицей.
+
+    Порядок всегда заканчивается на id: при одинаковых значениях поля
+    сортировки (цена, время начала) строки внутри группы идут в одном и том
+    же порядке, и страницы не теряют и не повторяют записи.
+    """
+
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        ordering = tuple(super().get_ordering(request, queryset, view))
+        if any(field.lstrip("-") in ("id", "pk") for field in ordering):
+            return ordering
+        # id в том же направлении, что и основное поле
+        return ordering + ("-id" if ordering[0].startswith("-") else "id",)
+
+
+class ProductCursorPagination(KeysetPagination):
+    """
+    Товары: сортировка берётся из ?ordering= (name, price, created_at).
+
+    Пагинация включается, только если клиент явно прислал ?cursor= или ?page_size=,
+    иначе отдаём весь каталог, как раньше (из кешированного снимка).
+    """
+
+    ordering = "name"
+
+    @staticmethod
+    def is_requested(request) -> bool:
+        return "cursor" in request.query_params or "page_size" in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+
+class BookingCursorPagination(KeysetPagination):
+    ordering = "start_time"
@@ -0,0 +1,156 @@
+"""
+Быстрый путь для read-only списков: вместо ModelSerializer (создание объектов
+моделей + to_representation на каждое поле) берём из БД values()-проекцию
+нужных колонок и раскладываем строки в словари по заранее собранному плану.
+
+Вывод совпадает с соответствующим ModelSerializer'ом.
+"""
+from urllib.parse import urljoin
+
+from gaia.images import variant_urls
+
+
+class ProjectionContext:
+    """То, что нужно конвертерам: storage для URL файлов и построение абсолютных URL."""
+
+    def __init__(self, storage, request=None):
+        self.storage = storage
+        self.build_absolute_uri = request.build_absolute_uri if request is not None else None
+
+    @classmethod
+    def for_base_url(cls, storage, base_url: str):
+        """Без request — например, когда кеш пересобирается из сигнала."""
+        ctx = cls(storage)
+        ctx.build_absolute_uri = lambda location=None: urljoin(base_url, location or "")
+        return ctx
+
+
+# ---------- Конвертеры значений: (value, row, ctx) -> JSON-значение ----------
+
+
+def as_decimal_str(value, row, ctx):
+    # DRF по умолчанию отдаёт DecimalField строкой (COERCE_DECIMAL_TO_STRING)
+    return None if value is None else str(value)
+
+
+def as_file_url(value, row, ctx):
+    if not value:
+        return None
+    url = ctx.storage.url(value)
+    return ctx.build_absolute_uri(url) if ctx.build_absolute_uri else url
+
+
+def as_image_variants(value, row, ctx):
+    return variant_urls(value, ctx.storage, ctx.build_absolute_uri)
+
+
+class Nested:
+    """Вложенный объект по FK: {"category": {...}} или None, если FK пустой."""
+
+    def __init__(self, relation: str, fields):
+        self.relation = relation
+        self.fields = fields
+
+
+class Projection:
+    """
+    fields — список элементов:
+        "name"                          — колонка как есть;
+        ("file_url", "file", as_file_url) — ключ в ответе, колонка, конвертер;
+        ("category", Nested("category", [...])) — вложенный объект.
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.columns = []
+        self._plan = self._compile(fields, prefix="")
+        self._subsets = {}
+
+    @staticmethod
+    def _key(item):
+        return item if isinstance(item, str) else item[0]
+
+    @property
+    def keys(self):
+        return [self._key(item) for item in self.fields]
+
+    @property
+    def expandable(self):
+        return [item[0] for item in self.fields if not isinstance(item, str) and isinstance(item[1], Nested)]
+
+    def subset(self, fields=None, expand=()):
+        """
+        Проекция только с нужными ключами (?fields=) — в SELECT попадут только их колонки.
+        Вложенный объект (Nested) разворачивается, только если он есть в expand;
+        иначе вместо него отдаётся id связанной записи, и JOIN не нужен.
+        fields=None — все поля, как у полной проекции.
+        """
+        cache_key = (tuple(fields) if fields is not None else None, tuple(sorted(expand)))
+        projection = self._subsets.get(cache_key)
+        if projection is not None:
+            return projection
+
+        wanted = set(fields) if fields is not None else None
+        items = []
+        for item in self.fields:
+            key = self._key(item)
+            if wanted is not None and key not in wanted:
+                continue
+            if not isinstance(item, str) and isinstance(item[1], Nested):
+                if fields is not None and key not in expand:
+                    item = (key, f"{item[1].relation}_id", None)
+            items.append(item)
+
+        projection = Projection(items)
+        if len(self._subsets) > 256:
+            self._subsets.clear()
+        self._subsets[cache_key] = projection
+        return projection
+
+    def _compile(self, fields, prefix):
+        plan = []
+        for item in fields:
+            if isinstance(item, str):
+                key, column, converter = item, item, None
+            elif isinstance(item[1], Nested):
+                key, nested = item
+                nested_prefix = f"{prefix}{nested.relation}__"
+                null_column = f"{prefix}{nested.relation}_id"
+                self._add_column(null_column)
+                plan.append((key, null_column, self._compile(nested.fields, nested_prefix)))
+                continue
+            else:
+                key, column, converter = item
+
+            column = prefix + column
+            self._add_column(column)
+            plan.append((key, column, converter))
+        return plan
+
+    def _add_column(self, column):
+        if column not in self.columns:
+            self.columns.append(column)
+
+    def values(self, queryset, extra_columns=()):
+        # extra_columns — например, поля сортировки для курсорной пагинации
+        columns = self.columns + [c for c in extra_columns if c not in self.columns]
+        return queryset.values(*columns)
+
+    def _row_to_dict(self, plan, row, ctx):
+        out = {}
+        for key, column, converter in plan:
+            value = row[column]
+            if isinstance(converter, list):
+                out[key] = None if value is None else self._row_to_dict(converter, row, ctx)
+            elif converter is None:
+                out[key] = value
+            else:
+                out[key] = converter(value, row, ctx)
+        return out
+
+    def to_dicts(self, rows, ctx):
+        plan = self._plan
+        return [self._row_to_dict(plan, row, ctx) for row in rows]
+
+    def serialize(self, queryset, ctx):
+        return self.to_dicts(self.values(queryset), ctx)
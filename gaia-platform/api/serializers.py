@@ -2,9 +2,14 @@ from rest_framework import serializers
 
 from halls.models import Hall, BlockedSlot
 from booking.models import Booking
+from gaia.metrics import BOOKING_CONFLICTS
+from .fields import ImageVariantsField
+from .projections import Projection, as_decimal_str, as_file_url, as_image_variants
 
 
 class HallSerializer(serializers.ModelSerializer):
+    photo_variants = ImageVariantsField(image_field="photo")
+
     class Meta:
         model = Hall
         fields = [
@@ -12,13 +17,28 @@ class HallSerializer(serializers.ModelSerializer):
             "name",
             "slug",
             "capacity",
-            "weekday_price_per_hour",
-            "weekend_price_per_hour",
+            "base_price_per_hour",
             "description",
-            "image",
+            "photo",
+            "photo_variants",
         ]
 
 
+# Быстрый путь для списка залов: тот же вывод, что у HallSerializer
+HALL_LIST_PROJECTION = Projection(
+    [
+        "id",
+        "name",
+        "slug",
+        "capacity",
+        ("base_price_per_hour", "base_price_per_hour", as_decimal_str),
+        "description",
+        ("photo", "photo", as_file_url),
+        ("photo_variants", "photo_variants", as_image_variants),
+    ]
+)
+
+
 class BookingSerializer(serializers.ModelSerializer):
     hall_id = serializers.PrimaryKeyRelatedField(
         queryset=Hall.objects.all(),
@@ -72,6 +92,7 @@ class BookingSerializer(serializers.ModelSerializer):
             start_time=start_time,
             end_time=end_time,
         ):
+            BOOKING_CONFLICTS.inc("api")
             raise serializers.ValidationError(
                 "Выбранный временной диапазон уже занят или заблокирован"
             )
@@ -115,6 +136,29 @@ class BookingSerializer(serializers.ModelSerializer):
         return booking
 
 
+class BookingListSerializer(serializers.ModelSerializer):
+    hall_name = serializers.CharField(source="hall.name", read_only=True)
+
+    class Meta:
+        model = Booking
+        fields = [
+            "id",
+            "hall",
+            "hall_name",
+            "start_time",
+            "end_time",
+            "duration_hours",
+            "customer_name",
+            "customer_phone",
+            "customer_email",
+            "comment",
+            "status",
+            "total_price",
+            "created_at",
+        ]
+        read_only_fields = fields
+
+
 class AdminBookingActionSerializer(serializers.Serializer):
     reason = serializers.CharField(required=False, allow_blank=True)
 
@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from halls.models import Hall
+from shop.models import Product
+from . import autocomplete
+
+
+# индекс меняем только после коммита: откаченное сохранение не должно в него попасть
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, **kwargs):
+    transaction.on_commit(lambda: autocomplete.product_saved(instance))
+
+
+@receiver(post_save, sender=Hall)
+def hall_saved(sender, instance, **kwargs):
+    transaction.on_commit(lambda: autocomplete.hall_saved(instance))
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, **kwargs):
+    # после delete() у instance уже не будет id
+    obj_id = instance.id
+    transaction.on_commit(lambda: autocomplete.object_deleted("product", obj_id))
+
+
+@receiver(post_delete, sender=Hall)
+def hall_deleted(sender, instance, **kwargs):
+    obj_id = instance.id
+    transaction.on_commit(lambda: autocomplete.object_deleted("hall", obj_id))
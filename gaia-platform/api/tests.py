@@ -1,3 +1,318 @@
-from django.test import TestCase
+from datetime import datetime, timedelta
+from decimal import Decimal
+import json
+from io import StringIO
+from urllib.parse import urlsplit
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.management import CommandError, call_command
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from booking.models import Booking
+from menus.models import MenuFile
+from menus.serializers import MENU_FILE_LIST_PROJECTION, MenuFileSerializer
+from halls.models import Hall
+from shop.models import Product, ProductCategory
+from shop.serializers import PRODUCT_LIST_PROJECTION, ProductSerializer
+from .projections import ProjectionContext
+from .serializers import HALL_LIST_PROJECTION, HallSerializer
+from .throttling import SlidingWindowCounter, check_scope, parse_rate
+
+
+def walk_pages(client, url):
+    """Пройти все страницы курсорной пагинации, вернуть id по порядку."""
+    ids = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200, response.content
+        data = response.json()
+        ids += [row["id"] for row in data["results"]]
+        url = data["next"]
+        if url:
+            parts = urlsplit(url)
+            url = f"{parts.path}?{parts.query}"
+    return ids
+
+
+class CursorPaginationTests(TestCase):
+    def test_products_with_equal_prices_are_paged_without_gaps(self):
+        # у всех одинаковая цена — порядок внутри группы решает только id
+        products = [
+            Product.objects.create(name=f"Товар {i}", slug=f"product-{i}", price=Decimal("100.00"))
+            for i in range(7)
+        ]
+
+        for ordering in ("price", "-price"):
+            with self.subTest(ordering=ordering):
+                ids = walk_pages(self.client, f"/api/products/?ordering={ordering}&page_size=2")
+                self.assertEqual(sorted(ids), sorted(p.id for p in products))
+                self.assertEqual(len(ids), len(set(ids)))
+
+    def test_bookings_with_equal_start_time_are_paged_without_gaps(self):
+        hall = Hall.objects.create(name="Зал", slug="hall", base_price_per_hour=Decimal("1000.00"))
+        start = timezone.make_aware(datetime(2030, 1, 10, 12))
+        bookings = [
+            Booking.objects.create(
+                hall=hall,
+                customer_name=f"Гость {i}",
+                customer_phone="+7 900 000-00-00",
+                customer_email="guest@example.com",
+                start_time=start,
+                end_time=start + timedelta(hours=1),
+                duration_hours=1,
+                total_price=Decimal("1000.00"),
+            )
+            for i in range(5)
+        ]
+        staff = get_user_model().objects.create_user("staff", password="x", is_staff=True)
+        self.client.force_login(staff)
+
+        ids = walk_pages(self.client, "/api/admin/bookings/?page_size=2")
+        self.assertEqual(sorted(ids), sorted(b.id for b in bookings))
+        self.assertEqual(len(ids), len(set(ids)))
+
+
+class AdminBookingListPermissionTests(TestCase):
+    def test_anonymous_is_rejected(self):
+        response = self.client.get("/api/admin/bookings/")
+        self.assertIn(response.status_code, (401, 403))
+
+    def test_non_staff_is_rejected(self):
+        user = get_user_model().objects.create_user("user", password="x")
+        self.client.force_login(user)
+        self.assertEqual(self.client.get("/api/admin/bookings/").status_code, 403)
+
+
+class ConditionalListTests(TestCase):
+    url = "/api/products/"
+
+    def setUp(self):
+        cache.clear()
+        self.category = ProductCategory.objects.create(name="Кофе", slug="coffee")
+        self.old = Product.objects.create(name="Чай", slug="tea", price=Decimal("100.00"))
+        self.product = Product.objects.create(
+            name="Латте", slug="latte", price=Decimal("200.00"), category=self.category
+        )
+
+    def get(self, url=None, **headers):
+        return self.client.get(url or self.url, headers=headers)
+
+    def assert_changed(self, etag):
+        response = self.get(if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_unchanged_list_gives_304(self):
+        for url in ("/api/halls/", "/api/products/", "/api/product-categories/"):
+            with self.subTest(url=url):
+                etag = self.get(url)["ETag"]
+                self.assertEqual(self.get(url, if_none_match=etag).status_code, 304)
+
+        last_modified = self.get()["Last-Modified"]
+        self.assertEqual(self.get(if_modified_since=last_modified).status_code, 304)
+
+    def test_product_change(self):
+        etag = self.get()["ETag"]
+        Product.objects.filter(pk=self.product.pk).update(
+            name="Раф", updated_at=timezone.now() + timedelta(minutes=1)
+        )
+        self.assert_changed(etag)
+
+    def test_category_change(self):
+        # вложенная категория тоже попадает в ответ
+        etag = self.get()["ETag"]
+        ProductCategory.objects.filter(pk=self.category.pk).update(
+            name="Кофе и чай", updated_at=timezone.now() + timedelta(minutes=1)
+        )
+        self.assert_changed(etag)
+
+    def test_delete(self):
+        # удаление не самого свежего товара не двигает max(updated_at) — ETag меняет count
+        etag = self.get()["ETag"]
+        self.old.delete()
+        self.assert_changed(etag)
+
+    def test_etag_depends_on_query(self):
+        etag = self.get()["ETag"]
+        self.assertEqual(self.get(f"{self.url}?category=coffee", if_none_match=etag).status_code, 200)
+
+
+def as_json(data):
+    # сравниваем то, что уйдёт клиенту: Decimal и т.п. уже приведены к JSON-типам
+    return json.loads(json.dumps(data, default=str))
+
+
+class ProjectionParityTests(TestCase):
+    """Проекция списка отдаёт ровно то же, что соответствующий сериализатор."""
+
+    variants = {"webp": {"320": "halls/a_w320.webp"}, "jpeg": {"320": "halls/a_w320.jpg"}}
+
+    def setUp(self):
+        self.request = RequestFactory().get("/api/")
+        self.ctx = ProjectionContext(default_storage, self.request)
+
+    def assert_parity(self, projection, serializer_class, queryset):
+        expected = serializer_class(queryset, many=True, context={"request": self.request}).data
+        self.assertEqual(as_json(projection.serialize(queryset, self.ctx)), as_json(expected))
+
+    def test_halls(self):
+        Hall.objects.create(
+            name="Зал", slug="hall", capacity=20, base_price_per_hour=Decimal("1500.50"),
+            photo="halls/a.jpg", photo_variants=self.variants,
+        )
+        Hall.objects.create(name="Без фото", slug="plain", base_price_per_hour=Decimal("1000"))
+        self.assert_parity(HALL_LIST_PROJECTION, HallSerializer, Hall.objects.order_by("id"))
+
+    def test_products(self):
+        category = ProductCategory.objects.create(name="Кофе", slug="coffee", description="Зерно")
+        Product.objects.create(
+            name="Латте", slug="latte", price=Decimal("200.00"), category=category,
+            image="products/latte.jpg", image_variants=self.variants,
+        )
+        Product.objects.create(name="Чай", slug="tea", price=Decimal("99.90"), is_active=False)
+        self.assert_parity(PRODUCT_LIST_PROJECTION, ProductSerializer, Product.objects.order_by("id"))
+
+    def test_menu_files(self):
+        MenuFile.objects.create(title="Основное", file="menus/main.pdf", sort_order=10)
+        self.assert_parity(MENU_FILE_LIST_PROJECTION, MenuFileSerializer, MenuFile.objects.order_by("id"))
+
+
+class ProjectionFieldsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = ProductCategory.objects.create(name="Кофе", slug="coffee")
+        self.product = Product.objects.create(
+            name="Латте", slug="latte", price=Decimal("200.00"), category=self.category
+        )
+        self.full = self.client.get("/api/products/").json()
+
+    def get(self, query):
+        response = self.client.get(f"/api/products/?{query}")
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_fields_are_a_subset_of_full_output(self):
+        rows = self.get("fields=id,price")
+        self.assertEqual(rows, [{key: row[key] for key in ("id", "price")} for row in self.full])
+
+    def test_collapsed_and_expanded_category(self):
+        # без expand вложенный объект сворачивается в id
+        self.assertEqual(self.get("fields=id,category"), [{"id": self.product.id, "category": self.category.id}])
+        rows = self.get("fields=id&expand=category")
+        self.assertEqual(rows, [{"id": self.product.id, "category": self.full[0]["category"]}])
+        self.assertEqual(self.get("expand=category"), self.full)
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get("/api/products/?fields=id,secret&expand=price")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {"fields", "expand"})
+
+
+def throttle_rates(**rates):
+    return override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates})
+
+
+class SlidingWindowCounterTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.counter = SlidingWindowCounter(prefix="test-throttle")
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("10/min"), (10, 60))
+        self.assertEqual(parse_rate("300/hour"), (300, 3600))
+        self.assertEqual(parse_rate(None), (None, None))
+
+    def test_limit_within_window(self):
+        for i in range(10):
+            self.assertEqual(self.counter.hit("ip", 10, 60, now=6000 + i), (True, 0))
+        allowed, wait = self.counter.hit("ip", 10, 60, now=6015)
+        self.assertFalse(allowed)
+        # предыдущего окна нет — ждать до конца текущего
+        self.assertEqual(wait, 45)
+
+    def test_previous_window_is_weighted(self):
+        for _ in range(10):
+            self.counter.hit("ip", 10, 60, now=6000)
+        # середина следующего окна: 10 * 0.5 от прошлого, значит пройдут ещё 5
+        results = [self.counter.hit("ip", 10, 60, now=6090)[0] for _ in range(6)]
+        self.assertEqual(results, [True] * 5 + [False])
+
+    def test_wait_until_previous_window_fades(self):
+        for _ in range(10):
+            self.counter.hit("ip", 10, 60, now=6000)
+        # начало следующего окна: 10 * 60/60 = 10 — отказ, вес упадёт ниже лимита через 1 с
+        allowed, wait = self.counter.hit("ip", 10, 60, now=6060)
+        self.assertFalse(allowed)
+        self.assertEqual(wait, 1)
+        self.assertTrue(self.counter.hit("ip", 10, 60, now=6061)[0])
+
+    def test_rejected_requests_are_not_counted(self):
+        for _ in range(15):
+            self.counter.hit("ip", 10, 60, now=6000)
+        self.assertEqual(cache.get("test-throttle:ip:100"), 10)
+
+
+class CheckScopeTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    @throttle_rates(demo="5/hour", demo_total="3/hour")
+    def test_total_limit_does_not_consume_client_quota(self):
+        for _ in range(3):
+            self.assertIsNone(check_scope("demo", "1.1.1.1"))
+        # общий лимит исчерпан — отказ, но квота клиента не тратится
+        for _ in range(5):
+            self.assertIsNotNone(check_scope("demo", "2.2.2.2"))
+
+        with throttle_rates(demo="5/hour"):
+            for _ in range(5):
+                self.assertIsNone(check_scope("demo", "2.2.2.2"))
+            self.assertIsNotNone(check_scope("demo", "2.2.2.2"))
+
+    @throttle_rates(demo="2/hour")
+    def test_limit_is_per_client(self):
+        self.assertIsNone(check_scope("demo", "1.1.1.1"))
+        self.assertIsNone(check_scope("demo", "1.1.1.1"))
+        self.assertIsNotNone(check_scope("demo", "1.1.1.1"))
+        self.assertIsNone(check_scope("demo", "2.2.2.2"))
+
+
+class SeedDataTests(TestCase):
+    @override_settings(DEBUG=False)
+    def test_refuses_to_write_without_debug(self):
+        with self.assertRaisesMessage(CommandError, "--allow-writes"):
+            call_command("seed_data")
+        self.assertFalse(Hall.objects.exists())
+
+    def test_too_dense_period_is_rejected(self):
+        with self.assertRaisesMessage(CommandError, "--years"):
+            call_command("seed_data", "--allow-writes", halls=1, bookings=1000, years=0.5, future_days=1)
+        self.assertFalse(Hall.objects.exists())
+
+    def test_bookings_leave_free_slots(self):
+        call_command(
+            "seed_data", "--allow-writes", halls=3, bookings=900, future_days=5,
+            blocks=0, products=0, categories=0, stdout=StringIO(),
+        )
+        bookings = Booking.objects.all()
+        self.assertEqual(bookings.count(), 900)
+        active = list(bookings.exclude(status__in=["cancelled", "rejected"]).order_by("hall_id", "start_time"))
+        self.assertGreater(len(active), 900 * 0.8)
+        # активные брони зала не пересекаются
+        for prev, cur in zip(active, active[1:]):
+            if prev.hall_id == cur.hall_id:
+                self.assertLessEqual(prev.end_time, cur.start_time)
+        # период подобран под ~BOOKINGS_PER_HALL_DAY броней на зал в день
+        days = {b.start_time.date() for b in bookings}
+        self.assertLessEqual(900 / (3 * len(days)), 4)
+
+
+class BenchBotGuardTests(SimpleTestCase):
+    @override_settings(DEBUG=False)
+    def test_refuses_to_write_without_debug(self):
+        with self.assertRaisesMessage(CommandError, "--allow-writes"):
+            call_command("bench_bot")
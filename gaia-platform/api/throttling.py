@@ -0,0 +1,158 @@
+"""
+Ограничение частоты запросов: скользящее окно на двух счётчиках.
+
+В отличие от SimpleRateThrottle из DRF (хранит список всех меток времени
+запросов), тут на ключ хранится ровно два числа — счётчик текущего и
+предыдущего окна, а оценка считается как
+    prev * (доля прошлого окна, ещё попадающая в скользящее) + curr.
+Работает с любым бэкендом кеша Django, в том числе LocMemCache.
+"""
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from rest_framework.throttling import BaseThrottle
+
+
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+
+def parse_rate(rate):
+    """'10/min' -> (10, 60); None -> (None, None) — без ограничения."""
+    if not rate:
+        return None, None
+    num, period = rate.split("/")
+    return int(num), PERIODS[period[0]]
+
+
+def get_rate(scope: str):
+    rates = settings.REST_FRAMEWORK.get("DEFAULT_THROTTLE_RATES", {})
+    return parse_rate(rates.get(scope))
+
+
+class SlidingWindowCounter:
+    def __init__(self, prefix: str = "throttle"):
+        self.prefix = prefix
+
+    def _window(self, key: str, window: int, now: float):
+        current = int(now // window)
+        return current, now - current * window, f"{self.prefix}:{key}:{current}"
+
+    def check(self, key: str, limit: int, window: int, now: float = None):
+        """
+        Пройдёт ли запрос (сам запрос не учитывается).
+        Возвращает (разрешено, сколько секунд подождать).
+        """
+        now = time.time() if now is None else now
+        current, elapsed, cur_key = self._window(key, window, now)
+        prev_key = f"{self.prefix}:{key}:{current - 1}"
+        counts = cache.get_many([cur_key, prev_key])
+        cur_count = counts.get(cur_key, 0)
+        prev_count = counts.get(prev_key, 0)
+
+        prev_weight = (window - elapsed) / window
+        estimate = prev_count * prev_weight + cur_count
+        if estimate >= limit:
+            return False, self._wait(limit, window, elapsed, prev_count, cur_count)
+        return True, 0
+
+    def record(self, key: str, window: int, now: float = None):
+        """Учесть запрос в текущем окне."""
+        now = time.time() if now is None else now
+        _, _, cur_key = self._window(key, window, now)
+        # храним два окна: текущее понадобится как «предыдущее» в следующем
+        if not cache.add(cur_key, 1, timeout=window * 2):
+            try:
+                cache.incr(cur_key)
+            except ValueError:
+                cache.set(cur_key, 1, timeout=window * 2)
+
+    def hit(self, key: str, limit: int, window: int, now: float = None):
+        """Учитывает запрос, если лимит не превышен. Возвращает (разрешено, ждать)."""
+        allowed, wait = self.check(key, limit, window, now)
+        if allowed:
+            self.record(key, window, now)
+        return allowed, wait
+
+    @staticmethod
+    def _wait(limit, window, elapsed, prev_count, cur_count):
+        # через сколько вес прошлого окна упадёт настолько, что запрос пройдёт:
+        # prev * (window - t) / window + cur < limit
+        if cur_count >= limit or not prev_count:
+            return max(window - elapsed, 1)
+        target_elapsed = window * (1 - (limit - cur_count) / prev_count)
+        return max(target_elapsed - elapsed, 1)
+
+
+counter = SlidingWindowCounter()
+
+
+def check_scope(scope: str, ident: str):
+    """
+    Проверка двух лимитов эндпоинта:
+    <scope> — на один IP, <scope>_total — на всех клиентов вместе.
+    Возвращает None, если можно, иначе — сколько секунд ждать.
+
+    Сначала проверяются оба лимита, и только если оба пропускают, запрос
+    учитывается в обоих счётчиках: отклонённый запрос (в том числе по общему
+    лимиту) не расходует квоту клиента.
+    """
+    now = time.time()
+    limits = []
+    for rate_scope, key in ((scope, f"{scope}:{ident}"), (f"{scope}_total", f"{scope}:*")):
+        limit, window = get_rate(rate_scope)
+        if limit is None:
+            continue
+        allowed, wait = counter.check(key, limit, window, now)
+        if not allowed:
+            return wait
+        limits.append((key, window))
+
+    for key, window in limits:
+        counter.record(key, window, now)
+    return None
+
+
+class ScopedSlidingWindowThrottle(BaseThrottle):
+    """
+    Аналог ScopedRateThrottle из DRF: лимит берётся по throttle_scope вьюхи
+    из REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]. DRF сам добавит Retry-After к 429.
+    """
+
+    def allow_request(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        if not scope:
+            return True
+        self._wait = check_scope(scope, self.get_ident(request))
+        return self._wait is None
+
+    def wait(self):
+        return self._wait
+
+
+def throttle_view(scope: str, methods=("POST",)):
+    """
+    То же для обычных Django-вьюх (не DRF): 429 + Retry-After.
+    methods — какие методы ограничиваем (GET формы бронирования не трогаем).
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method in methods:
+                wait = check_scope(scope, BaseThrottle().get_ident(request))
+                if wait is not None:
+                    response = HttpResponse(
+                        "Слишком много запросов. Попробуйте позже.",
+                        status=429,
+                        content_type="text/plain; charset=utf-8",
+                    )
+                    response["Retry-After"] = str(int(wait) + 1)
+                    return response
+            return view_func(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
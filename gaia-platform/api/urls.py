@@ -2,9 +2,12 @@ from django.urls import path
 
 from .views import (
     HallListAPIView,
+    AutocompleteAPIView,
+    BootstrapAPIView,
     HallAvailabilityAPIView,
     BookingCreateAPIView,
     BookingDetailAPIView,
+    AdminBookingListAPIView,
     AdminBookingConfirmAPIView,
     AdminBookingRejectAPIView,
     AdminBlockCreateAPIView,
@@ -16,10 +19,13 @@ urlpatterns = [
     # Публичные эндпоинты для фронта
     path("halls/", HallListAPIView.as_view(), name="hall-list"),
     path("halls/<int:pk>/availability/", HallAvailabilityAPIView.as_view(), name="hall-availability"),
+    path("bootstrap/", BootstrapAPIView.as_view(), name="bootstrap"),
+    path("autocomplete/", AutocompleteAPIView.as_view(), name="autocomplete"),
     path("bookings/", BookingCreateAPIView.as_view(), name="booking-create"),
     path("bookings/<int:pk>/", BookingDetailAPIView.as_view(), name="booking-detail"),
 
     # Админские (для бота)
+    path("admin/bookings/", AdminBookingListAPIView.as_view(), name="admin-booking-list"),
     path(
         "admin/bookings/<int:pk>/confirm/",
         AdminBookingConfirmAPIView.as_view(),
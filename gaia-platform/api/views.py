@@ -1,31 +1,112 @@
 from datetime import datetime, time, timedelta
 
+from django.http import HttpResponse, HttpResponseNotModified
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.decorators import method_decorator
 from rest_framework import generics, status
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from gaia.db_router import replica_reads
 from halls.models import Hall, BlockedSlot
-from halls.services import get_available_slots
+from halls.services import get_available_slot_times
 from booking.models import Booking
+from .autocomplete import index as autocomplete_index
+from .bootstrap import body_etag, build_bootstrap, get_bootstrap_etag
+from .mixins import ConditionalListMixin, ProjectionListMixin
+from .pagination import BookingCursorPagination
+from .throttling import ScopedSlidingWindowThrottle
 from .serializers import (
+    HALL_LIST_PROJECTION,
     HallSerializer,
     BookingSerializer,
+    BookingListSerializer,
     AdminBookingActionSerializer,
     BlockedSlotSerializer,
 )
 
 
-class HallListAPIView(generics.ListAPIView):
+@method_decorator(replica_reads(), name="dispatch")
+class HallListAPIView(ConditionalListMixin, ProjectionListMixin, generics.ListAPIView):
+    """
+    GET /api/halls/
+    ?fields=id,name,slug — только нужные поля
+    """
+
     queryset = Hall.objects.all()
     serializer_class = HallSerializer
+    list_projection = HALL_LIST_PROJECTION
+
+
+@method_decorator(replica_reads(), name="dispatch")
+class AutocompleteAPIView(APIView):
+    """
+    GET /api/autocomplete/?q=<префикс>&limit=10
+    Подсказки по названиям и слагам товаров и залов — из индекса в памяти, без БД.
+    """
+
+    def get(self, request):
+        q = request.query_params.get("q", "")
+        try:
+            limit = min(int(request.query_params.get("limit", 10)), 50)
+        except ValueError:
+            limit = 10
+
+        autocomplete_index.ensure_fresh()
+        return Response({"query": q, "results": autocomplete_index.suggest(q, limit)})
+
 
+@method_decorator(replica_reads(), name="dispatch")
+class BootstrapAPIView(APIView):
+    """
+    GET /api/bootstrap/?date=YYYY-MM-DD (по умолчанию — сегодня)
+    Залы, категории, товары, меню и свободные слоты на дату — одним ответом.
+    """
 
+    def get(self, request):
+        date_str = request.query_params.get("date")
+        if date_str:
+            try:
+                target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+            except ValueError:
+                return Response(
+                    {"detail": "Invalid date format, expected YYYY-MM-DD"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        else:
+            target_date = timezone.localdate()
+
+        base_url = request.build_absolute_uri("/")
+        etag = get_bootstrap_etag(target_date, base_url)
+        body = None
+        if etag is None:
+            body = build_bootstrap(target_date, base_url)
+            etag = body_etag(body)
+
+        if_none_match = request.headers.get("If-None-Match", "")
+        if etag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]:
+            response = HttpResponseNotModified()
+        else:
+            if body is None:
+                body = build_bootstrap(target_date, base_url)
+            response = HttpResponse(body, content_type="application/json")
+
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+        return response
+
+
+@method_decorator(replica_reads(), name="dispatch")
 class HallAvailabilityAPIView(APIView):
     """
     GET /api/halls/<id>/availability?date=YYYY-MM-DD
     """
 
+    throttle_classes = [ScopedSlidingWindowThrottle]
+    throttle_scope = "availability"
+
     def get(self, request, pk: int):
         hall = get_object_or_404(Hall, pk=pk)
 
@@ -44,13 +125,10 @@ class HallAvailabilityAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Берём свободные слоты через сервис
-        free_slots = get_available_slots(hall, target_date)
-        # Предположим, что free_slots — iterable из datetime/time.
-        # Преобразуем в удобный для фронта вид:
+        # Берём свободные слоты через сервис (с кешем, см. halls.services)
         slots = [
-            {"time": slot.strftime("%H:%M"), "status": "free"}
-            for slot in free_slots
+            {"time": slot, "status": "free"}
+            for slot in get_available_slot_times(hall, target_date)
         ]
 
         data = {
@@ -66,6 +144,9 @@ class BookingCreateAPIView(generics.CreateAPIView):
     POST /api/bookings
     """
 
+    throttle_classes = [ScopedSlidingWindowThrottle]
+    throttle_scope = "booking_create"
+
     serializer_class = BookingSerializer
     queryset = Booking.objects.all()
 
@@ -82,6 +163,37 @@ class BookingDetailAPIView(generics.RetrieveAPIView):
 # === Админские экшены (для бота) ===
 
 
+class AdminBookingListAPIView(generics.ListAPIView):
+    """
+    GET /api/admin/bookings/
+    ?status=new|confirmed|cancelled|rejected
+    ?date_from=YYYY-MM-DD, ?date_to=YYYY-MM-DD
+    ?page_size=<n>, ?cursor=<...> — курсорная пагинация по start_time
+    Только для staff: в ответе имена, телефоны и email клиентов.
+    """
+
+    serializer_class = BookingListSerializer
+    pagination_class = BookingCursorPagination
+    permission_classes = [IsAdminUser]
+
+    def get_queryset(self):
+        qs = Booking.objects.select_related("hall")
+
+        status_param = self.request.query_params.get("status")
+        if status_param:
+            qs = qs.filter(status=status_param)
+
+        for param, lookup in (("date_from", "start_time__date__gte"), ("date_to", "start_time__date__lte")):
+            value = self.request.query_params.get(param)
+            if value:
+                try:
+                    qs = qs.filter(**{lookup: datetime.strptime(value, "%Y-%m-%d").date()})
+                except ValueError:
+                    pass
+
+        return qs
+
+
 class AdminBookingConfirmAPIView(APIView):
     """
     POST /api/admin/bookings/<id>/confirm
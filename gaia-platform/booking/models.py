@@ -36,3 +36,7 @@ class Booking(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # курсорная пагинация и выборки по времени
+            models.Index(fields=["start_time"], name="booking_start_time_idx"),
+        ]
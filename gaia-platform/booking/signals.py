@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from gaia.cache_versions import bump_version
+from gaia.metrics import BOOKINGS_CREATED
+from gaia.prerender import schedule_prerender
+from halls.services import AVAILABILITY_VERSION
+from .models import Booking
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def bookings_changed(sender, **kwargs):
+    # свободные слоты поменялись — сбрасываем кеш доступности
+    transaction.on_commit(lambda: bump_version(AVAILABILITY_VERSION))
+    schedule_prerender()
+
+
+@receiver(post_save, sender=Booking)
+def booking_created(sender, created, **kwargs):
+    if created:
+        transaction.on_commit(BOOKINGS_CREATED.inc)
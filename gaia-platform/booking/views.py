@@ -5,6 +5,9 @@ from django.utils import timezone  # можно не использовать, 
 from django.shortcuts import render, redirect
 from django.contrib import messages
 
+from api.throttling import throttle_view
+from gaia.db_router import primary_only
+from gaia.metrics import BOOKING_CONFLICTS
 from halls.models import Hall
 from .forms import BookingForm
 from .models import Booking
@@ -12,6 +15,7 @@ from .services import is_slot_available, calculate_total_price
 from notifications.services import send_booking_notifications
 
 
+@throttle_view("booking_create")
 def create_booking(request):
     if request.method == "POST":
         form = BookingForm(request.POST)
@@ -20,7 +24,12 @@ def create_booking(request):
             start_dt = form.cleaned_data["start_datetime"]
             duration_hours = form.cleaned_data["duration_hours"]
 
-            if not is_slot_available(hall, start_dt, duration_hours):
+            # проверка слота — только по основной БД, реплика может отставать
+            with primary_only():
+                slot_free = is_slot_available(hall, start_dt, duration_hours)
+
+            if not slot_free:
+                BOOKING_CONFLICTS.inc("web")
                 messages.error(request, "Выбранный слот уже занят или недоступен.")
             else:
                 end_dt = start_dt + timedelta(hours=duration_hours)
@@ -10,6 +10,7 @@ from telegram import (
 from telegram.error import BadRequest
 
 from booking.models import Booking
+from gaia.db_router import replica_reads
 from notifications.services import send_booking_status_update_notification
 from .auth import is_admin, is_superadmin
 
@@ -114,6 +115,7 @@ def parse_date_text(text: str):
     return None
 
 
+@replica_reads()
 def send_bookings_for_date(update, context, target_date: date_class, label: str):
     """Показать брони на указанную дату."""
     user_id = update.effective_user.id
@@ -143,6 +145,7 @@ def send_bookings_for_date(update, context, target_date: date_class, label: str)
         )
 
 
+@replica_reads()
 def send_new_bookings(update, context):
     """Показать все новые предстоящие брони (статус new, с сегодняшнего дня)."""
     user_id = update.effective_user.id
@@ -177,6 +180,7 @@ def send_new_bookings(update, context):
         )
 
 
+@replica_reads()
 def send_all_upcoming(update, context):
     """Показать все предстоящие брони (new + confirmed, с сегодняшнего дня)."""
     user_id = update.effective_user.id
@@ -0,0 +1,149 @@
+"""
+Локальная заглушка Telegram Bot API для бенчмарков бота (bench_bot).
+
+Отвечает на /bot<token>/<method> правдоподобными объектами, записывает
+вызовы по методам, умеет добавлять задержку и отвечать 429
+(Too Many Requests) с заданной вероятностью. Бот подключается через
+base_url: build_bot(token, workers, base_url=fake.base_url).
+"""
+import itertools
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "GAIA fake", "username": "gaia_fake_bot"}
+
+# методы, которые возвращают Message
+MESSAGE_METHODS = {
+    "sendMessage",
+    "editMessageText",
+    "editMessageReplyMarkup",
+    "sendDocument",
+    "sendPhoto",
+    "forwardMessage",
+}
+
+
+class FakeTelegramAPI:
+    def __init__(self, latency: float = 0.0, rate_limit: float = 0.0, retry_after: int = 1,
+                 host: str = "127.0.0.1", port: int = 0, seed=None):
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.calls = Counter()
+        self.rate_limited = Counter()
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._message_ids = itertools.count(1)
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/bot"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-telegram-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+            self.rate_limited.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"calls": dict(self.calls), "rate_limited": dict(self.rate_limited)}
+
+    # --- ответы ---
+
+    def _message(self, params: dict) -> dict:
+        chat_id = params.get("chat_id") or 0
+        message = {
+            "message_id": params.get("message_id") or next(self._message_ids),
+            "date": int(time.time()),
+            "chat": {"id": int(chat_id) if str(chat_id).lstrip("-").isdigit() else 0, "type": "private"},
+            "from": BOT_USER,
+        }
+        if "text" in params:
+            message["text"] = params["text"]
+        return message
+
+    def _result(self, method: str, params: dict):
+        if method in MESSAGE_METHODS:
+            return self._message(params)
+        if method == "getMe":
+            return BOT_USER
+        if method == "getFile":
+            file_id = params.get("file_id", "file")
+            return {"file_id": file_id, "file_unique_id": file_id, "file_size": 0, "file_path": "documents/file.pdf"}
+        # answerCallbackQuery, deleteMessage и прочие — True
+        return True
+
+    def handle(self, method: str, params: dict):
+        """(HTTP-статус, тело ответа) для вызова метода."""
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls[method] += 1
+            limited = self.rate_limit and self._rng.random() < self.rate_limit
+            if limited:
+                self.rate_limited[method] += 1
+        if limited:
+            return 429, {
+                "ok": False,
+                "error_code": 429,
+                "description": f"Too Many Requests: retry after {self.retry_after}",
+                "parameters": {"retry_after": self.retry_after},
+            }
+        return 200, {"ok": True, "result": self._result(method, params)}
+
+    def _make_handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _params(self) -> dict:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                content_type = self.headers.get("Content-Type", "")
+                if content_type.startswith("application/json") and body:
+                    return json.loads(body)
+                if content_type.startswith("application/x-www-form-urlencoded"):
+                    return {k: v[-1] for k, v in parse_qs(body.decode()).items()}
+                # multipart (sendDocument с файлом) — содержимое не разбираем
+                return {}
+
+            def _dispatch(self):
+                parts = self.path.split("?", 1)[0].strip("/").split("/")
+                if len(parts) != 2 or not parts[0].startswith("bot"):
+                    self.send_error(404)
+                    return
+                status, payload = api.handle(parts[1], self._params())
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = _dispatch
+            do_POST = _dispatch
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -1,14 +1,26 @@
-from io import BytesIO
-
-from django.core.files.base import ContentFile
-from django.db.models import Max
+import requests
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, ParseMode
 
+from gaia.db_router import replica_reads
 from menus.models import MenuFile
+from menus.services import MenuUploadError, get_max_menu_file_size, save_menu_pdf
 from .auth import is_admin, is_superadmin
 
 
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def iter_telegram_file(tg_file, chunk_size: int = DOWNLOAD_CHUNK_SIZE):
+    """
+    Качаем файл из Telegram кусками, не держа его целиком в памяти.
+    В python-telegram-bot 13 file_path у File — уже полный URL на скачивание.
+    """
+    with requests.get(tg_file.file_path, stream=True, timeout=30) as resp:
+        resp.raise_for_status()
+        yield from resp.iter_content(chunk_size=chunk_size)
+
+
 def handle_menu_document(update, context):
     """
     Обработка входящих документов.
@@ -31,19 +43,34 @@ def handle_menu_document(update, context):
         message.reply_text("Принимаю только PDF файлы для меню.")
         return
 
-    tg_file = context.bot.get_file(document.file_id)
-    bio = BytesIO()
-    tg_file.download(out=bio)
-    bio.seek(0)
+    max_size = get_max_menu_file_size()
+    if document.file_size and document.file_size > max_size:
+        message.reply_text(
+            f"Файл слишком большой (максимум {max_size // (1024 * 1024)} МБ)."
+        )
+        return
 
-    max_sort = MenuFile.objects.aggregate(m=Max("sort_order"))["m"] or 0
-    new_sort = max_sort + 10
+    tg_file = context.bot.get_file(document.file_id)
 
-    title = document.file_name or "Меню"
-    menu_file = MenuFile(title=title, sort_order=new_sort)
+    try:
+        menu_file, created = save_menu_pdf(
+            iter_telegram_file(tg_file),
+            file_name=document.file_name or "menu.pdf",
+            title=document.file_name or "Меню",
+        )
+    except MenuUploadError as e:
+        message.reply_text(str(e))
+        return
+    except requests.RequestException:
+        message.reply_text("Не удалось скачать файл из Telegram, попробуйте ещё раз.")
+        return
 
-    menu_file.file.save(document.file_name or "menu.pdf", ContentFile(bio.read()))
-    menu_file.save()
+    if not created:
+        message.reply_text(
+            f"Такой файл меню уже загружен:\n"
+            f"• Название: {menu_file.title}"
+        )
+        return
 
     message.reply_text(
         f"Файл меню сохранён:\n"
@@ -53,6 +80,7 @@ def handle_menu_document(update, context):
     )
 
 
+@replica_reads()
 def menu_list(update, context):
     """
     /menu_list — показать список активных PDF-страниц меню.
@@ -143,6 +171,6 @@ def menu_file_remove_callback(update, context):
         return
 
     mf.is_active = False
-    mf.save(update_fields=["is_active"])
+    mf.save(update_fields=["is_active", "updated_at"])
 
     query.answer("Файл меню скрыт (не будет виден на сайте).")
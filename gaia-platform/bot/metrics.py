@@ -0,0 +1,41 @@
+"""
+Метрики бота (gaia.metrics): время обработчиков и запросов к Bot API.
+Экспортёр поднимается в tg_bot.py, если задан BOT_METRICS_PORT.
+"""
+import time
+from functools import wraps
+
+from telegram.error import RetryAfter
+from telegram.utils.request import Request
+
+from gaia.metrics import BOT_HANDLER_DURATION, TELEGRAM_API_DURATION, TELEGRAM_API_RATE_LIMITED
+
+
+def timed_handler(callback):
+    """Обёртка колбэка обработчика: время работы по имени функции."""
+    name = getattr(callback, "__name__", repr(callback))
+
+    @wraps(callback)
+    def wrapper(update, context):
+        start = time.perf_counter()
+        try:
+            return callback(update, context)
+        finally:
+            BOT_HANDLER_DURATION.observe(time.perf_counter() - start, name)
+
+    return wrapper
+
+
+class TimedRequest(Request):
+    """HTTP-клиент Bot API с замером времени и счётчиком 429 (RetryAfter)."""
+
+    def post(self, url, data, timeout=None):
+        method = url.rsplit("/", 1)[-1]
+        start = time.perf_counter()
+        try:
+            return super().post(url, data, timeout=timeout)
+        except RetryAfter:
+            TELEGRAM_API_RATE_LIMITED.inc(method)
+            raise
+        finally:
+            TELEGRAM_API_DURATION.observe(time.perf_counter() - start, method)
@@ -0,0 +1,122 @@
+"""
+Микробенчмарки сервисного слоя: проверка слота, цена, свободные слоты,
+форматирование сообщений бота и тексты уведомлений.
+
+Данные создаются в текущей БД внутри транзакции и откатываются после
+прогона — можно запускать на локальной базе разработчика.
+Команды: `manage.py bench_services` (прогон, --save в JSON-baseline)
+и `manage.py bench_compare` (сравнение с baseline).
+"""
+import platform
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from booking.models import Booking
+from booking.services import calculate_total_price, is_slot_available
+from bot.bookings import build_booking_keyboard, format_booking_full, format_booking_short
+from halls.models import BlockedSlot, Hall
+from halls.services import get_available_slots
+from notifications.services import (
+    build_admin_created_email,
+    build_admin_created_telegram,
+    build_client_created_email,
+    build_status_update_email,
+)
+from .perf import bench
+
+FIXTURE_DAYS = 60
+BOOKINGS_PER_DAY = 4
+
+
+def seed_fixtures() -> dict:
+    """Зал с бронями и блокировками на FIXTURE_DAYS дней вокруг сегодняшнего."""
+    tz = timezone.get_current_timezone()
+    today = timezone.localdate()
+    hall = Hall.objects.create(
+        name="Бенчмарк-зал",
+        slug=f"bench-{uuid.uuid4().hex[:12]}",
+        capacity=30,
+        base_price_per_hour=Decimal("1500.00"),
+    )
+
+    bookings = []
+    for offset in range(-FIXTURE_DAYS // 2, FIXTURE_DAYS // 2):
+        day = today + timedelta(days=offset)
+        for i in range(BOOKINGS_PER_DAY):
+            start = datetime(day.year, day.month, day.day, 10 + i * 3, tzinfo=tz)
+            bookings.append(
+                Booking(
+                    hall=hall,
+                    customer_name="Анна Иванова",
+                    customer_phone="+7 900 000-00-00",
+                    customer_email="anna@example.com",
+                    start_time=start,
+                    end_time=start + timedelta(hours=2),
+                    duration_hours=2,
+                    total_price=hall.base_price_per_hour * 2,
+                    status="confirmed" if i % 2 else "new",
+                    comment="День рождения <без сюрпризов>",
+                )
+            )
+    Booking.objects.bulk_create(bookings)
+
+    block_start = datetime(today.year, today.month, today.day, 19, tzinfo=tz)
+    BlockedSlot.objects.create(hall=hall, start_time=block_start, end_time=block_start + timedelta(hours=2))
+
+    booking = Booking.objects.filter(hall=hall, status="new").select_related("hall").first()
+    return {
+        "hall": hall,
+        "day": today,
+        # свободно: 9:00–10:00 без пересечений с бронями
+        "free_start": datetime(today.year, today.month, today.day, 9, tzinfo=tz),
+        # занято: пересекается с бронью 10:00–12:00
+        "busy_start": datetime(today.year, today.month, today.day, 11, tzinfo=tz),
+        "booking": booking,
+    }
+
+
+def build_cases(fx: dict) -> dict:
+    hall, booking = fx["hall"], fx["booking"]
+    return {
+        "booking.is_slot_available[free]": lambda: is_slot_available(hall, fx["free_start"], 1),
+        "booking.is_slot_available[busy]": lambda: is_slot_available(hall, fx["busy_start"], 1),
+        "booking.calculate_total_price": lambda: calculate_total_price(hall, 3),
+        "halls.get_available_slots": lambda: get_available_slots(hall, fx["day"]),
+        "bot.format_booking_short": lambda: format_booking_short(booking),
+        "bot.format_booking_full": lambda: format_booking_full(booking),
+        "bot.build_booking_keyboard": lambda: build_booking_keyboard(booking, expanded=False),
+        "notifications.build_client_created_email": lambda: build_client_created_email(booking),
+        "notifications.build_admin_created_email": lambda: build_admin_created_email(booking),
+        "notifications.build_admin_created_telegram": lambda: build_admin_created_telegram(booking),
+        "notifications.build_status_update_email": lambda: build_status_update_email(booking),
+    }
+
+
+def run_suite(only=None, number=None, repeat=5, progress=None) -> dict:
+    """
+    Прогнать бенчмарки (only — подстроки имён) и вернуть
+    {"meta": {...}, "results": {имя: {"best", "median", "number", "repeat"}}}.
+    """
+    results = {}
+    with transaction.atomic():
+        cases = build_cases(seed_fixtures())
+        for name, func in cases.items():
+            if only and not any(part in name for part in only):
+                continue
+            results[name] = bench(func, number=number, repeat=repeat)
+            if progress:
+                progress(name, results[name])
+        # фикстуры не оставляем в базе
+        transaction.set_rollback(True)
+
+    meta = {
+        "created_at": timezone.now().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "db_vendor": connection.vendor,
+    }
+    return {"meta": meta, "results": results}
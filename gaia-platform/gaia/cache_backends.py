@@ -0,0 +1,45 @@
+"""
+Бэкенды кеша с учётом попаданий/промахов для gaia.timing
+(Server-Timing и логи запросов). Вне замеряемого запроса — обычный кеш.
+"""
+import time
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+from .timing import current_timings
+
+_MISSING = object()
+
+
+class InstrumentedCacheMixin:
+    def get(self, key, default=None, version=None):
+        timings = current_timings()
+        if timings is None:
+            return super().get(key, default, version)
+        start = time.perf_counter()
+        value = super().get(key, _MISSING, version)
+        found = value is not _MISSING
+        timings.add_cache(time.perf_counter() - start, hits=int(found), misses=int(not found))
+        return value if found else default
+
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    # get_many у LocMemCache идёт через get(), отдельный учёт не нужен
+    pass
+
+
+class InstrumentedRedisCache(InstrumentedCacheMixin, RedisCache):
+    def get_many(self, keys, version=None):
+        timings = current_timings()
+        if timings is None:
+            return super().get_many(keys, version)
+        keys = list(keys)
+        start = time.perf_counter()
+        values = super().get_many(keys, version)
+        timings.add_cache(
+            time.perf_counter() - start,
+            hits=len(values),
+            misses=len(keys) - len(values),
+        )
+        return values
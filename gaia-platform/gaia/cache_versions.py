@@ -0,0 +1,52 @@
+"""
+Версии для кешей «по поколениям»: ключи кеша включают номер версии,
+а при изменении данных версия увеличивается — старые ключи просто
+перестают читаться и истекают сами.
+
+Версии лежат в отдельном кеше "versions" (с Redis — общем для всех
+процессов). Если ключ версии пропал (вытеснен, кеш перезапущен), новая
+версия начинается с текущего времени в наносекундах, а не с 1: номер,
+который уже выдавался, не должен повториться — под ним в кеше могут
+лежать данные старого поколения.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+VERSIONS_CACHE = "versions"
+
+
+def enabled() -> bool:
+    """Можно ли пользоваться версионными кешами (см. VERSIONED_CACHES)."""
+    return settings.VERSIONED_CACHES
+
+
+def disabled() -> bool:
+    return not enabled()
+
+
+def _key(name: str) -> str:
+    return f"version:{name}"
+
+
+def get_version(name: str) -> int:
+    cache = caches[VERSIONS_CACHE]
+    version = cache.get(_key(name))
+    if version is None:
+        version = time.time_ns()
+        # add — если другой процесс успел раньше, берём его значение
+        cache.add(_key(name), version, timeout=None)
+        version = cache.get(_key(name), version)
+    return version
+
+
+def bump_version(name: str) -> int:
+    cache = caches[VERSIONS_CACHE]
+    try:
+        return cache.incr(_key(name))
+    except ValueError:
+        # ключа нет (вытеснен или кеш очистили) — начинаем с нового номера
+        version = time.time_ns()
+        cache.set(_key(name), version, timeout=None)
+        return version
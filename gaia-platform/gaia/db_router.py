@@ -0,0 +1,127 @@
+"""
+Чтение с реплики Postgres.
+
+На реплику уходят только чтения, явно помеченные как безопасные:
+внутри replica_reads() (декоратор/контекстный менеджер для публичных
+вьюх и списков бота). Всё остальное — на основную БД, в том числе:
+- любые записи;
+- чтения внутри транзакции (atomic) на основной БД;
+- чтения в течение REPLICA_STICKY_SECONDS после записи — чтобы не увидеть
+  «старые» данные из-за задержки репликации. В HTTP-запросах окно
+  считается для клиента через cookie (ReplicaStickinessMiddleware),
+  вне запросов (бот) — на весь процесс;
+- всё, что кладётся в общий кеш (снимки, слоты, страницы, фрагменты):
+  промах кеша обычно случается сразу после записи, и отстающая реплика
+  закрепила бы старые данные как новое поколение на весь TTL. Такие
+  места оборачиваются в primary_only().
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+REPLICA_DB_ALIAS = "replica"
+STICKY_COOKIE = "gaia_primary"
+
+_replica_allowed = ContextVar("replica_allowed", default=False)
+_force_primary = ContextVar("force_primary", default=False)
+_wrote = ContextVar("wrote", default=False)
+_in_request = ContextVar("in_request", default=False)
+_last_write_at = 0.0
+
+
+def replica_configured() -> bool:
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """
+    Разрешить чтение с реплики внутри блока.
+    Можно и как декоратор: @replica_reads().
+
+    enabled — флаг или функция без аргументов (вызывается при каждом входе),
+    например чтобы не читать с реплики, пока ответ вьюхи кешируется.
+    """
+    if callable(enabled):
+        enabled = enabled()
+    token = _replica_allowed.set(bool(enabled))
+    try:
+        yield
+    finally:
+        _replica_allowed.reset(token)
+
+
+@contextmanager
+def primary_only():
+    """Принудительно читать с основной БД (например, проверка слота перед бронью)."""
+    token = _force_primary.set(True)
+    try:
+        yield
+    finally:
+        _force_primary.reset(token)
+
+
+def _recently_written() -> bool:
+    return time.monotonic() - _last_write_at < settings.REPLICA_STICKY_SECONDS
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not _replica_allowed.get() or _force_primary.get():
+            return DEFAULT_DB_ALIAS
+        # в запросе — флаг записи этого запроса; вне запросов (бот) флаг
+        # некому сбросить, поэтому там решает только окно после записи
+        if _wrote.get() if _in_request.get() else _recently_written():
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        global _last_write_at
+        _last_write_at = time.monotonic()
+        if _in_request.get():
+            _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # реплика — копия основной БД, связи между ними допустимы
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Если клиент недавно что-то записал (у него есть cookie), его чтения
+    идут в основную БД. Cookie ставится на REPLICA_STICKY_SECONDS после
+    запроса, в котором была запись.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        force_token = _force_primary.set(STICKY_COOKIE in request.COOKIES)
+        wrote_token = _wrote.set(False)
+        request_token = _in_request.set(True)
+        try:
+            response = self.get_response(request)
+            if _wrote.get():
+                response.set_cookie(
+                    STICKY_COOKIE,
+                    "1",
+                    max_age=settings.REPLICA_STICKY_SECONDS,
+                    httponly=True,
+                    samesite="Lax",
+                )
+            return response
+        finally:
+            _force_primary.reset(force_token)
+            _wrote.reset(wrote_token)
+            _in_request.reset(request_token)
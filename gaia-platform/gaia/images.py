@@ -0,0 +1,138 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+
+
+logger = logging.getLogger(__name__)
+
+# формат -> (формат Pillow, расширение, параметры сохранения)
+VARIANT_FORMATS = {
+    "webp": ("WEBP", "webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+_executor = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.IMAGE_VARIANT_WORKERS,
+            thread_name_prefix="image-variants",
+        )
+    return _executor
+
+
+def needs_variants(field_file, variants) -> bool:
+    """Картинка поменялась (или варианты ещё не строились)."""
+    source = field_file.name if field_file else ""
+    return (variants or {}).get("source", "") != source
+
+
+def generate_variants(field_file) -> dict:
+    """
+    Уменьшенные копии картинки в WebP и JPEG для каждой ширины из IMAGE_VARIANT_WIDTHS.
+    Ширины больше оригинала не делаем (вместо них — одна копия в исходном размере).
+
+    Возвращает {"source": <имя оригинала>, "webp": {"320": <имя>, ...}, "jpeg": {...}}.
+    """
+    storage = field_file.storage
+    base, _ext = os.path.splitext(field_file.name)
+
+    with storage.open(field_file.name, "rb") as fh:
+        image = Image.open(fh)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    widths = sorted({min(w, image.width) for w in settings.IMAGE_VARIANT_WIDTHS})
+    variants = {"source": field_file.name}
+
+    for fmt, (pil_format, ext, save_kwargs) in VARIANT_FORMATS.items():
+        variants[fmt] = {}
+        for width in widths:
+            resized = image.copy()
+            if width < image.width:
+                height = round(image.height * width / image.width)
+                resized = resized.resize((width, height), Image.LANCZOS)
+            if pil_format == "JPEG" and resized.mode not in ("RGB", "L"):
+                resized = resized.convert("RGB")
+
+            buf = BytesIO()
+            resized.save(buf, pil_format, **save_kwargs)
+            name = storage.save(f"{base}_w{width}.{ext}", ContentFile(buf.getvalue()))
+            variants[fmt][str(width)] = name
+
+    return variants
+
+
+def build_variants_for(model, pk, image_field: str, variants_field: str):
+    """Построить варианты и сохранить их в JSON-поле модели."""
+    obj = model.objects.filter(pk=pk).first()
+    if obj is None:
+        return
+
+    field_file = getattr(obj, image_field)
+    if field_file:
+        variants = generate_variants(field_file)
+    else:
+        variants = {}
+
+    setattr(obj, variants_field, variants)
+    update_fields = [variants_field]
+    if any(f.name == "updated_at" for f in model._meta.fields):
+        update_fields.append("updated_at")
+    # сохраняем через save(), чтобы сработали сигналы (сброс кешей каталога и т.п.)
+    obj.save(update_fields=update_fields)
+
+
+def _run_in_background(model, pk, image_field, variants_field):
+    try:
+        build_variants_for(model, pk, image_field, variants_field)
+    except Exception:
+        logger.exception("Не удалось построить варианты картинки %s #%s", model.__name__, pk)
+    finally:
+        close_old_connections()
+
+
+def schedule_variants(instance, image_field: str, variants_field: str):
+    """
+    Вызывается из post_save: если картинка поменялась — после коммита
+    ставим построение вариантов в фоновый пул потоков.
+    """
+    field_file = getattr(instance, image_field)
+    if not needs_variants(field_file, getattr(instance, variants_field)):
+        return
+
+    args = (type(instance), instance.pk, image_field, variants_field)
+    if settings.IMAGE_VARIANTS_SYNC:
+        transaction.on_commit(lambda: build_variants_for(*args))
+    else:
+        transaction.on_commit(lambda: _get_executor().submit(_run_in_background, *args))
+
+
+def variant_urls(variants, storage, build_absolute_uri=None) -> dict:
+    """{"webp": {"320": url, ...}, "jpeg": {...}} — для API."""
+    result = {}
+    for fmt in VARIANT_FORMATS:
+        urls = {}
+        for width, name in (variants or {}).get(fmt, {}).items():
+            url = storage.url(name)
+            urls[width] = build_absolute_uri(url) if build_absolute_uri else url
+        if urls:
+            result[fmt] = urls
+    return result
+
+
+def build_srcset(variants, storage, fmt: str) -> str:
+    """Строка для атрибута srcset: "url 320w, url 640w"."""
+    items = sorted(
+        (int(width), name) for width, name in (variants or {}).get(fmt, {}).items()
+    )
+    return ", ".join(f"{storage.url(name)} {width}w" for width, name in items)
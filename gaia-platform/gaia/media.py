@@ -0,0 +1,171 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from .storage import is_content_addressed
+
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+RANGE_CHUNK_SIZE = 64 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _make_etag(path: str, st) -> str:
+    # Для файлов с именем по хешу содержимого ETag — сам хеш
+    if is_content_addressed(path):
+        return '"%s"' % os.path.splitext(os.path.basename(path))[0]
+    return '"%x-%x"' % (st.st_mtime_ns, st.st_size)
+
+
+def _is_not_modified(request, etag: str, mtime: int) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        tags = [t.strip() for t in if_none_match.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+    if_modified_since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+    return if_modified_since is not None and int(mtime) <= if_modified_since
+
+
+def _parse_range(header: str, size: int):
+    """
+    Разбор Range: bytes=a-b (поддерживаем только один диапазон).
+    Возвращает (start, end) включительно, None — если заголовок игнорируем,
+    или False — если диапазон невыполним (416).
+    """
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    start_str, end_str = match.groups()
+    if not start_str and not end_str:
+        return None
+
+    if not start_str:
+        # bytes=-500 — последние 500 байт
+        length = int(end_str)
+        if length == 0:
+            return False
+        start = max(size - length, 0)
+        end = size - 1
+    else:
+        start = int(start_str)
+        end = int(end_str) if end_str else size - 1
+        end = min(end, size - 1)
+
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _iter_range(file_path: str, start: int, end: int):
+    remaining = end - start + 1
+    with open(file_path, "rb") as fh:
+        fh.seek(start)
+        while remaining > 0:
+            chunk = fh.read(min(RANGE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _set_validators(response, etag: str, st, path: str):
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(st.st_mtime)
+    response["Accept-Ranges"] = "bytes"
+    if is_content_addressed(path):
+        response["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    else:
+        response["Cache-Control"] = f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}"
+
+
+@require_safe
+def serve_media(request, path: str):
+    """
+    Отдача файлов из MEDIA_ROOT (меню в PDF, фото товаров и залов).
+
+    - conditional GET: If-None-Match / If-Modified-Since -> 304;
+    - Range-запросы (один диапазон) -> 206, чтобы PDF открывались
+      постепенно в мобильных браузерах;
+    - MEDIA_OFFLOAD = "x-accel" / "x-sendfile" — саму передачу делает nginx/apache;
+    - иначе FileResponse (wsgi.file_wrapper / sendfile без копирования в Python).
+    """
+    try:
+        file_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Файл не найден")
+
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        raise Http404("Файл не найден")
+    if not os.path.isfile(file_path):
+        raise Http404("Файл не найден")
+
+    etag = _make_etag(path, st)
+
+    if _is_not_modified(request, etag, st.st_mtime):
+        response = HttpResponseNotModified()
+        _set_validators(response, etag, st, path)
+        return response
+
+    content_type, encoding = mimetypes.guess_type(file_path)
+    content_type = content_type or "application/octet-stream"
+
+    offload = settings.MEDIA_OFFLOAD
+    if offload in ("x-accel", "x-sendfile"):
+        response = HttpResponse(content_type=content_type)
+        # старые файлы названы по-русски: сырое имя Django закодировал бы в
+        # заголовке по MIME (=?utf-8?...?=), и веб-сервер файл бы не нашёл.
+        # nginx раскодирует %XX в X-Accel-Redirect, mod_xsendfile — в
+        # X-Sendfile (XSendFileUnescape, по умолчанию On)
+        if offload == "x-accel":
+            response["X-Accel-Redirect"] = quote(settings.MEDIA_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + path)
+        else:
+            response["X-Sendfile"] = quote(file_path)
+        # Range и отдачу тела берёт на себя веб-сервер
+        _set_validators(response, etag, st, path)
+        return response
+
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    if range_header and if_range:
+        # If-Range: диапазон отдаём, только если файл не поменялся
+        if_range_date = parse_http_date_safe(if_range)
+        if if_range != etag and (if_range_date is None or int(st.st_mtime) > if_range_date):
+            range_header = None
+
+    byte_range = _parse_range(range_header, st.st_size) if range_header else None
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{st.st_size}"
+        _set_validators(response, etag, st, path)
+        return response
+
+    if byte_range:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _iter_range(file_path, start, end),
+            status=206,
+            content_type=content_type,
+        )
+        response["Content-Length"] = str(end - start + 1)
+        response["Content-Range"] = f"bytes {start}-{end}/{st.st_size}"
+    else:
+        response = FileResponse(open(file_path, "rb"), content_type=content_type)
+
+    if encoding:
+        response["Content-Encoding"] = encoding
+    _set_validators(response, etag, st, path)
+    return response
@@ -0,0 +1,306 @@
+"""
+Метрики процесса в формате Prometheus (text exposition 0.0.4).
+
+Счётчики и гистограммы пишутся в «шард» текущего потока (обычный dict
+без блокировок); при сборе (/metrics) шарды всех потоков суммируются.
+Так обновление метрики на горячем пути — пара операций со словарём,
+без общей блокировки между потоками.
+
+Шард завершившегося потока (runserver и другие серверы «поток на запрос»)
+вливается в общий итог и больше не хранится отдельно — число шардов
+не растёт со временем.
+
+Каждый процесс считает сам за себя: веб отдаёт метрики на /metrics
+(gaia.urls), бот — своим маленьким HTTP-сервером (start_exporter,
+порт BOT_METRICS_PORT). При нескольких воркерах gunicorn каждый
+воркер — отдельная цель для Prometheus.
+"""
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from rest_framework.throttling import BaseThrottle
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _merge(totals: dict, shard: dict):
+    # dict.copy() атомарен под GIL — поток-владелец может писать дальше
+    for key, value in shard.copy().items():
+        if isinstance(value, list):
+            value = list(value)
+            current = totals.get(key)
+            if current is None:
+                totals[key] = value
+            else:
+                totals[key] = [a + b for a, b in zip(current, value)]
+        else:
+            totals[key] = totals.get(key, 0) + value
+
+
+class _ShardOwner:
+    """Живёт в threading.local потока: освобождается, когда поток завершился."""
+
+    __slots__ = ("__weakref__",)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._shards = {}  # id(shard) -> shard живых потоков
+        self._retired = {}  # сумма шардов завершившихся потоков
+        # RLock: шард могут списать из сборщика мусора посреди collect() в том же потоке
+        self._lock = threading.RLock()
+        self._local = threading.local()
+
+    def shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            self._local.owner = owner = _ShardOwner()
+            # блокировка — один раз на поток, при создании шарда
+            with self._lock:
+                self._shards[id(shard)] = shard
+            weakref.finalize(owner, self._retire, shard)
+        return shard
+
+    def _retire(self, shard: dict):
+        with self._lock:
+            del self._shards[id(shard)]
+            _merge(self._retired, shard)
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def collect(self) -> dict:
+        """Сумма шардов: {(имя, метки): значение или [бакеты..., сумма, count]}."""
+        totals = {}
+        with self._lock:
+            _merge(totals, self._retired)
+            shards = list(self._shards.values())
+        for shard in shards:
+            _merge(totals, shard)
+        return totals
+
+    def render(self) -> str:
+        values = self.collect()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render(values))
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names, values, extra=()) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    pairs += [f'{n}="{v}"' for n, v in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value) -> str:
+    return repr(float(value)) if not isinstance(value, int) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labels=(), registry=registry):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._registry = registry
+        registry.register(self)
+
+    def inc(self, *label_values, amount=1):
+        shard = self._registry.shard()
+        key = (self.name, label_values)
+        shard[key] = shard.get(key, 0) + amount
+
+    def render(self, values):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        for (name, label_values), value in sorted(values.items(), key=lambda kv: kv[0]):
+            if name == self.name:
+                yield f"{name}{_label_str(self.labels, label_values)} {_format_value(value)}"
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labels=(), buckets=DEFAULT_BUCKETS, registry=registry):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._registry = registry
+        registry.register(self)
+
+    def observe(self, value: float, *label_values):
+        shard = self._registry.shard()
+        key = (self.name, label_values)
+        # [по бакетам (не накопительно)..., +Inf, сумма, count]
+        data = shard.get(key)
+        if data is None:
+            data = shard[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        data[bisect_left(self.buckets, value)] += 1
+        data[-2] += value
+        data[-1] += 1
+
+    def time(self, *label_values):
+        return _Timer(self, label_values)
+
+    def render(self, values):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for (name, label_values), data in sorted(values.items(), key=lambda kv: kv[0]):
+            if name != self.name:
+                continue
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), data):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _label_str(self.labels, label_values, extra=(("le", le),))
+                yield f"{name}_bucket{labels} {cumulative}"
+            labels = _label_str(self.labels, label_values)
+            yield f"{name}_sum{labels} {_format_value(data[-2])}"
+            yield f"{name}_count{labels} {data[-1]}"
+
+
+class _Timer:
+    """with HISTOGRAM.time("label"): ... — замер блока."""
+
+    __slots__ = ("histogram", "label_values", "start")
+
+    def __init__(self, histogram, label_values):
+        self.histogram = histogram
+        self.label_values = label_values
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.label_values)
+        return False
+
+
+# === Метрики приложения ===
+
+HTTP_REQUEST_DURATION = Histogram(
+    "gaia_http_request_duration_seconds",
+    "Время обработки HTTP-запроса по имени URL.",
+    labels=("url_name", "method", "status"),
+)
+BOOKINGS_CREATED = Counter(
+    "gaia_bookings_created_total",
+    "Созданные брони (сайт, API, админка, бот).",
+)
+BOOKING_CONFLICTS = Counter(
+    "gaia_booking_conflicts_total",
+    "Попытки брони на занятый или заблокированный слот.",
+    labels=("source",),
+)
+AVAILABILITY_CACHE = Counter(
+    "gaia_availability_cache_requests_total",
+    "Обращения к кешу свободных слотов (result=hit|miss).",
+    labels=("result",),
+)
+BOT_HANDLER_DURATION = Histogram(
+    "gaia_bot_handler_duration_seconds",
+    "Время работы обработчика бота.",
+    labels=("handler",),
+)
+TELEGRAM_API_DURATION = Histogram(
+    "gaia_telegram_api_duration_seconds",
+    "Время запроса к Telegram Bot API.",
+    labels=("method",),
+)
+TELEGRAM_API_RATE_LIMITED = Counter(
+    "gaia_telegram_api_rate_limited_total",
+    "Ответы 429 (Too Many Requests) от Telegram Bot API.",
+    labels=("method",),
+)
+SMTP_SEND_DURATION = Histogram(
+    "gaia_smtp_send_duration_seconds",
+    "Время отправки письма через SMTP.",
+    labels=("result",),
+)
+
+
+# === Веб ===
+
+class MetricsMiddleware:
+    """Латентность запросов по имени URL; ставить первым в MIDDLEWARE."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        match = request.resolver_match
+        url_name = (match.view_name if match else "") or "unmatched"
+        HTTP_REQUEST_DURATION.observe(
+            time.perf_counter() - start, url_name, request.method, str(response.status_code)
+        )
+        return response
+
+
+def client_ip(request) -> str:
+    """
+    Адрес клиента с учётом доверенных прокси (REST_FRAMEWORK["NUM_PROXIES"]),
+    как у троттлинга: за nginx REMOTE_ADDR всегда 127.0.0.1.
+    """
+    return BaseThrottle().get_ident(request)
+
+
+def metrics_view(request):
+    """
+    GET /metrics — по токену (METRICS_TOKEN). Без токена — только при DEBUG
+    и с адресов METRICS_ALLOWED_IPS: X-Forwarded-For, из которого берётся
+    адрес, подделывается, если Django доступен не только через nginx.
+    """
+    token = settings.METRICS_TOKEN
+    if token:
+        if request.headers.get("Authorization", "") != f"Bearer {token}":
+            return HttpResponseForbidden()
+    elif not settings.DEBUG or client_ip(request) not in settings.METRICS_ALLOWED_IPS:
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
+
+
+# === Бот ===
+
+class _ExporterHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # без строки в stderr на каждый опрос Prometheus
+        pass
+
+
+def start_exporter(port: int, addr: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Отдельный процесс без Django-вьюх (бот): /metrics в фоновом потоке."""
+    server = ThreadingHTTPServer((addr, port), _ExporterHandler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-exporter", daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,192 @@
+import hashlib
+import re
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/msgpack",
+    "image/svg+xml",
+)
+MIN_COMPRESS_LENGTH = 200
+
+_ENCODING_RE = re.compile(r"\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?")
+
+
+def _accepted_encodings(header: str) -> dict:
+    encodings = {}
+    for part in header.split(","):
+        match = _ENCODING_RE.match(part)
+        if not match:
+            continue
+        name, q = match.groups()
+        try:
+            encodings[name.lower()] = float(q) if q else 1.0
+        except ValueError:
+            continue
+    return encodings
+
+
+def choose_encoding(header: str):
+    """br, если клиент его принимает и есть модуль brotli; иначе gzip; иначе None."""
+    accepted = _accepted_encodings(header or "")
+    star = accepted.get("*", 0)
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        if accepted.get(encoding, star) > 0:
+            return encoding
+    return None
+
+
+class _Compressor:
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._obj = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            # wbits=31 — gzip-заголовок
+            self._obj = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._obj.process(data)
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        if self.encoding == "br":
+            return self._obj.flush()
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._obj.finish()
+        return self._obj.flush()
+
+
+def compress_bytes(data: bytes, encoding: str) -> bytes:
+    compressor = _Compressor(encoding)
+    return compressor.compress(data) + compressor.finish()
+
+
+def _compress_stream(iterator, encoding: str):
+    compressor = _Compressor(encoding)
+    for chunk in iterator:
+        # flush после каждого куска, чтобы клиент получал данные сразу
+        data = compressor.compress(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def _compress_async_stream(iterator, encoding: str):
+    compressor = _Compressor(encoding)
+    async for chunk in iterator:
+        data = compressor.compress(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def _has_csrf_token(request, response) -> bool:
+    """
+    В ответе CSRF-токен: его запрашивали при рендере ({% csrf_token %},
+    get_token) или ответ ставит CSRF-cookie. Такие ответы не сжимаем —
+    иначе по размеру сжатого ответа токен можно подобрать (BREACH).
+    """
+    return bool(request.META.get("CSRF_COOKIE_NEEDS_UPDATE")) or settings.CSRF_COOKIE_NAME in response.cookies
+
+
+def _is_cacheable(response) -> bool:
+    cache_control = response.get("Cache-Control", "")
+    return (
+        response.has_header("ETag")
+        and "private" not in cache_control
+        and "no-store" not in cache_control
+    )
+
+
+class CompressionMiddleware:
+    """
+    Сжатие ответов brotli/gzip по Accept-Encoding.
+
+    - потоковые ответы (StreamingHttpResponse) жмутся по кускам;
+    - PDF, картинки и прочие уже сжатые форматы не трогаем (только COMPRESSIBLE_TYPES);
+    - ответы с CSRF-токеном (формы брони и т.п.) отдаём без сжатия — защита от BREACH;
+    - для кешируемых ответов (есть ETag, не private/no-store) сжатое тело
+      кладётся в кеш по ETag, чтобы не жать одно и то же на каждый запрос.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        if response.status_code != 200 or response.has_header("Content-Encoding"):
+            return response
+
+        content_type = response.get("Content-Type", "").lower()
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+
+        if _has_csrf_token(request, response):
+            return response
+
+        # ответ зависит от Accept-Encoding при любом исходе
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = _compress_async_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = _compress_stream(response.streaming_content, encoding)
+            del response["Content-Length"]
+        else:
+            if len(response.content) < MIN_COMPRESS_LENGTH:
+                return response
+
+            compressed = None
+            cache_key = None
+            if _is_cacheable(response):
+                # ETag у разных хостов может совпасть, а абсолютные URL в теле — нет
+                raw_key = f"{request.get_host()}|{request.get_full_path()}|{response['ETag']}|{encoding}"
+                cache_key = "compressed:" + hashlib.sha1(raw_key.encode()).hexdigest()
+                compressed = cache.get(cache_key)
+
+            if compressed is None:
+                compressed = compress_bytes(response.content, encoding)
+                if cache_key is not None:
+                    cache.set(cache_key, compressed, settings.COMPRESSION_CACHE_TIMEOUT)
+
+            if len(compressed) >= len(response.content):
+                return response
+
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        # тело другое, значит ETag — слабый (как делает GZipMiddleware)
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+
+        response["Content-Encoding"] = encoding
+        return response
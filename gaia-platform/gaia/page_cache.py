@@ -0,0 +1,75 @@
+"""
+Кеш целых HTML-страниц для анонимных посетителей.
+
+Ключ строится из пути, версий кешей (gaia.cache_versions), выбранных
+GET-параметров и текущей даты (страницы показывают «сегодня», если
+дата не передана). Сброс — через bump_version в сигналах моделей,
+отдельно чистить кеш не нужно. Без общих версий (VERSIONED_CACHES)
+страницы не кешируются. Страница, которая пойдёт в кеш, рендерится
+по основной БД (primary_only), а не по реплике.
+"""
+from datetime import date as date_class
+from functools import wraps
+from hashlib import sha1
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from . import cache_versions
+from .cache_versions import get_version
+from .db_router import primary_only
+
+
+def _page_key(request, versions, vary_on) -> str:
+    parts = [request.path]
+    parts += [f"{name}={get_version(name)}" for name in versions]
+    parts += [f"{param}={request.GET.get(param, '')}" for param in vary_on]
+    parts.append(date_class.today().isoformat())
+    digest = sha1("|".join(parts).encode()).hexdigest()
+    return f"page:{digest}"
+
+
+def _cacheable_request(request) -> bool:
+    if request.method not in ("GET", "HEAD"):
+        return False
+    user = getattr(request, "user", None)
+    return not (user is not None and user.is_authenticated)
+
+
+def anonymous_page_cache(versions=(), vary_on=("date",), timeout=None):
+    """
+    Декоратор вьюхи: для анонимов отдаёт готовый HTML из кеша.
+
+    versions — имена версий, от которых зависит страница;
+    vary_on — GET-параметры, влияющие на содержимое (остальные игнорируются).
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not cache_versions.enabled() or not _cacheable_request(request):
+                return view_func(request, *args, **kwargs)
+
+            key = _page_key(request, versions, vary_on)
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+
+            with primary_only():
+                response = view_func(request, *args, **kwargs)
+                if hasattr(response, "render") and callable(response.render):
+                    response = response.render()
+            # кешируем только обычные успешные ответы без cookie
+            if response.status_code == 200 and not response.cookies and not response.streaming:
+                cache.set(
+                    key,
+                    (response.content, response["Content-Type"]),
+                    settings.PAGE_CACHE_TIMEOUT if timeout is None else timeout,
+                )
+            return response
+
+        return wrapper
+
+    return decorator
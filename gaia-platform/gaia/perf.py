@@ -0,0 +1,76 @@
+"""Общие помощники для бенчмарков и нагрузочных прогонов."""
+import statistics
+import time
+
+
+def percentile(values, p):
+    values = sorted(values)
+    index = min(int(round(p / 100 * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+
+def summarize(timings, elapsed: float = None) -> dict:
+    """Сводка по списку длительностей (секунды): count, p50/p90/p99, max и rps."""
+    if not timings:
+        return {"count": 0}
+    summary = {
+        "count": len(timings),
+        "mean": statistics.fmean(timings),
+        "p50": percentile(timings, 50),
+        "p90": percentile(timings, 90),
+        "p99": percentile(timings, 99),
+        "max": max(timings),
+    }
+    if elapsed:
+        summary["rps"] = len(timings) / elapsed
+    return summary
+
+
+def bench(func, number: int = None, repeat: int = 5, min_time: float = 0.2) -> dict:
+    """
+    Время одного вызова func (как timeit): число вызовов в серии подбирается,
+    чтобы серия шла не меньше min_time; из repeat серий берётся лучшая и медиана.
+    """
+    if number is None:
+        number = 1
+        while True:
+            started = time.perf_counter()
+            for _ in range(number):
+                func()
+            if time.perf_counter() - started >= min_time or number >= 10**7:
+                break
+            number *= 10
+
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        runs.append((time.perf_counter() - started) / number)
+    return {"best": min(runs), "median": statistics.median(runs), "number": number, "repeat": repeat}
+
+
+def compare(baseline: dict, current: dict, threshold: float, min_delta: float = 0.0):
+    """
+    Сравнить результаты двух прогонов ({имя: {"best": сек, ...}}).
+    Возвращает строки (имя, было, стало, отношение, статус); статус
+    "slower" — медленнее больше чем на threshold (доля) и на min_delta секунд.
+    """
+    rows = []
+    for name in sorted(set(baseline) | set(current)):
+        if name not in current:
+            rows.append((name, baseline[name]["best"], None, None, "missing"))
+            continue
+        if name not in baseline:
+            rows.append((name, None, current[name]["best"], None, "new"))
+            continue
+        before, after = baseline[name]["best"], current[name]["best"]
+        ratio = after / before if before else float("inf")
+        if ratio > 1 + threshold and after - before > min_delta:
+            status = "slower"
+        elif ratio < 1 - threshold:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((name, before, after, ratio, status))
+    return rows
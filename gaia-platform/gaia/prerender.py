@@ -0,0 +1,185 @@
+"""
+Статические копии публичных страниц (главная, список залов, страницы
+залов на сегодня и ближайшие PRERENDER_DAYS дней).
+
+Каждая публикация пишется в новый каталог PRERENDER_DIR/releases/<id>/,
+после чего симлинк PRERENDER_DIR/current атомарно переключается на него
+(os.replace) — nginx никогда не видит недописанные файлы.
+
+Раскладка файлов:
+    index.html                    — главная
+    halls/index.html              — список залов
+    halls/<slug>/index.html       — зал на сегодня
+    halls/<slug>/<YYYY-MM-DD>.html — зал на дату
+
+Пример для nginx:
+    map $arg_date $prerendered_page {
+        ""      "index.html";
+        default "$arg_date.html";
+    }
+    location / {
+        root /srv/gaia/prerendered/current;
+        try_files $uri$prerendered_page @django;
+    }
+
+Перепубликация запускается после изменений залов, броней и блокировок
+(schedule_prerender) и раз в сутки по cron (`manage.py prerender_pages`) —
+страницы «на сегодня» устаревают в полночь.
+
+Таймер после изменения заводит каждый процесс, увидевший запись (воркеры
+gunicorn, бот), поэтому публикации разных процессов идут по очереди под
+flock на PRERENDER_DIR/.publish.lock, а отложенная публикация пропускается,
+если другой процесс уже начал релиз после неё.
+"""
+import fcntl
+import logging
+import os
+import shutil
+import threading
+import time
+from datetime import date as date_class, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import close_old_connections, transaction
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+logger = logging.getLogger(__name__)
+
+CURRENT_LINK = "current"
+RELEASES_DIR = "releases"
+LOCK_FILE = ".publish.lock"
+
+_timer = None
+_timer_lock = threading.Lock()
+
+
+def prerender_enabled() -> bool:
+    return bool(settings.PRERENDER_DIR)
+
+
+def iter_pages(days: int):
+    """(путь к файлу внутри релиза, URL, GET-параметры)."""
+    from halls.models import Hall
+
+    yield "index.html", reverse("landing:home"), {}
+    yield "halls/index.html", reverse("halls:list"), {}
+
+    today = date_class.today()
+    for slug in Hall.objects.values_list("slug", flat=True):
+        url = reverse("halls:detail", args=[slug])
+        yield f"halls/{slug}/index.html", url, {}
+        for offset in range(days):
+            day = (today + timedelta(days=offset)).isoformat()
+            yield f"halls/{slug}/{day}.html", url, {"date": day}
+
+
+def render_page(factory: RequestFactory, url: str, params: dict):
+    """Вызвать вьюху как для анонимного посетителя; None — если не 200."""
+    request = factory.get(url, params)
+    request.user = AnonymousUser()
+    match = resolve(url)
+    response = match.func(request, *match.args, **match.kwargs)
+    if hasattr(response, "render") and callable(response.render):
+        response = response.render()
+    if response.status_code != 200:
+        return None
+    return response.content
+
+
+def _cleanup_releases(releases: Path, keep: int, current: Path):
+    active = current.resolve() if current.exists() else None
+    old = sorted(p for p in releases.iterdir() if p.is_dir())
+    for path in old[:-keep] if keep else old:
+        if path.resolve() != active:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _release_started_ns(current: Path) -> int:
+    """Время начала текущего релиза (из имени каталога <time_ns>-<pid>); 0 — релиза нет."""
+    if not current.exists():
+        return 0
+    return int(current.resolve().name.split("-", 1)[0])
+
+
+def publish(days: int = None, publish_dir=None, newer_than: int = None):
+    """
+    Отрендерить все страницы в новый релиз и переключить на него current.
+
+    newer_than — time_ns, после которого должен начаться релиз: если текущий
+    начат позже (его уже опубликовал другой процесс), ничего не делаем и
+    возвращаем None.
+    """
+    days = settings.PRERENDER_DAYS if days is None else days
+    root = Path(publish_dir or settings.PRERENDER_DIR)
+    releases = root / RELEASES_DIR
+    current = root / CURRENT_LINK
+    root.mkdir(parents=True, exist_ok=True)
+
+    # flock, а не threading.Lock: публикуют несколько процессов
+    with open(root / LOCK_FILE, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        if newer_than is not None and _release_started_ns(current) > newer_than:
+            logger.info("Пререндер: релиз уже опубликован другим процессом")
+            return None
+
+        release = releases / f"{time.time_ns()}-{os.getpid()}"
+        release.mkdir(parents=True)
+
+        factory = RequestFactory()
+        count = 0
+        for rel_path, url, params in iter_pages(days):
+            content = render_page(factory, url, params)
+            if content is None:
+                logger.warning("Пререндер: %s %s — не 200, пропускаем", url, params)
+                continue
+            target = release / rel_path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(content)
+            count += 1
+
+        # новый симлинк рядом и rename поверх старого — атомарно
+        tmp_link = root / f".{CURRENT_LINK}.{os.getpid()}"
+        if tmp_link.is_symlink() or tmp_link.exists():
+            tmp_link.unlink()
+        tmp_link.symlink_to(release.relative_to(root), target_is_directory=True)
+        os.replace(tmp_link, current)
+
+        _cleanup_releases(releases, settings.PRERENDER_KEEP_RELEASES, current)
+
+    logger.info("Пререндер: %s страниц опубликовано в %s", count, release)
+    return release
+
+
+def _run_scheduled():
+    global _timer
+    with _timer_lock:
+        _timer = None
+    # изменения, из-за которых заведён таймер, уже закоммичены — их покажет
+    # любой релиз, начатый после этого момента
+    fired_at = time.time_ns()
+    try:
+        publish(newer_than=fired_at)
+    except Exception:
+        logger.exception("Не удалось перепубликовать статические страницы")
+    finally:
+        close_old_connections()
+
+
+def _start_timer():
+    global _timer
+    with _timer_lock:
+        # изменения пачкой (например, импорт) — одна публикация
+        if _timer is not None:
+            return
+        _timer = threading.Timer(settings.PRERENDER_DELAY_SECONDS, _run_scheduled)
+        _timer.daemon = True
+        _timer.start()
+
+
+def schedule_prerender():
+    """Вызывается из сигналов: перепубликовать страницы после коммита."""
+    if prerender_enabled():
+        transaction.on_commit(_start_timer)
@@ -0,0 +1,181 @@
+"""
+Профилирование отдельного запроса в проде по требованию.
+
+Включается только явно:
+- заголовок X-Gaia-Profile с подписанным токеном
+  (`manage.py profile_token`, живёт PROFILE_TOKEN_MAX_AGE секунд);
+- ?_profile=1 (или ?_profile=sample) для staff-пользователя.
+
+Профиль (cProfile, а при ?_profile=sample и установленном pyinstrument —
+семплирующий) и SQL-трассировка сохраняются в PROFILE_DIR. Id профиля
+приходит в заголовке X-Profile-Id; скачать — /profiles/<id>/<kind>/
+(только staff). Без триггера middleware только проверяет наличие
+заголовка и подстроки в QUERY_STRING.
+"""
+import cProfile
+import json
+import logging
+import time
+import uuid
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core import signing
+from django.db import connections
+from django.http import FileResponse, Http404
+
+try:
+    import pyinstrument
+except ImportError:  # pragma: no cover
+    pyinstrument = None
+
+logger = logging.getLogger(__name__)
+
+HEADER = "HTTP_X_GAIA_PROFILE"
+QUERY_PARAM = "_profile"
+TOKEN_SALT = "gaia.profiling"
+
+# вид файла -> (расширение, content-type)
+ARTIFACTS = {
+    "prof": (".prof", "application/octet-stream"),
+    "html": (".html", "text/html; charset=utf-8"),
+    "sql": (".sql.json", "application/json"),
+}
+
+
+def make_token() -> str:
+    return signing.dumps({"purpose": "profile"}, salt=TOKEN_SALT)
+
+
+def _valid_token(token: str) -> bool:
+    try:
+        data = signing.loads(token, salt=TOKEN_SALT, max_age=settings.PROFILE_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return data.get("purpose") == "profile"
+
+
+def _requested_mode(request):
+    """None — профилировать не нужно, иначе "cprofile" или "sample"."""
+    token = request.META.get(HEADER)
+    query = request.META.get("QUERY_STRING", "")
+    if token is None and QUERY_PARAM not in query:
+        return None
+
+    if token is not None:
+        if not _valid_token(token):
+            return None
+    else:
+        user = getattr(request, "user", None)
+        if not (user is not None and user.is_staff):
+            return None
+
+    mode = request.GET.get(QUERY_PARAM, "")
+    if mode == "sample" and pyinstrument is not None:
+        return "sample"
+    return "cprofile"
+
+
+class SQLTrace:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                {
+                    "alias": context["connection"].alias,
+                    "sql": sql,
+                    "params": repr(params)[:1000],
+                    "many": many,
+                    "ms": round((time.perf_counter() - start) * 1000, 3),
+                }
+            )
+
+
+def _profile_dir() -> Path:
+    path = Path(settings.PROFILE_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _cleanup(directory: Path):
+    files = sorted(directory.glob("*.sql.json"), key=lambda p: p.stat().st_mtime)
+    for sql_file in files[: max(len(files) - settings.PROFILE_KEEP, 0)]:
+        profile_id = sql_file.name[: -len(".sql.json")]
+        for ext, _ in ARTIFACTS.values():
+            (directory / f"{profile_id}{ext}").unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    """Ставить после AuthenticationMiddleware (нужен request.user)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = _requested_mode(request)
+        if mode is None:
+            return self.get_response(request)
+        return self._profile(request, mode)
+
+    def _profile(self, request, mode):
+        profile_id = uuid.uuid4().hex
+        trace = SQLTrace()
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(trace))
+            if mode == "sample":
+                profiler = stack.enter_context(pyinstrument.Profiler())
+            else:
+                profiler = cProfile.Profile()
+                stack.enter_context(profiler)
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+
+        directory = _profile_dir()
+        if mode == "sample":
+            (directory / f"{profile_id}.html").write_text(profiler.output_html(), encoding="utf-8")
+        else:
+            profiler.dump_stats(directory / f"{profile_id}.prof")
+        summary = {
+            "id": profile_id,
+            "mode": mode,
+            "method": request.method,
+            "path": request.get_full_path(),
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 2),
+            "queries": trace.queries,
+        }
+        (directory / f"{profile_id}.sql.json").write_text(
+            json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        _cleanup(directory)
+
+        logger.info("Профиль %s: %s %s (%s)", profile_id, request.method, request.path, mode)
+        response["X-Profile-Id"] = profile_id
+        return response
+
+
+@staff_member_required
+def profile_download(request, profile_id, kind):
+    """GET /profiles/<id>/<prof|html|sql>/ — файл профиля (только staff)."""
+    if kind not in ARTIFACTS:
+        raise Http404
+    ext, content_type = ARTIFACTS[kind]
+    path = Path(settings.PROFILE_DIR) / f"{profile_id}{ext}"
+    if not path.is_file():
+        raise Http404
+    return FileResponse(
+        path.open("rb"),
+        as_attachment=kind != "html",
+        filename=path.name,
+        content_type=content_type,
+    )
@@ -1,3 +1,4 @@
+from importlib.util import find_spec
 from pathlib import Path
 import os
 
@@ -31,6 +32,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 
     "rest_framework",
     "django_filters",
@@ -47,17 +49,36 @@ INSTALLED_APPS = [
 ]
 
 REST_FRAMEWORK = {
+    # JSON через orjson; MessagePack — если установлен msgpack (клиент просит Accept: application/msgpack)
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "api.renderers.FastJSONRenderer",
+        *(["api.renderers.MessagePackRenderer"] if find_spec("msgpack") else []),
     ],
     "DEFAULT_PARSER_CLASSES": [
-        "rest_framework.parsers.JSONParser",
+        "api.renderers.FastJSONParser",
+        *(["api.renderers.MessagePackParser"] if find_spec("msgpack") else []),
     ],
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
     ],
+    # Лимиты для api.throttling: <scope> — на один IP, <scope>_total — на всех вместе
+    "DEFAULT_THROTTLE_RATES": {
+        "availability": os.getenv("THROTTLE_AVAILABILITY", "60/min"),
+        "availability_total": os.getenv("THROTTLE_AVAILABILITY_TOTAL", "1200/min"),
+        "booking_create": os.getenv("THROTTLE_BOOKING_CREATE", "10/hour"),
+        "booking_create_total": os.getenv("THROTTLE_BOOKING_CREATE_TOTAL", "300/hour"),
+    },
+    # Число доверенных прокси перед Django: IP клиента берётся из X-Forwarded-For
+    # (nginx: proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for).
+    # По умолчанию 1 — прод за nginx; с 0 за прокси все клиенты делят один IP
+    # (и один лимит). 0 — только если Django принимает соединения напрямую.
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "1")),
 }
 
+# Размер страницы для курсорной пагинации (api.pagination)
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "50"))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "200"))
+
 # Разрешённые origin’ы для фронта (Nuxt)
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",  # dev-сервер фронта
@@ -66,22 +87,37 @@ CORS_ALLOWED_ORIGINS = [
 
 # === Middleware ===
 MIDDLEWARE = [
+    "gaia.metrics.MetricsMiddleware",
+    "gaia.timing.ServerTimingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "gaia.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "gaia.profiling.ProfilingMiddleware",
 ]
 
+# Сжатие ответов (gaia.middleware.CompressionMiddleware)
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_CACHE_TIMEOUT = int(os.getenv("COMPRESSION_CACHE_TIMEOUT", str(60 * 60)))
+
+# Замеры запросов (gaia.timing): доля замеряемых запросов, 0..1
+TIMING_SAMPLE_RATE = float(os.getenv("TIMING_SAMPLE_RATE", "1" if DEBUG else "0.01"))
+# Отдавать замеры клиенту в заголовке Server-Timing (для замеренных запросов)
+TIMING_SERVER_TIMING_HEADER = os.getenv("TIMING_SERVER_TIMING_HEADER", "True") == "True"
+
 ROOT_URLCONF = "gaia.urls"
 
 # === Шаблоны ===
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # обычный DjangoTemplates + время рендера в gaia.timing
+        "BACKEND": "gaia.timing.TimedDjangoTemplates",
         # тут твоё дополнение с общей папкой templates
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
@@ -109,9 +145,140 @@ DATABASES = {
             "PASSWORD": os.getenv("POSTGRES_PASSWORD", ""),
             "HOST": os.getenv("POSTGRES_HOST", "localhost"),
             "PORT": os.getenv("POSTGRES_PORT", "5432"),
+            # проверять соединение перед повторным использованием
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {},
         }
     }
 
+# Соединения с БД:
+# - POSTGRES_POOL=True — пул psycopg3 (psycopg[pool]) внутри процесса;
+#   Django не разрешает совмещать его с CONN_MAX_AGE, поэтому тогда он 0;
+# - иначе постоянные соединения, живущие POSTGRES_CONN_MAX_AGE секунд.
+POSTGRES_POOL = os.getenv("POSTGRES_POOL", "False") == "True"
+
+if POSTGRES_POOL:
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.getenv("POSTGRES_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.getenv("POSTGRES_POOL_MAX_SIZE", "10")),
+        "timeout": int(os.getenv("POSTGRES_POOL_TIMEOUT", "10")),
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("POSTGRES_CONN_MAX_AGE", "60"))
+
+# Реплика для чтения (gaia.db_router): включается, если задан POSTGRES_REPLICA_HOST
+POSTGRES_REPLICA_HOST = os.getenv("POSTGRES_REPLICA_HOST", "")
+# Сколько секунд после записи читать только с основной БД
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+
+if POSTGRES_REPLICA_HOST:
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": POSTGRES_REPLICA_HOST,
+        "PORT": os.getenv("POSTGRES_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "OPTIONS": {**DATABASES["default"]["OPTIONS"]},
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_ROUTERS = ["gaia.db_router.ReplicaRouter"]
+    MIDDLEWARE.append("gaia.db_router.ReplicaStickinessMiddleware")
+
+# Метрики Prometheus (gaia.metrics): /metrics у веба, отдельный порт у бота.
+# Если METRICS_TOKEN задан — нужен заголовок "Authorization: Bearer <token>",
+# без токена /metrics открыт только при DEBUG и только с адресов
+# METRICS_ALLOWED_IPS (адрес клиента — из X-Forwarded-For с учётом NUM_PROXIES,
+# см. REST_FRAMEWORK выше). В проде без METRICS_TOKEN /metrics закрыт.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_ALLOWED_IPS = [
+    ip.strip() for ip in os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",") if ip.strip()
+]
+# 0 — экспортер метрик бота выключен
+BOT_METRICS_PORT = int(os.getenv("BOT_METRICS_PORT", "0"))
+BOT_METRICS_ADDR = os.getenv("BOT_METRICS_ADDR", "127.0.0.1")
+
+# Профилирование запроса по требованию (gaia.profiling)
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", str(BASE_DIR / "profiles")))
+# Сколько живёт токен из `manage.py profile_token`
+PROFILE_TOKEN_MAX_AGE = int(os.getenv("PROFILE_TOKEN_MAX_AGE", str(60 * 60)))
+# Сколько последних профилей хранить
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+
+# === Логи ===
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        # JSON-строки с замерами запросов (gaia.timing)
+        "gaia.timing": {
+            "handlers": ["console"],
+            "level": os.getenv("TIMING_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
+# === Кеш ===
+# По умолчанию — память процесса; для нескольких воркеров лучше указать REDIS_URL
+REDIS_URL = os.getenv("REDIS_URL", "")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "gaia.cache_backends.InstrumentedRedisCache",
+            "LOCATION": REDIS_URL,
+        },
+        # версии кешей (gaia.cache_versions) — общие для всех процессов
+        "versions": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "gaia.cache_backends.InstrumentedLocMemCache",
+            "LOCATION": "gaia",
+        },
+        # отдельно от default, чтобы ключи троттлинга и сжатия не вытесняли версии
+        "versions": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "gaia-versions",
+        },
+    }
+
+# Версионные кеши (свободные слоты, списки залов и меню, bootstrap, HTML-страницы
+# и фрагменты) сбрасываются версиями из кеша "versions". Брони и блокировки
+# меняются и в других процессах (воркеры gunicorn, бот), поэтому без общего
+# хранилища (Redis) эти кеши выключены. Для одного процесса (runserver) можно
+# включить явно: VERSIONED_CACHES=True.
+VERSIONED_CACHES = os.getenv("VERSIONED_CACHES", str(bool(REDIS_URL))) == "True"
+
+# Сколько живёт готовый JSON каталога товаров (сбрасывается и так при сохранении товара)
+CATALOG_CACHE_TIMEOUT = int(os.getenv("CATALOG_CACHE_TIMEOUT", str(60 * 60)))
+
+# Кеш свободных слотов залов (сбрасывается при изменении броней и блокировок)
+AVAILABILITY_CACHE_TIMEOUT = int(os.getenv("AVAILABILITY_CACHE_TIMEOUT", str(10 * 60)))
+
+# HTML-страницы залов и главной: целиком для анонимов (gaia.page_cache)
+# и фрагменты шаблонов ({% cache %}); ключи версионные, сброс — сигналами
+PAGE_CACHE_TIMEOUT = int(os.getenv("PAGE_CACHE_TIMEOUT", str(5 * 60)))
+# (фрагмент со свободными слотами — не дольше AVAILABILITY_CACHE_TIMEOUT)
+FRAGMENT_CACHE_TIMEOUT = int(os.getenv("FRAGMENT_CACHE_TIMEOUT", str(60 * 60)))
+
+# Статические копии страниц для nginx (gaia.prerender); пусто — выключено
+PRERENDER_DIR = os.getenv("PRERENDER_DIR", "")
+# На сколько дней вперёд (включая сегодня) рендерить страницы залов
+PRERENDER_DAYS = int(os.getenv("PRERENDER_DAYS", "7"))
+# Пауза после изменения перед перепубликацией — изменения пачкой дают одну публикацию
+PRERENDER_DELAY_SECONDS = float(os.getenv("PRERENDER_DELAY_SECONDS", "5"))
+PRERENDER_KEEP_RELEASES = int(os.getenv("PRERENDER_KEEP_RELEASES", "3"))
+
+# Индекс подсказок (api.autocomplete) целиком перестраивается не реже, чем раз в N секунд
+AUTOCOMPLETE_REFRESH_SECONDS = int(os.getenv("AUTOCOMPLETE_REFRESH_SECONDS", "600"))
+
 # === Валидаторы паролей ===
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -155,9 +322,36 @@ STATICFILES_DIRS = [
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Медиа хранятся по хешу содержимого — URL файла неизменяем и хорошо кешируется
+STORAGES = {
+    "default": {
+        "BACKEND": "gaia.storage.ContentHashedStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+
+# Отдача медиа через gaia.media.serve_media:
+# "" — сам Django (FileResponse), "x-accel" — nginx, "x-sendfile" — apache/lighttpd
+MEDIA_OFFLOAD = os.getenv("MEDIA_OFFLOAD", "")
+# internal location в nginx, смотрящий в MEDIA_ROOT
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv("MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+# Для файлов со старыми (не хешированными) именами
+MEDIA_CACHE_MAX_AGE = int(os.getenv("MEDIA_CACHE_MAX_AGE", "3600"))
+
+# Уменьшенные копии фото товаров и залов (gaia.images)
+IMAGE_VARIANT_WIDTHS = [
+    int(w) for w in os.getenv("IMAGE_VARIANT_WIDTHS", "320,640,1280").split(",") if w.strip()
+]
+IMAGE_VARIANT_WORKERS = int(os.getenv("IMAGE_VARIANT_WORKERS", "2"))
+# True — строить сразу после коммита в том же потоке (удобно в тестах/командах)
+IMAGE_VARIANTS_SYNC = os.getenv("IMAGE_VARIANTS_SYNC", "False") == "True"
+
 # === Email ===
 
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+# SMTP-бэкенд Django + время отправки в метриках
+EMAIL_BACKEND = "notifications.backends.TimedSMTPEmailBackend"
 
 EMAIL_HOST = os.getenv("EMAIL_HOST", "smtp.mail.ru")
 EMAIL_PORT = int(os.getenv("EMAIL_PORT", "465"))
@@ -176,4 +370,11 @@ GAIA_ADMIN_EMAIL = os.getenv("GAIA_ADMIN_EMAIL", EMAIL_HOST_USER)
 
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_ADMIN_CHAT_ID = int(os.getenv("TELEGRAM_ADMIN_CHAT_ID", "0") or 0)
+# Потоки-обработчики апдейтов в tg_bot.py (при POSTGRES_POOL — не больше размера пула)
+TELEGRAM_BOT_WORKERS = int(os.getenv("TELEGRAM_BOT_WORKERS", "4"))
+
+
+# === Меню (PDF) ===
 
+# Telegram Bot API отдаёт через getFile файлы не больше 20 МБ
+MENU_FILE_MAX_SIZE = int(os.getenv("MENU_FILE_MAX_SIZE_MB", "20")) * 1024 * 1024
@@ -0,0 +1,55 @@
+import hashlib
+import os
+import re
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+
+HASH_LENGTH = 32  # 128 бит sha256 — с запасом хватает, и имя влезает в max_length=100
+
+_HASHED_NAME_RE = re.compile(r"(^|/)[0-9a-f]{2}/[0-9a-f]{%d}(\.[^/]*)?$" % HASH_LENGTH)
+
+
+def hash_file_content(content) -> str:
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    content.seek(0)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def is_content_addressed(name: str) -> bool:
+    """Имя файла получено из хеша содержимого (значит, URL никогда не поменяется)."""
+    return bool(name and _HASHED_NAME_RE.search(name))
+
+
+class ContentHashedStorage(FileSystemStorage):
+    """
+    Хранилище медиа, которое кладёт файлы по хешу содержимого:
+    menus/ab/ab12...ef.pdf, products/cd/cd34...01.jpg и т.п.
+
+    - одинаковые загрузки не дублируются на диске — возвращается уже
+      существующее имя;
+    - содержимое по URL никогда не меняется, поэтому такие файлы можно
+      отдавать с Cache-Control: immutable.
+    """
+
+    def get_hashed_name(self, name: str, content) -> str:
+        dir_name, file_name = os.path.split(name)
+        ext = os.path.splitext(file_name)[1].lower()
+        content_hash = hash_file_content(content)
+        return os.path.join(dir_name, content_hash[:2], f"{content_hash}{ext}").replace("\\", "/")
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+
+        hashed_name = self.get_hashed_name(name, content)
+        if self.exists(hashed_name):
+            # Такой файл уже лежит — просто ссылаемся на него
+            return hashed_name
+
+        return super().save(hashed_name, content, max_length=max_length)
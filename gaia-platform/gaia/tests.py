@@ -0,0 +1,356 @@
+import fcntl
+import gc
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import date
+from urllib.parse import unquote
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from halls.models import Hall
+from . import db_router
+from .db_router import (
+    REPLICA_DB_ALIAS,
+    STICKY_COOKIE,
+    ReplicaRouter,
+    ReplicaStickinessMiddleware,
+    primary_only,
+    replica_reads,
+)
+from .media import serve_media
+from .metrics import Counter, Histogram, Registry, metrics_view
+from .page_cache import anonymous_page_cache
+from .prerender import CURRENT_LINK, LOCK_FILE, publish
+
+router = ReplicaRouter()
+
+
+def read_alias():
+    return router.db_for_read(Hall)
+
+
+class RouterStateMixin:
+    """Сбрасывает состояние роутера (флаг записи и время последней записи)."""
+
+    def setUp(self):
+        super().setUp()
+        token = db_router._wrote.set(False)
+        self.addCleanup(db_router._wrote.reset, token)
+        patcher = mock.patch.object(db_router, "_last_write_at", 0.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class ReplicaRouterTests(RouterStateMixin, SimpleTestCase):
+    def test_reads_go_to_primary_by_default(self):
+        self.assertEqual(read_alias(), "default")
+
+    def test_replica_reads(self):
+        with replica_reads():
+            self.assertEqual(read_alias(), REPLICA_DB_ALIAS)
+        self.assertEqual(read_alias(), "default")
+
+    def test_primary_only_wins_inside_replica_reads(self):
+        with replica_reads():
+            with primary_only():
+                self.assertEqual(read_alias(), "default")
+            self.assertEqual(read_alias(), REPLICA_DB_ALIAS)
+
+    def test_replica_reads_can_be_disabled(self):
+        with replica_reads(enabled=False):
+            self.assertEqual(read_alias(), "default")
+
+        enabled = mock.Mock(return_value=True)
+        wrapped = replica_reads(enabled=enabled)(read_alias)
+        self.assertEqual(wrapped(), REPLICA_DB_ALIAS)
+        enabled.return_value = False
+        # функция проверяется при каждом вызове, а не один раз при декорировании
+        self.assertEqual(wrapped(), "default")
+
+    def test_writes_go_to_primary(self):
+        with replica_reads():
+            self.assertEqual(router.db_for_write(Hall), "default")
+
+    @override_settings(REPLICA_STICKY_SECONDS=5)
+    def test_sticky_window_outside_requests(self):
+        with mock.patch.object(db_router.time, "monotonic", return_value=100.0):
+            router.db_for_write(Hall)
+
+        with replica_reads():
+            with mock.patch.object(db_router.time, "monotonic", return_value=103.0):
+                self.assertEqual(read_alias(), "default")
+            with mock.patch.object(db_router.time, "monotonic", return_value=106.0):
+                self.assertEqual(read_alias(), REPLICA_DB_ALIAS)
+
+
+class ReplicaStickinessMiddlewareTests(RouterStateMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+
+    def run_request(self, request, write=False):
+        seen = {}
+
+        def view(request):
+            if write:
+                router.db_for_write(Hall)
+            with replica_reads():
+                seen["alias"] = read_alias()
+            return HttpResponse()
+
+        response = ReplicaStickinessMiddleware(view)(request)
+        return seen["alias"], response
+
+    def test_write_sets_cookie_and_pins_reads(self):
+        alias, response = self.run_request(self.factory.post("/"), write=True)
+        self.assertEqual(alias, "default")
+        self.assertIn(STICKY_COOKIE, response.cookies)
+
+    def test_cookie_pins_reads_to_primary(self):
+        request = self.factory.get("/")
+        request.COOKIES[STICKY_COOKIE] = "1"
+        alias, response = self.run_request(request)
+        self.assertEqual(alias, "default")
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+
+    def test_other_clients_read_from_replica(self):
+        self.run_request(self.factory.post("/"), write=True)
+        alias, _ = self.run_request(self.factory.get("/"))
+        # окно «после записи» в запросах — на клиента, а не на весь процесс
+        self.assertEqual(alias, REPLICA_DB_ALIAS)
+        # флаги запроса не протекают наружу
+        self.assertFalse(db_router._wrote.get())
+        self.assertFalse(db_router._force_primary.get())
+
+
+class AtomicReadsTests(RouterStateMixin, TestCase):
+    def test_reads_inside_transaction_go_to_primary(self):
+        # TestCase держит каждый тест в транзакции
+        with replica_reads():
+            self.assertEqual(read_alias(), "default")
+
+
+class CacheFillUsesPrimaryTests(RouterStateMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.request = RequestFactory().get("/")
+        self.request.user = AnonymousUser()
+
+    def page_view(self, seen):
+        @anonymous_page_cache()
+        @replica_reads()
+        def view(request):
+            seen.append(read_alias())
+            return HttpResponse("ok")
+
+        return view
+
+    @override_settings(VERSIONED_CACHES=True)
+    def test_page_cache_miss_renders_from_primary(self):
+        seen = []
+        with mock.patch("gaia.page_cache.cache") as cache:
+            cache.get.return_value = None
+            self.page_view(seen)(self.request)
+        self.assertEqual(seen, ["default"])
+
+    @override_settings(VERSIONED_CACHES=False)
+    def test_uncached_page_reads_from_replica(self):
+        seen = []
+        self.page_view(seen)(self.request)
+        self.assertEqual(seen, [REPLICA_DB_ALIAS])
+
+    @override_settings(VERSIONED_CACHES=True)
+    def test_availability_cache_miss_reads_from_primary(self):
+        from halls.services import get_available_slot_times
+
+        seen = []
+
+        def fake_slots(hall, day):
+            seen.append(read_alias())
+            return []
+
+        with mock.patch("halls.services.cache") as cache, mock.patch(
+            "halls.services.get_available_slots", side_effect=fake_slots
+        ):
+            cache.get.return_value = None
+            with replica_reads():
+                get_available_slot_times(Hall(id=1), date(2030, 1, 10))
+        self.assertEqual(seen, ["default"])
+
+
+@override_settings(DEBUG=True, METRICS_TOKEN="", METRICS_ALLOWED_IPS=["127.0.0.1"])
+class MetricsAccessTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def get(self, **extra):
+        return metrics_view(self.factory.get("/metrics", REMOTE_ADDR="127.0.0.1", **extra))
+
+    def test_proxied_request_is_checked_by_client_ip(self):
+        # за nginx REMOTE_ADDR всегда 127.0.0.1 — решает адрес из X-Forwarded-For
+        self.assertEqual(self.get(HTTP_X_FORWARDED_FOR="203.0.113.5").status_code, 403)
+        self.assertEqual(self.get(HTTP_X_FORWARDED_FOR="127.0.0.1").status_code, 200)
+
+    def test_forged_forwarded_for_is_ignored(self):
+        # nginx дописывает реальный адрес в конец; подставленный клиентом — левее
+        response = self.get(HTTP_X_FORWARDED_FOR="127.0.0.1, 203.0.113.5")
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(DEBUG=False)
+    def test_token_is_required_without_debug(self):
+        # Django может быть доступен напрямую — X-Forwarded-For тогда подделать легко
+        self.assertEqual(self.get().status_code, 403)
+        self.assertEqual(self.get(HTTP_X_FORWARDED_FOR="127.0.0.1").status_code, 403)
+
+    @override_settings(DEBUG=False, METRICS_TOKEN="secret")
+    def test_token(self):
+        self.assertEqual(self.get().status_code, 403)
+        self.assertEqual(self.get(HTTP_AUTHORIZATION="Bearer secret").status_code, 200)
+
+
+class RegistryTests(SimpleTestCase):
+    def test_finished_thread_shard_is_folded_into_totals(self):
+        registry = Registry()
+        counter = Counter("test_total", "Тест.", registry=registry)
+        histogram = Histogram("test_seconds", "Тест.", buckets=(1.0,), registry=registry)
+
+        def work():
+            for _ in range(5):
+                counter.inc()
+                histogram.observe(0.5)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        gc.collect()
+
+        # шарды завершившихся потоков не копятся
+        self.assertEqual(registry._shards, {})
+        counter.inc()
+        totals = registry.collect()
+        self.assertEqual(totals[("test_total", ())], 21)
+        self.assertEqual(totals[("test_seconds", ())], [20, 0, 10.0, 20])
+        self.assertEqual(len(registry._shards), 1)
+
+
+class ServeMediaTests(SimpleTestCase):
+    body = bytes(range(256)) * 4
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root, MEDIA_OFFLOAD="")
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        with open(os.path.join(media_root, "menu.pdf"), "wb") as f:
+            f.write(self.body)
+        self.factory = RequestFactory()
+
+    def get(self, **headers):
+        return serve_media(self.factory.get("/media/menu.pdf", headers=headers), "menu.pdf")
+
+    def content(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_full_response_has_validators(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.content(response), self.body)
+        self.assertTrue(response["ETag"])
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+    def test_etag_gives_304(self):
+        etag = self.get()["ETag"]
+        response = self.get(if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(self.get(if_none_match='"other"').status_code, 200)
+
+    def test_ranges(self):
+        for header, start, end in (("bytes=0-99", 0, 99), ("bytes=1000-", 1000, 1023), ("bytes=-24", 1000, 1023)):
+            with self.subTest(header=header):
+                response = self.get(range=header)
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(response["Content-Range"], f"bytes {start}-{end}/1024")
+                self.assertEqual(response["Content-Length"], str(end - start + 1))
+                self.assertEqual(self.content(response), self.body[start:end + 1])
+
+    def test_unsatisfiable_range(self):
+        response = self.get(range="bytes=2000-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */1024")
+
+    def test_if_range_with_stale_etag_returns_whole_file(self):
+        etag = self.get()["ETag"]
+        self.assertEqual(self.get(range="bytes=0-9", if_range=etag).status_code, 206)
+        response = self.get(range="bytes=0-9", if_range='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.content(response), self.body)
+
+    def test_offload_headers_are_url_encoded(self):
+        # файлы до перехода на имена по хешу сохранены с исходными (русскими) именами
+        name = "menus/Основное меню.pdf"
+        os.makedirs(os.path.join(settings.MEDIA_ROOT, "menus"))
+        with open(os.path.join(settings.MEDIA_ROOT, name), "wb") as f:
+            f.write(self.body)
+        request = self.factory.get("/media/x")
+
+        with override_settings(MEDIA_OFFLOAD="x-accel", MEDIA_ACCEL_REDIRECT_PREFIX="/protected-media/"):
+            response = serve_media(request, name)
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            "/protected-media/menus/%D0%9E%D1%81%D0%BD%D0%BE%D0%B2%D0%BD%D0%BE%D0%B5%20%D0%BC%D0%B5%D0%BD%D1%8E.pdf",
+        )
+
+        with override_settings(MEDIA_OFFLOAD="x-sendfile"):
+            response = serve_media(request, name)
+        header = response["X-Sendfile"]
+        self.assertTrue(header.isascii())
+        self.assertEqual(unquote(header), os.path.join(settings.MEDIA_ROOT, name))
+
+    def test_path_outside_media_root(self):
+        with self.assertRaises(Http404):
+            serve_media(self.factory.get("/media/x"), "../secret")
+
+
+@mock.patch("gaia.prerender.render_page", return_value=b"ok")
+@mock.patch("gaia.prerender.iter_pages", return_value=[("index.html", "/", {})])
+class PrerenderPublishTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def current(self):
+        return os.path.realpath(os.path.join(self.root, CURRENT_LINK))
+
+    def test_scheduled_publish_skips_when_newer_release_exists(self, *mocks):
+        requested_at = time.time_ns()
+        release = publish(publish_dir=self.root)
+        # другой процесс уже опубликовал релиз после изменения — второй не нужен
+        self.assertIsNone(publish(publish_dir=self.root, newer_than=requested_at))
+        self.assertEqual(self.current(), str(release))
+
+        newer = publish(publish_dir=self.root, newer_than=time.time_ns())
+        self.assertEqual(self.current(), str(newer))
+
+    def test_publish_waits_for_lock_held_by_another_process(self, *mocks):
+        published = []
+        with open(os.path.join(self.root, LOCK_FILE), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            # отдельный open() — отдельная блокировка, как у другого процесса
+            thread = threading.Thread(target=lambda: published.append(publish(publish_dir=self.root)))
+            thread.start()
+            thread.join(0.2)
+            self.assertTrue(thread.is_alive())
+        thread.join(5)
+        self.assertEqual(len(published), 1)
+        self.assertEqual(self.current(), str(published[0]))
@@ -0,0 +1,174 @@
+"""
+Замеры времени запроса: SQL (число и время запросов), кеш (попадания,
+промахи, время), рендер шаблонов, вьюха и весь запрос.
+
+Результат уходит в заголовок Server-Timing (его показывает DevTools
+браузера) и в лог «gaia.timing» одной JSON-строкой с именем вьюхи —
+по логам видно, какая вьюха сколько тратит и на что.
+
+Замеряется доля запросов TIMING_SAMPLE_RATE (0..1); остальные идут без
+обёрток, накладные расходы — одна проверка contextvar в кеше и шаблонах.
+Кеш и шаблоны считаются через gaia.cache_backends и TimedDjangoTemplates.
+"""
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    __slots__ = (
+        "started",
+        "view_started",
+        "view_time",
+        "view_name",
+        "db_count",
+        "db_time",
+        "cache_hits",
+        "cache_misses",
+        "cache_time",
+        "template_time",
+    )
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.view_time = 0.0
+        self.view_name = ""
+        self.db_count = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_time = 0.0
+        self.template_time = 0.0
+
+    def add_cache(self, duration: float, hits: int = 0, misses: int = 0):
+        self.cache_time += duration
+        self.cache_hits += hits
+        self.cache_misses += misses
+
+    def add_template(self, duration: float):
+        self.template_time += duration
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.db_count += 1
+
+    def server_timing(self, total: float) -> str:
+        ms = lambda seconds: f"{seconds * 1000:.1f}"  # noqa: E731
+        return ", ".join(
+            [
+                f'db;dur={ms(self.db_time)};desc="{self.db_count} queries"',
+                f'cache;dur={ms(self.cache_time)};desc="{self.cache_hits} hit / {self.cache_misses} miss"',
+                f"tpl;dur={ms(self.template_time)}",
+                f'view;dur={ms(self.view_time)};desc="{self.view_name}"',
+                f"total;dur={ms(total)}",
+            ]
+        )
+
+    def as_log(self, request, response, total: float) -> dict:
+        return {
+            "method": request.method,
+            "path": request.path,
+            "view": self.view_name,
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 2),
+            "view_ms": round(self.view_time * 1000, 2),
+            "db_queries": self.db_count,
+            "db_ms": round(self.db_time * 1000, 2),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_ms": round(self.cache_time * 1000, 2),
+            "template_ms": round(self.template_time * 1000, 2),
+        }
+
+
+def current_timings():
+    """Замеры текущего запроса или None, если запрос не попал в выборку."""
+    return _current.get()
+
+
+def _sampled() -> bool:
+    rate = settings.TIMING_SAMPLE_RATE
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+class ServerTimingMiddleware:
+    """Ставить первым в MIDDLEWARE, чтобы total покрывал весь запрос."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not _sampled():
+            return self.get_response(request)
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings.db_wrapper))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        if timings.view_started is not None:
+            # внутренние middleware и рендер ответа DRF тоже сюда попадают
+            timings.view_time = time.perf_counter() - timings.view_started
+        total = time.perf_counter() - timings.started
+
+        if settings.TIMING_SERVER_TIMING_HEADER:
+            response["Server-Timing"] = timings.server_timing(total)
+        logger.info(json.dumps(timings.as_log(request, response, total), ensure_ascii=False))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = _current.get()
+        if timings is not None:
+            match = request.resolver_match
+            timings.view_name = (match.view_name if match else "") or view_func.__name__
+            timings.view_started = time.perf_counter()
+        return None
+
+
+class _TimedTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        timings = _current.get()
+        if timings is None:
+            return self.template.render(context, request)
+        start = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            timings.add_template(time.perf_counter() - start)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Обычный движок Django, но время render() идёт в замеры запроса."""
+
+    def from_string(self, template_code):
+        return _TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return _TimedTemplate(super().get_template(template_name))
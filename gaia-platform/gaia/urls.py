@@ -15,20 +15,23 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 
 from django.conf import settings
-from django.conf.urls.static import static
+
+from .media import serve_media
+from .metrics import metrics_view
+from .profiling import profile_download
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
+    re_path(r"^profiles/(?P<profile_id>[0-9a-f]{32})/(?P<kind>prof|html|sql)/$", profile_download, name="profile-download"),
     path("", include("landing.urls")),
     path("booking/", include("booking.urls")),
     path("halls/", include("halls.urls")),
     path("api/", include("menus.urls", namespace="menus")),
     path("api/", include("shop.urls", namespace="shop")),
     path("api/", include("api.urls")),
+    re_path(rf"^{settings.MEDIA_URL.lstrip('/')}(?P<path>.+)$", serve_media, name="media"),
 ]
-
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,5 +1,7 @@
 from django.db import models
 
+from gaia.images import build_srcset
+
 
 class Hall(models.Model):
     name = models.CharField(max_length=100)  # "Малый зал", "Большой зал"
@@ -10,10 +12,22 @@ class Hall(models.Model):
 
     # например, для отображения красивых фоток залов
     photo = models.ImageField(upload_to="halls", blank=True, null=True)
+    # уменьшенные копии фото (заполняет gaia.images в фоне)
+    photo_variants = models.JSONField(default=dict, blank=True, editable=False)
+
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
 
+    @property
+    def photo_srcset_webp(self) -> str:
+        return build_srcset(self.photo_variants, self.photo.storage, "webp")
+
+    @property
+    def photo_srcset_jpeg(self) -> str:
+        return build_srcset(self.photo_variants, self.photo.storage, "jpeg")
+
 
 class BlockedSlot(models.Model):
     hall = models.ForeignKey(Hall, on_delete=models.CASCADE, related_name="blocked_slots")
@@ -1,8 +1,14 @@
 from datetime import datetime, time, timedelta
 from typing import List
 
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 
+from gaia import cache_versions
+from gaia.cache_versions import get_version
+from gaia.db_router import primary_only
+from gaia.metrics import AVAILABILITY_CACHE
 from .models import Hall
 from booking.services import (
     WORK_DAY_START_HOUR,
@@ -30,3 +36,46 @@ def get_available_slots(hall: Hall, date) -> List[datetime]:
             slots.append(start_dt)
 
     return slots
+
+
+# Версии кешей (см. signals): залы и свободные слоты (Booking / BlockedSlot)
+HALLS_VERSION = "halls"
+AVAILABILITY_VERSION = "availability"
+
+
+def get_fragment_cache_context() -> dict:
+    """
+    Переменные для {% cache %} в шаблонах залов: версии в ключе фрагмента
+    делают его неактуальным сразу после изменения залов/броней/блокировок.
+    """
+    timeout = settings.FRAGMENT_CACHE_TIMEOUT if cache_versions.enabled() else 0
+    return {
+        # 0 — фрагмент не кешируется (версии не общие для процессов)
+        "fragment_timeout": timeout,
+        # свободные слоты живут не дольше кеша доступности: брони, созданные
+        # в обход сигналов (bulk_create, update), устаревают сами
+        "availability_fragment_timeout": min(timeout, settings.AVAILABILITY_CACHE_TIMEOUT),
+        "halls_version": get_version(HALLS_VERSION),
+        "availability_version": get_version(AVAILABILITY_VERSION),
+    }
+
+
+def get_available_slot_times(hall: Hall, date) -> List[str]:
+    """
+    То же, что get_available_slots, но строками "HH:MM" и через кеш:
+    на каждый час get_available_slots делает по два запроса в БД.
+    """
+    if not cache_versions.enabled():
+        return [slot.strftime("%H:%M") for slot in get_available_slots(hall, date)]
+
+    key = f"halls:availability:{get_version(AVAILABILITY_VERSION)}:{hall.id}:{date.isoformat()}"
+    slots = cache.get(key)
+    if slots is None:
+        AVAILABILITY_CACHE.inc("miss")
+        # в общий кеш — только с основной БД
+        with primary_only():
+            slots = [slot.strftime("%H:%M") for slot in get_available_slots(hall, date)]
+        cache.set(key, slots, settings.AVAILABILITY_CACHE_TIMEOUT)
+    else:
+        AVAILABILITY_CACHE.inc("hit")
+    return slots
@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from gaia.cache_versions import bump_version
+from gaia.images import schedule_variants
+from gaia.prerender import schedule_prerender
+from .models import BlockedSlot, Hall
+from .services import AVAILABILITY_VERSION, HALLS_VERSION
+
+
+@receiver(post_save, sender=Hall)
+def hall_photo_changed(sender, instance, **kwargs):
+    schedule_variants(instance, "photo", "photo_variants")
+
+
+@receiver(post_save, sender=Hall)
+@receiver(post_delete, sender=Hall)
+def halls_changed(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version(HALLS_VERSION))
+    schedule_prerender()
+
+
+@receiver(post_save, sender=BlockedSlot)
+@receiver(post_delete, sender=BlockedSlot)
+def blocked_slots_changed(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version(AVAILABILITY_VERSION))
+    schedule_prerender()
@@ -1,3 +1,86 @@
-from django.test import TestCase
+from datetime import date, datetime, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from booking.models import Booking
+from gaia.cache_versions import VERSIONS_CACHE, bump_version, get_version
+from .models import Hall
+from .services import AVAILABILITY_VERSION, get_available_slot_times
+
+DAY = date(2030, 1, 10)
+
+
+def book(hall, hour):
+    start = timezone.make_aware(datetime(DAY.year, DAY.month, DAY.day, hour))
+    return Booking.objects.create(
+        hall=hall,
+        customer_name="Гость",
+        customer_phone="+7 900 000-00-00",
+        customer_email="guest@example.com",
+        start_time=start,
+        end_time=start + timedelta(hours=1),
+        duration_hours=1,
+        total_price=hall.base_price_per_hour,
+    )
+
+
+class CacheVersionsTests(TestCase):
+    def setUp(self):
+        caches[VERSIONS_CACHE].clear()
+
+    def test_bump_increases_version(self):
+        version = get_version("test")
+        self.assertGreater(bump_version("test"), version)
+        self.assertGreater(get_version("test"), version)
+
+    def test_lost_version_is_never_reused(self):
+        old = bump_version("test")
+        # ключ версии вытеснили — новая версия не должна совпасть ни с одной выданной
+        caches[VERSIONS_CACHE].clear()
+        self.assertGreater(get_version("test"), old)
+
+        old = get_version("test")
+        caches[VERSIONS_CACHE].clear()
+        self.assertGreater(bump_version("test"), old)
+
+
+@override_settings(VERSIONED_CACHES=True)
+class AvailabilityCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches[VERSIONS_CACHE].clear()
+        self.hall = Hall.objects.create(name="Зал", slug="hall", base_price_per_hour=Decimal("1000.00"))
+
+    def test_booking_bumps_version_after_commit(self):
+        self.assertIn("12:00", get_available_slot_times(self.hall, DAY))
+        version = get_version(AVAILABILITY_VERSION)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            book(self.hall, 12)
+
+        self.assertGreater(get_version(AVAILABILITY_VERSION), version)
+        self.assertNotIn("12:00", get_available_slot_times(self.hall, DAY))
+
+    def test_availability_endpoint_sees_new_booking(self):
+        url = f"/api/halls/{self.hall.id}/availability/?date={DAY.isoformat()}"
+        times = [slot["time"] for slot in self.client.get(url).json()["slots"]]
+        self.assertIn("12:00", times)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            book(self.hall, 12)
+
+        times = [slot["time"] for slot in self.client.get(url).json()["slots"]]
+        self.assertNotIn("12:00", times)
+
+
+@override_settings(VERSIONED_CACHES=False)
+class AvailabilityWithoutSharedVersionsTests(TestCase):
+    def test_slots_are_read_from_db(self):
+        hall = Hall.objects.create(name="Зал", slug="hall", base_price_per_hour=Decimal("1000.00"))
+        self.assertIn("12:00", get_available_slot_times(hall, DAY))
+        # без on_commit: версию никто не сбросит, но кеш и не используется
+        book(hall, 12)
+        self.assertNotIn("12:00", get_available_slot_times(hall, DAY))
@@ -2,31 +2,44 @@ from datetime import date as date_class
 
 from django.shortcuts import render, get_object_or_404
 from django.utils.dateparse import parse_date
+from django.utils.functional import SimpleLazyObject
 
+from gaia import cache_versions
+from gaia.db_router import replica_reads
+from gaia.page_cache import anonymous_page_cache
 from .models import Hall
-from .services import get_available_slots
+from .services import (
+    AVAILABILITY_VERSION,
+    HALLS_VERSION,
+    get_available_slot_times,
+    get_fragment_cache_context,
+)
 
 
+@anonymous_page_cache(versions=(HALLS_VERSION,))
+# пока страницы и фрагменты кешируются, промахи читают основную БД
+@replica_reads(enabled=cache_versions.disabled)
 def halls_list(request):
     halls = Hall.objects.all()
-    return render(request, "halls/halls_list.html", {"halls": halls})
+    return render(request, "halls/halls_list.html", {"halls": halls, **get_fragment_cache_context()})
 
 
+@anonymous_page_cache(versions=(HALLS_VERSION, AVAILABILITY_VERSION))
+@replica_reads(enabled=cache_versions.disabled)
 def hall_detail(request, slug):
     hall = get_object_or_404(Hall, slug=slug)
 
     # Дата берётся из GET-параметра ?date=YYYY-MM-DD, по умолчанию — сегодня
     date_str = request.GET.get("date")
-    if date_str:
-        selected_date = parse_date(date_str)
-    else:
-        selected_date = date_class.today()
+    selected_date = (parse_date(date_str) if date_str else None) or date_class.today()
 
-    available_slots = get_available_slots(hall, selected_date)
+    # слоты считаются только если фрагмент со списком не нашёлся в кеше
+    available_slots = SimpleLazyObject(lambda: get_available_slot_times(hall, selected_date))
 
     context = {
         "hall": hall,
         "selected_date": selected_date,
         "available_slots": available_slots,
+        **get_fragment_cache_context(),
     }
     return render(request, "halls/hall_detail.html", context)
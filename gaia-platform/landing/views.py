@@ -1,7 +1,15 @@
 from django.shortcuts import render
+
+from gaia import cache_versions
+from gaia.db_router import replica_reads
+from gaia.page_cache import anonymous_page_cache
 from halls.models import Hall
+from halls.services import HALLS_VERSION, get_fragment_cache_context
 
 
+@anonymous_page_cache(versions=(HALLS_VERSION,))
+# пока страницы и фрагменты кешируются, промахи читают основную БД
+@replica_reads(enabled=cache_versions.disabled)
 def home(request):
     halls = Hall.objects.all()
-    return render(request, "landing/home.html", {"halls": halls})
+    return render(request, "landing/home.html", {"halls": halls, **get_fragment_cache_context()})
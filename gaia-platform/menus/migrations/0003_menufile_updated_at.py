@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:30
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menus', '0002_menufile_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='menufile',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Обновлён'),
+            preserve_default=False,
+        ),
+    ]
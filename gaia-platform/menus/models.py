@@ -4,9 +4,12 @@ from django.db import models
 class MenuFile(models.Model):
     title = models.CharField("Название", max_length=200)
     file = models.FileField("PDF файл", upload_to="menus/")
+    # sha256 содержимого — чтобы не хранить один и тот же PDF дважды
+    content_hash = models.CharField("SHA-256", max_length=64, blank=True, db_index=True)
     sort_order = models.PositiveIntegerField("Порядок", default=0)
     is_active = models.BooleanField("Активен", default=True)
     created_at = models.DateTimeField("Загружен", auto_now_add=True)
+    updated_at = models.DateTimeField("Обновлён", auto_now=True)
 
     class Meta:
         verbose_name = "Файл меню"
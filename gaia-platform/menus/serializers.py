@@ -1,4 +1,6 @@
 from rest_framework import serializers
+
+from api.projections import Projection, as_file_url
 from .models import MenuFile
 
 
@@ -13,3 +15,14 @@ class MenuFileSerializer(serializers.ModelSerializer):
             "file_url",
             "sort_order",
         ]
+
+
+# Быстрый путь для списка меню: тот же вывод, что у MenuFileSerializer
+MENU_FILE_LIST_PROJECTION = Projection(
+    [
+        "id",
+        "title",
+        ("file_url", "file", as_file_url),
+        "sort_order",
+    ]
+)
@@ -0,0 +1,109 @@
+import hashlib
+from typing import Iterable, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.db.models import Max
+
+from api.projections import ProjectionContext
+from api.renderers import FastJSONRenderer
+from gaia import cache_versions
+from gaia.cache_versions import get_version
+from gaia.db_router import primary_only
+from .models import MenuFile
+from .serializers import MENU_FILE_LIST_PROJECTION
+
+
+PDF_MAGIC = b"%PDF-"
+MENU_VERSION = "menu"
+
+
+class MenuUploadError(ValueError):
+    """Файл нельзя принять как меню (не PDF, слишком большой и т.п.)."""
+
+
+def get_max_menu_file_size() -> int:
+    return getattr(settings, "MENU_FILE_MAX_SIZE", 20 * 1024 * 1024)
+
+
+def save_menu_pdf(chunks: Iterable[bytes], file_name: str, title: str) -> Tuple[MenuFile, bool]:
+    """
+    Сохраняет PDF меню из потока кусков байт.
+
+    Куски пишутся во временный файл на диске (а не в память) с подсчётом
+    sha256 на лету; FileSystemStorage потом просто переносит этот файл в MEDIA_ROOT.
+    Возвращает (menu_file, created). Если такой же PDF уже загружен —
+    новый файл не создаётся, а скрытый ранее MenuFile снова становится активным.
+    """
+    max_size = get_max_menu_file_size()
+    digest = hashlib.sha256()
+    size = 0
+
+    tmp = TemporaryUploadedFile(file_name, "application/pdf", 0, None)
+    try:
+        head = b""
+        for chunk in chunks:
+            if not chunk:
+                continue
+            size += len(chunk)
+            if size > max_size:
+                raise MenuUploadError(
+                    f"Файл слишком большой (максимум {max_size // (1024 * 1024)} МБ)."
+                )
+            if len(head) < len(PDF_MAGIC):
+                head += chunk[: len(PDF_MAGIC) - len(head)]
+                if len(head) >= len(PDF_MAGIC) and head != PDF_MAGIC:
+                    raise MenuUploadError("Файл не похож на PDF.")
+            digest.update(chunk)
+            tmp.write(chunk)
+
+        if head != PDF_MAGIC:
+            raise MenuUploadError("Файл не похож на PDF.")
+
+        content_hash = digest.hexdigest()
+
+        existing = MenuFile.objects.filter(content_hash=content_hash).order_by("-is_active").first()
+        if existing:
+            if not existing.is_active:
+                existing.is_active = True
+                existing.save(update_fields=["is_active", "updated_at"])
+            return existing, False
+
+        tmp.size = size
+        tmp.seek(0)
+
+        max_sort = MenuFile.objects.aggregate(m=Max("sort_order"))["m"] or 0
+        menu_file = MenuFile(
+            title=title,
+            sort_order=max_sort + 10,
+            content_hash=content_hash,
+        )
+        menu_file.file.save(file_name, tmp, save=False)
+        menu_file.save()
+        return menu_file, True
+    finally:
+        tmp.close()
+
+
+def get_active_menu_files():
+    return MenuFile.objects.filter(is_active=True).order_by("sort_order", "created_at")
+
+
+def get_menu_snapshot(base_url: str) -> bytes:
+    """Готовый JSON активных файлов меню (как MenuFileListAPIView)."""
+    def build():
+        ctx = ProjectionContext.for_base_url(default_storage, base_url)
+        return FastJSONRenderer().render(MENU_FILE_LIST_PROJECTION.serialize(get_active_menu_files(), ctx))
+
+    if not cache_versions.enabled():
+        return build()
+
+    key = f"menus:list:{get_version(MENU_VERSION)}:{base_url}"
+    snapshot = cache.get(key)
+    if snapshot is None:
+        with primary_only():
+            snapshot = build()
+        cache.set(key, snapshot, settings.CATALOG_CACHE_TIMEOUT)
+    return snapshot
@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from gaia.cache_versions import bump_version
+from .models import MenuFile
+from .services import MENU_VERSION
+
+
+@receiver(post_save, sender=MenuFile)
+@receiver(post_delete, sender=MenuFile)
+def menu_changed(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version(MENU_VERSION))
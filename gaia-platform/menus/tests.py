@@ -1,3 +1,52 @@
-from django.test import TestCase
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+
+from .models import MenuFile
+from .services import MenuUploadError, save_menu_pdf
+
+PDF = b"%PDF-1.4\n" + b"x" * 100
+
+
+class SaveMenuPdfTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root, MENU_FILE_MAX_SIZE=1024)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_saves_pdf(self):
+        # сигнатура PDF может прийти разбитой на несколько кусков
+        menu_file, created = save_menu_pdf([PDF[:2], PDF[2:4], PDF[4:]], "menu.pdf", "Меню")
+        self.assertTrue(created)
+        with menu_file.file.open("rb") as f:
+            self.assertEqual(f.read(), PDF)
+
+    def test_rejects_non_pdf(self):
+        for chunks in ([b"<html>" + b"x" * 100], [b"%P", b"NG..."], [b"%PD"]):
+            with self.subTest(chunks=chunks), self.assertRaises(MenuUploadError):
+                save_menu_pdf(chunks, "menu.pdf", "Меню")
+        self.assertFalse(MenuFile.objects.exists())
+
+    def test_rejects_too_large(self):
+        with self.assertRaisesMessage(MenuUploadError, "слишком большой"):
+            save_menu_pdf([PDF, b"x" * 1024], "menu.pdf", "Меню")
+        self.assertFalse(MenuFile.objects.exists())
+
+    def test_same_pdf_is_not_stored_twice(self):
+        first, _ = save_menu_pdf([PDF], "menu.pdf", "Меню")
+        second, created = save_menu_pdf([PDF], "menu-copy.pdf", "Копия")
+        self.assertFalse(created)
+        self.assertEqual(second.pk, first.pk)
+        self.assertEqual(MenuFile.objects.count(), 1)
+
+    def test_hidden_duplicate_is_reactivated(self):
+        menu_file, _ = save_menu_pdf([PDF], "menu.pdf", "Меню")
+        MenuFile.objects.filter(pk=menu_file.pk).update(is_active=False)
+
+        again, created = save_menu_pdf([PDF], "menu.pdf", "Меню")
+        self.assertFalse(created)
+        self.assertEqual(again.pk, menu_file.pk)
+        self.assertTrue(MenuFile.objects.get(pk=menu_file.pk).is_active)
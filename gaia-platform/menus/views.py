@@ -1,17 +1,24 @@
+from django.utils.decorators import method_decorator
 from rest_framework import generics
+
+from api.mixins import ConditionalListMixin, ProjectionListMixin
+from gaia.db_router import replica_reads
 from .models import MenuFile
-from .serializers import MenuFileSerializer
+from .serializers import MENU_FILE_LIST_PROJECTION, MenuFileSerializer
 
 from django.shortcuts import render
 
 
-class MenuFileListAPIView(generics.ListAPIView):
+@method_decorator(replica_reads(), name="dispatch")
+class MenuFileListAPIView(ConditionalListMixin, ProjectionListMixin, generics.ListAPIView):
     """
     GET /api/menu/ — список активных PDF-страниц меню
     """
     queryset = MenuFile.objects.filter(is_active=True).order_by("sort_order", "created_at")
     serializer_class = MenuFileSerializer
+    list_projection = MENU_FILE_LIST_PROJECTION
 
+@replica_reads()
 def menu_preview(request):
     """
     Страничка для просмотра меню в браузере.
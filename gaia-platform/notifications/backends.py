@@ -0,0 +1,22 @@
+import time
+
+from django.core.mail.backends.smtp import EmailBackend
+
+from gaia.metrics import SMTP_SEND_DURATION
+
+
+class TimedSMTPEmailBackend(EmailBackend):
+    """Обычный SMTP-бэкенд Django, время отправки пишется в метрики."""
+
+    def send_messages(self, email_messages):
+        if not email_messages:
+            return 0
+        start = time.perf_counter()
+        result = "error"
+        try:
+            sent = super().send_messages(email_messages)
+            # при fail_silently ошибка не пробрасывается, а sent == 0
+            result = "ok" if sent else "error"
+            return sent
+        finally:
+            SMTP_SEND_DURATION.observe(time.perf_counter() - start, result)
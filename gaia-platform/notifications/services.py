@@ -4,6 +4,85 @@ from django.core.mail import send_mail
 from .telegram import send_telegram_message
 
 
+# ---------- Тексты уведомлений ----------
+
+
+def build_client_created_email(booking):
+    """(тема, текст) письма клиенту о новой заявке."""
+    subject = "GAIA: ваша заявка на бронирование получена"
+    message = (
+        f"Здравствуйте, {booking.customer_name}!\n\n"
+        f"Ваша заявка на бронирование зала «{booking.hall.name}» принята.\n"
+        f"Дата и время: {booking.start_time.strftime('%d.%m.%Y %H:%M')} - "
+        f"{booking.end_time.strftime('%H:%M')}\n"
+        f"Стоимость: {booking.total_price} руб.\n\n"
+        "Мы свяжемся с вами для подтверждения."
+    )
+    return subject, message
+
+
+def build_admin_created_email(booking):
+    """(тема, текст) письма админу о новой заявке."""
+    subject = "GAIA: новая заявка на бронирование"
+    message = (
+        f"Новая заявка на бронирование:\n\n"
+        f"Зал: {booking.hall.name}\n"
+        f"Клиент: {booking.customer_name}\n"
+        f"Телефон: {booking.customer_phone}\n"
+        f"Email: {booking.customer_email}\n"
+        f"Дата и время: {booking.start_time.strftime('%d.%m.%Y %H:%M')} - "
+        f"{booking.end_time.strftime('%H:%M')}\n"
+        f"Стоимость: {booking.total_price} руб.\n"
+        f"Комментарий: {booking.comment or '—'}\n"
+        f"ID брони: {booking.id}\n"
+    )
+    return subject, message
+
+
+def build_admin_created_telegram(booking) -> str:
+    """HTML-текст для админского чата в Telegram о новой заявке."""
+    return (
+        "<b>Новая заявка на бронирование</b> 🔔💰\n\n"
+        f"ID: {booking.id}\n"
+        f"Зал: {booking.hall.name}\n"
+        f"Клиент: {booking.customer_name}\n"
+        f"Телефон: {booking.customer_phone}\n"
+        f"Email: {booking.customer_email}\n"
+        f"Дата и время: {booking.start_time.strftime('%d.%m.%Y %H:%M')} - "
+        f"{booking.end_time.strftime('%H:%M')}\n"
+        f"Стоимость: {booking.total_price} руб.\n"
+        f"Комментарий: {booking.comment or '—'}"
+    )
+
+
+def build_status_update_email(booking):
+    """(тема, текст) письма клиенту о смене статуса или (None, None), если писать не о чем."""
+    if booking.status == "confirmed":
+        subject = "GAIA: ваше бронирование подтверждено"
+        message = (
+            f"Здравствуйте, {booking.customer_name}!\n\n"
+            f"Ваше бронирование зала «{booking.hall.name}» подтверждено.\n"
+            f"Дата и время: {booking.start_time.strftime('%d.%m.%Y %H:%M')} - "
+            f"{booking.end_time.strftime('%H:%M')}\n"
+            f"Стоимость: {booking.total_price} руб.\n\n"
+            "До встречи в GAIA!"
+        )
+        return subject, message
+    if booking.status in ("cancelled", "rejected"):
+        subject = "GAIA: ваше бронирование отменено"
+        message = (
+            f"Здравствуйте, {booking.customer_name}!\n\n"
+            f"Ваше бронирование зала «{booking.hall.name}» "
+            f"на {booking.start_time.strftime('%d.%m.%Y %H:%M')} отменено.\n\n"
+            "Если это ошибка, свяжитесь с нами по телефону или через сайт."
+        )
+        return subject, message
+    return None, None
+
+
+# ---------- Отправка ----------
+
+
 def send_booking_notifications(booking):
     """
     Уведомления при создании НОВОЙ заявки:
@@ -13,15 +92,7 @@ def send_booking_notifications(booking):
     """
 
     # 1. Клиенту
-    subject_client = "GAIA: ваша заявка на бронирование получена"
-    message_client = (
-        f"Здравствуйте, {booking.customer_name}!\n\n"
-        f"Ваша заявка на бронирование зала «{booking.hall.name}» принята.\n"
-        f"Дата и время: {booking.start_time.strftime('%d.%m.%Y %H:%M')} - "
-        f"{booking.end_time.strftime('%H:%M')}\n"
-        f"Стоимость: {booking.total_price} руб.\n\n"
-        "Мы свяжемся с вами для подтверждения."
-    )
+    subject_client, message_client = build_client_created_email(booking)
 
     send_mail(
         subject_client,
@@ -34,19 +105,7 @@ def send_booking_notifications(booking):
     # 2. Админу по email
     admin_email = getattr(settings, "GAIA_ADMIN_EMAIL", None)
     if admin_email:
-        subject_admin = "GAIA: новая заявка на бронирование"
-        message_admin = (
-            f"Новая заявка на бронирование:\n\n"
-            f"Зал: {booking.hall.name}\n"
-            f"Клиент: {booking.customer_name}\n"
-            f"Телефон: {booking.customer_phone}\n"
-            f"Email: {booking.customer_email}\n"
-            f"Дата и время: {booking.start_time.strftime('%d.%m.%Y %H:%M')} - "
-            f"{booking.end_time.strftime('%H:%M')}\n"
-            f"Стоимость: {booking.total_price} руб.\n"
-            f"Комментарий: {booking.comment or '—'}\n"
-            f"ID брони: {booking.id}\n"
-        )
+        subject_admin, message_admin = build_admin_created_email(booking)
 
         send_mail(
             subject_admin,
@@ -59,18 +118,7 @@ def send_booking_notifications(booking):
      # 3. Администратору в Telegram
     admin_chat_id = getattr(settings, "TELEGRAM_ADMIN_CHAT_ID", None)
     if admin_chat_id:
-        text = (
-            "<b>Новая заявка на бронирование</b> 🔔💰\n\n"
-            f"ID: {booking.id}\n"
-            f"Зал: {booking.hall.name}\n"
-            f"Клиент: {booking.customer_name}\n"
-            f"Телефон: {booking.customer_phone}\n"
-            f"Email: {booking.customer_email}\n"
-            f"Дата и время: {booking.start_time.strftime('%d.%m.%Y %H:%M')} - "
-            f"{booking.end_time.strftime('%H:%M')}\n"
-            f"Стоимость: {booking.total_price} руб.\n"
-            f"Комментарий: {booking.comment or '—'}"
-        )
+        text = build_admin_created_telegram(booking)
         send_telegram_message(admin_chat_id, text)
 
 
@@ -78,27 +126,7 @@ def send_booking_status_update_notification(booking):
     """
     Уведомление клиенту о смене статуса: confirmed / cancelled / rejected.
     """
-    subject = None
-    message = None
-
-    if booking.status == "confirmed":
-        subject = "GAIA: ваше бронирование подтверждено"
-        message = (
-            f"Здравствуйте, {booking.customer_name}!\n\n"
-            f"Ваше бронирование зала «{booking.hall.name}» подтверждено.\n"
-            f"Дата и время: {booking.start_time.strftime('%d.%m.%Y %H:%M')} - "
-            f"{booking.end_time.strftime('%H:%M')}\n"
-            f"Стоимость: {booking.total_price} руб.\n\n"
-            "До встречи в GAIA!"
-        )
-    elif booking.status in ("cancelled", "rejected"):
-        subject = "GAIA: ваше бронирование отменено"
-        message = (
-            f"Здравствуйте, {booking.customer_name}!\n\n"
-            f"Ваше бронирование зала «{booking.hall.name}» "
-            f"на {booking.start_time.strftime('%d.%m.%Y %H:%M')} отменено.\n\n"
-            "Если это ошибка, свяжитесь с нами по телефону или через сайт."
-        )
+    subject, message = build_status_update_email(booking)
 
     if not (subject and message):
         return
@@ -1,6 +1,10 @@
+import time
+
 import requests
 from django.conf import settings
 
+from gaia.metrics import TELEGRAM_API_DURATION, TELEGRAM_API_RATE_LIMITED
+
 
 def send_telegram_message(chat_id: int, text: str):
     """
@@ -17,8 +21,13 @@ def send_telegram_message(chat_id: int, text: str):
         "parse_mode": "HTML",  # чтобы <b>...</b> работало
     }
 
+    start = time.perf_counter()
     try:
-        requests.post(url, data=payload, timeout=5)
+        response = requests.post(url, data=payload, timeout=5)
+        if response.status_code == 429:
+            TELEGRAM_API_RATE_LIMITED.inc("sendMessage")
     except requests.RequestException:
         # чтобы сбой Телеги не ломал всё приложение/бота
         pass
+    finally:
+        TELEGRAM_API_DURATION.observe(time.perf_counter() - start, "sendMessage")
@@ -1,6 +1,8 @@
 from django.contrib import admin
+from django.contrib.postgres.search import SearchQuery
+from django.db.models import Q
 
-from .models import ProductCategory, Product
+from .models import SEARCH_CONFIG, ProductCategory, Product
 
 
 @admin.register(ProductCategory)
@@ -16,3 +18,10 @@ class ProductAdmin(admin.ModelAdmin):
     list_filter = ("category", "is_active")
     search_fields = ("name", "description")
     prepopulated_fields = {"slug": ("name",)}
+
+    def get_search_results(self, request, queryset, search_term):
+        # вместо icontains-сканов — GIN-индексы (полнотекстовый + триграммы)
+        if not search_term:
+            return super().get_search_results(request, queryset, search_term)
+        query = SearchQuery(search_term, config=SEARCH_CONFIG, search_type="websearch")
+        return queryset.filter(Q(search_vector=query) | Q(name__trigram_similar=search_term)), False
@@ -1,7 +1,12 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 from django.utils.text import slugify
 
 
+SEARCH_CONFIG = "russian"
+
+
 class ProductCategory(models.Model):
     name = models.CharField("Название", max_length=100, unique=True)
     slug = models.SlugField("Слаг", max_length=120, unique=True)
@@ -9,6 +14,8 @@ class ProductCategory(models.Model):
     is_active = models.BooleanField("Активна", default=True)
     sort_order = models.PositiveIntegerField("Порядок сортировки", default=0)
 
+    updated_at = models.DateTimeField("Обновлено", auto_now=True)
+
     class Meta:
         verbose_name = "Категория товара"
         verbose_name_plural = "Категории товаров"
@@ -52,13 +59,35 @@ class Product(models.Model):
         null=True,
     )
 
+    # уменьшенные копии фото (заполняет gaia.images в фоне)
+    image_variants = models.JSONField("Варианты фото", default=dict, blank=True, editable=False)
+
     created_at = models.DateTimeField("Создано", auto_now_add=True)
     updated_at = models.DateTimeField("Обновлено", auto_now=True)
 
+    # Полнотекстовый индекс считает сам Postgres (generated column)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("name", weight="A", config=SEARCH_CONFIG)
+            + SearchVector("description", weight="B", config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     class Meta:
         verbose_name = "Товар"
         verbose_name_plural = "Товары"
         ordering = ["name"]
+        indexes = [
+            # сортировки для курсорной пагинации каталога
+            models.Index(fields=["name"], name="product_name_idx"),
+            models.Index(fields=["price"], name="product_price_idx"),
+            models.Index(fields=["created_at"], name="product_created_at_idx"),
+            GinIndex(fields=["search_vector"], name="product_search_vector_idx"),
+            # нечёткий поиск по названию (опечатки)
+            GinIndex(fields=["name"], name="product_name_trgm_idx", opclasses=["gin_trgm_ops"]),
+        ]
 
     def __str__(self):
         return self.name
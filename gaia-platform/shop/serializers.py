@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from api.fields import ImageVariantsField
+from api.projections import Nested, Projection, as_decimal_str, as_file_url, as_image_variants
 from .models import ProductCategory, Product
 
 
@@ -25,6 +27,7 @@ class ProductSerializer(serializers.ModelSerializer):
     )
 
     image = serializers.ImageField(read_only=True)
+    image_variants = ImageVariantsField(image_field="image")
 
     class Meta:
         model = Product
@@ -35,8 +38,39 @@ class ProductSerializer(serializers.ModelSerializer):
             "description",
             "price",
             "image",
+            "image_variants",
             "is_active",
             "category",
             "category_id",
         ]
         read_only_fields = ["is_active"]
+
+
+class ProductSearchSerializer(ProductSerializer):
+    rank = serializers.FloatField(read_only=True)
+    # подсвеченные совпадения (<mark>...</mark>); при нечётком поиске — null
+    name_headline = serializers.CharField(read_only=True, default=None)
+    description_headline = serializers.CharField(read_only=True, default=None)
+
+    class Meta(ProductSerializer.Meta):
+        fields = ProductSerializer.Meta.fields + [
+            "rank",
+            "name_headline",
+            "description_headline",
+        ]
+
+
+# Быстрый путь для списка товаров: тот же вывод, что у ProductSerializer
+PRODUCT_LIST_PROJECTION = Projection(
+    [
+        "id",
+        "name",
+        "slug",
+        "description",
+        ("price", "price", as_decimal_str),
+        ("image", "image", as_file_url),
+        ("image_variants", "image_variants", as_image_variants),
+        "is_active",
+        ("category", Nested("category", ["id", "name", "slug", "description"])),
+    ]
+)
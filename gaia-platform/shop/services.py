@@ -0,0 +1,140 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, TrigramSimilarity
+from django.core.cache import cache
+from django.db.models import F
+from django.core.files.storage import default_storage
+from api.mixins import get_list_state
+from api.projections import ProjectionContext
+from api.renderers import FastJSONRenderer
+from gaia import cache_versions
+from gaia.cache_versions import bump_version, get_version
+from gaia.db_router import primary_only
+
+from .models import SEARCH_CONFIG, Product, ProductCategory
+from .serializers import PRODUCT_LIST_PROJECTION, ProductCategorySerializer
+
+
+CATALOG_VERSION = "catalog"
+DEFAULT_ORDERING = ("name",)
+# поля, по которым видно изменение списка товаров (вложенная категория тоже в ответе)
+CATALOG_TIMESTAMP_FIELDS = ["updated_at", "category__updated_at"]
+
+
+def get_active_products(category_slug: str = ""):
+    qs = Product.objects.filter(is_active=True).select_related("category")
+    if category_slug:
+        qs = qs.filter(category__slug=category_slug, category__is_active=True)
+    return qs
+
+
+def get_catalog_version() -> int:
+    return get_version(CATALOG_VERSION)
+
+
+def get_catalog_state(category_slug: str = "") -> tuple:
+    """Состояние списка товаров в БД — то же, что считает ConditionalListMixin."""
+    return get_list_state(get_active_products(category_slug), CATALOG_TIMESTAMP_FIELDS)
+
+
+def _snapshot_key(state, category_slug: str, ordering, base_url: str) -> str:
+    # ключ из состояния БД, а не из версии: его одинаково посчитает любой процесс
+    raw = f"{'|'.join(map(str, state))}|{category_slug}|{','.join(ordering)}|{base_url}"
+    return f"shop:catalog:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+
+def get_category_snapshot() -> bytes:
+    """Готовый JSON активных категорий (как ProductCategoryListAPIView)."""
+    def build():
+        categories = ProductCategory.objects.filter(is_active=True)
+        return FastJSONRenderer().render(ProductCategorySerializer(categories, many=True).data)
+
+    if not cache_versions.enabled():
+        return build()
+
+    key = f"shop:categories:{get_catalog_version()}"
+    snapshot = cache.get(key)
+    if snapshot is None:
+        with primary_only():
+            snapshot = build()
+        cache.set(key, snapshot, settings.CATALOG_CACHE_TIMEOUT)
+    return snapshot
+
+
+def build_catalog_snapshot(category_slug: str, ordering, base_url: str) -> bytes:
+    """Готовый JSON списка товаров (то же, что отдаёт ProductListAPIView)."""
+    qs = get_active_products(category_slug).order_by(*ordering)
+    ctx = ProjectionContext.for_base_url(default_storage, base_url)
+    return FastJSONRenderer().render(PRODUCT_LIST_PROJECTION.serialize(qs, ctx))
+
+
+def get_catalog_snapshot(category_slug: str, ordering, base_url: str, state=None) -> bytes:
+    """
+    state — состояние списка (get_catalog_state); ProductListAPIView передаёт
+    уже посчитанное для ETag, чтобы не делать второй агрегирующий запрос.
+    """
+    ordering = tuple(ordering or DEFAULT_ORDERING)
+    if state is None:
+        state = get_catalog_state(category_slug)
+    key = _snapshot_key(state, category_slug, ordering, base_url)
+
+    snapshot = cache.get(key)
+    if snapshot is None:
+        # снимок общий для всех процессов — собираем по основной БД
+        with primary_only():
+            snapshot = build_catalog_snapshot(category_slug, ordering, base_url)
+        cache.set(key, snapshot, settings.CATALOG_CACHE_TIMEOUT)
+    return snapshot
+
+
+def invalidate_catalog():
+    """
+    Сброс снимков каталога после изменения Product/ProductCategory.
+
+    Ключи снимков товаров и так меняются вместе с данными в БД — новый снимок
+    соберёт первый запрос (get_catalog_snapshot, по основной БД); версия
+    нужна категориям и ETag bootstrap. Старые ключи не удаляем — истекут сами.
+    """
+    bump_version(CATALOG_VERSION)
+
+
+# ---------- Поиск по каталогу ----------
+
+SEARCH_MAX_RESULTS = 30
+HIGHLIGHT = {"start_sel": "<mark>", "stop_sel": "</mark>"}
+
+
+def search_products(q: str, limit: int = SEARCH_MAX_RESULTS):
+    """
+    Поиск товаров: сначала полнотекстовый (русская морфология, GIN по search_vector),
+    если ничего не нашли — нечёткий по триграммам названия (на случай опечаток).
+
+    Возвращает (queryset, fallback), где fallback=True — сработал триграммный поиск.
+    """
+    base = Product.objects.filter(is_active=True).select_related("category")
+    query = SearchQuery(q, config=SEARCH_CONFIG, search_type="websearch")
+
+    results = (
+        base.filter(search_vector=query)
+        .annotate(
+            rank=SearchRank(F("search_vector"), query),
+            name_headline=SearchHeadline(
+                "name", query, config=SEARCH_CONFIG, highlight_all=True, **HIGHLIGHT
+            ),
+            description_headline=SearchHeadline(
+                "description", query, config=SEARCH_CONFIG, max_words=25, min_words=10, **HIGHLIGHT
+            ),
+        )
+        .order_by("-rank", "name")[:limit]
+    )
+    if results:
+        return results, False
+
+    # оператор % (trigram_similar) использует GIN-индекс product_name_trgm_idx
+    fallback = (
+        base.filter(name__trigram_similar=q)
+        .annotate(rank=TrigramSimilarity("name", q))
+        .order_by("-rank", "name")[:limit]
+    )
+    return fallback, True
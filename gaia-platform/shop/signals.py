@@ -0,0 +1,21 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from gaia.images import schedule_variants
+from .models import Product, ProductCategory
+from .services import invalidate_catalog
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=ProductCategory)
+@receiver(post_delete, sender=ProductCategory)
+def catalog_changed(sender, **kwargs):
+    # версию двигаем после коммита: иначе промах успеет закешировать старые данные
+    transaction.on_commit(invalidate_catalog)
+
+
+@receiver(post_save, sender=Product)
+def product_image_changed(sender, instance, **kwargs):
+    schedule_variants(instance, "image", "image_variants")
@@ -1,3 +1,31 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from .models import Product
+
+
+class CatalogSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.product = Product.objects.create(name="Латте", slug="latte", price=Decimal("200.00"))
+
+    def names(self):
+        return [row["name"] for row in self.client.get("/api/products/").json()]
+
+    def test_save_does_not_rebuild_snapshots(self):
+        self.names()
+        with mock.patch("shop.services.build_catalog_snapshot") as build:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.product.name = "Раф"
+                self.product.save()
+        build.assert_not_called()
+
+    def test_next_request_sees_change(self):
+        self.assertEqual(self.names(), ["Латте"])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.name = "Раф"
+            self.product.save()
+        self.assertEqual(self.names(), ["Раф"])
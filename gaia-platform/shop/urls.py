@@ -4,6 +4,7 @@ from .views import (
     ProductCategoryListAPIView,
     ProductListAPIView,
     ProductDetailAPIView,
+    ProductSearchAPIView,
 )
 
 app_name = "shop"
@@ -11,5 +12,6 @@ app_name = "shop"
 urlpatterns = [
     path("product-categories/", ProductCategoryListAPIView.as_view(), name="category-list"),
     path("products/", ProductListAPIView.as_view(), name="product-list"),
+    path("products/search/", ProductSearchAPIView.as_view(), name="product-search"),
     path("products/<int:pk>/", ProductDetailAPIView.as_view(), name="product-detail"),
 ]
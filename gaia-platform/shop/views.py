@@ -1,12 +1,26 @@
-from rest_framework import generics
+from django.http import HttpResponse
+from django.utils.decorators import method_decorator
+from rest_framework import generics, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.filters import OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
+from api.mixins import ConditionalListMixin, ProjectionListMixin
+from api.pagination import ProductCursorPagination
+from gaia.db_router import replica_reads
 from .models import ProductCategory, Product
-from .serializers import ProductCategorySerializer, ProductSerializer
+from .serializers import (
+    PRODUCT_LIST_PROJECTION,
+    ProductCategorySerializer,
+    ProductSerializer,
+    ProductSearchSerializer,
+)
+from .services import CATALOG_TIMESTAMP_FIELDS, get_active_products, get_catalog_snapshot, search_products
 
 
-class ProductCategoryListAPIView(generics.ListAPIView):
+@method_decorator(replica_reads(), name="dispatch")
+class ProductCategoryListAPIView(ConditionalListMixin, generics.ListAPIView):
     """
     GET /api/product-categories/
     """
@@ -14,27 +28,84 @@ class ProductCategoryListAPIView(generics.ListAPIView):
     serializer_class = ProductCategorySerializer
 
 
-class ProductListAPIView(generics.ListAPIView):
+@method_decorator(replica_reads(), name="dispatch")
+class ProductListAPIView(ConditionalListMixin, ProjectionListMixin, generics.ListAPIView):
     """
     GET /api/products/
     ?category=<slug>  — фильтр по категории
+    ?ordering=name|price|created_at (можно с минусом)
+    ?page_size=<n>, ?cursor=<...> — постраничная выдача (по умолчанию — весь каталог)
+    ?fields=id,name,price — только нужные поля; ?expand=category — вложенная категория
     """
+    # вложенная категория тоже попадает в ответ
+    conditional_timestamp_fields = CATALOG_TIMESTAMP_FIELDS
     serializer_class = ProductSerializer
+    list_projection = PRODUCT_LIST_PROJECTION
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     ordering_fields = ["name", "price", "created_at"]
     ordering = ["name"]
+    pagination_class = ProductCursorPagination
 
     def get_queryset(self):
-        qs = Product.objects.filter(is_active=True)
-        category_slug = self.request.query_params.get("category")
-        if category_slug:
-            qs = qs.filter(category__slug=category_slug, category__is_active=True)
-        return qs
+        return get_active_products(self.request.query_params.get("category", ""))
 
+    def get_list_response(self, request, *args, **kwargs):
+        """
+        Готовый JSON из кеша: снимок на каждую пару (категория, сортировка).
+        Ключ снимка — то же состояние БД, из которого посчитан ETag, поэтому
+        тело и ETag не расходятся между процессами.
+        """
+        # снимок хранится в JSON и целиком; другие форматы (msgpack), страницы
+        # и урезанные ответы (?fields=/?expand=) — обычным путём
+        if (
+            ProductCursorPagination.is_requested(request)
+            or request.accepted_renderer.format != "json"
+            or "fields" in request.query_params
+            or "expand" in request.query_params
+        ):
+            return super().get_list_response(request, *args, **kwargs)
 
+        ordering = OrderingFilter().get_ordering(request, self.get_queryset(), self)
+        snapshot = get_catalog_snapshot(
+            request.query_params.get("category", ""),
+            ordering,
+            request.build_absolute_uri("/"),
+            state=self.conditional_state,
+        )
+        return HttpResponse(snapshot, content_type="application/json")
+
+
+@method_decorator(replica_reads(), name="dispatch")
 class ProductDetailAPIView(generics.RetrieveAPIView):
     """
     GET /api/products/<id>/
     """
     queryset = Product.objects.filter(is_active=True)
     serializer_class = ProductSerializer
+
+
+@method_decorator(replica_reads(), name="dispatch")
+class ProductSearchAPIView(APIView):
+    """
+    GET /api/products/search/?q=<запрос>
+    Полнотекстовый поиск (с ранжированием и подсветкой), при отсутствии
+    результатов — нечёткий поиск по названию.
+    """
+
+    def get(self, request):
+        q = (request.query_params.get("q") or "").strip()
+        if not q:
+            return Response(
+                {"detail": "q query param is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        products, fallback = search_products(q)
+        serializer = ProductSearchSerializer(products, many=True, context={"request": request})
+        return Response(
+            {
+                "query": q,
+                "fallback": fallback,
+                "results": serializer.data,
+            }
+        )
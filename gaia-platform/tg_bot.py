@@ -1,11 +1,13 @@
 import os
 import django
 
+from telegram import Bot, Update
 from telegram.ext import (
     Updater,
     CommandHandler,
     CallbackQueryHandler,
     MessageHandler,
+    TypeHandler,
     Filters,
 )
 
@@ -14,6 +16,10 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "gaia.settings")
 django.setup()
 
 from django.conf import settings
+from django.db import close_old_connections
+
+from gaia.metrics import start_exporter
+from bot.metrics import TimedRequest, timed_handler
 
 from bot.handlers import start, ping
 from bot.bookings import handle_menu, booking_callback
@@ -31,11 +37,27 @@ from bot.menu_files import (
     menu_file_remove_callback,
 )
 
-def main():
-    token = settings.TELEGRAM_BOT_TOKEN
-    updater = Updater(token, use_context=True)
-    dp = updater.dispatcher
+def release_db_connections(update, context):
+    """
+    У бота нет request_started/request_finished, поэтому соединениями
+    с БД управляем сами — до и после каждого апдейта:
+    закрываем протухшие (CONN_MAX_AGE / health checks), а в режиме
+    пула (POSTGRES_POOL) возвращаем соединение в пул.
+    """
+    close_old_connections()
+
+
+def build_bot(token, workers, base_url=None):
+    """
+    base_url — другой адрес Bot API (например, локальная заглушка
+    bot.fake_api в бенчмарке); по умолчанию api.telegram.org.
+    """
+    # свой Request — чтобы замерять запросы к Bot API; пул как у Updater по умолчанию
+    return Bot(token, base_url=base_url, request=TimedRequest(con_pool_size=workers + 4))
+
 
+def register_handlers(dp):
+    """Все обработчики бота — общие для продового запуска и бенчмарка (bench_bot)."""
     # Команды
     dp.add_handler(CommandHandler("start", start))
     dp.add_handler(CommandHandler("ping", ping))
@@ -64,7 +86,24 @@ def main():
     # Затем обработчик всех остальных inline-кнопок по бронированиям
     dp.add_handler(CallbackQueryHandler(booking_callback))
 
+    # Время работы каждого обработчика — в метрики
+    for handlers in dp.handlers.values():
+        for handler in handlers:
+            handler.callback = timed_handler(handler.callback)
+
+    # Соединения с БД — до (group=-1) и после (group=100) всех обработчиков
+    dp.add_handler(TypeHandler(Update, release_db_connections), group=-1)
+    dp.add_handler(TypeHandler(Update, release_db_connections), group=100)
+
+
+def main():
+    token = settings.TELEGRAM_BOT_TOKEN
+    workers = settings.TELEGRAM_BOT_WORKERS
+    updater = Updater(bot=build_bot(token, workers), use_context=True, workers=workers)
+    register_handlers(updater.dispatcher)
 
+    if settings.BOT_METRICS_PORT:
+        start_exporter(settings.BOT_METRICS_PORT, settings.BOT_METRICS_ADDR)
 
     updater.start_polling()
     updater.idle()